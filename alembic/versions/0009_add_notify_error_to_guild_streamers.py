@@ -0,0 +1,24 @@
+"""add unreachable notify channel flag to guild_streamers
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("guild_streamers", sa.Column("notify_error", sa.String(), nullable=True))
+    op.add_column("guild_streamers", sa.Column("notify_error_at", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("guild_streamers", "notify_error_at")
+    op.drop_column("guild_streamers", "notify_error")
@@ -0,0 +1,28 @@
+"""add channel webhooks table
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "channel_webhooks",
+        sa.Column("channel_id", sa.String(), primary_key=True),
+        sa.Column("webhook_id", sa.String(), nullable=False),
+        sa.Column("webhook_token", sa.String(), nullable=False),
+        sa.Column("created_at", sa.String(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("channel_webhooks")
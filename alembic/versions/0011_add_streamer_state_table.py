@@ -0,0 +1,72 @@
+"""add streamer state table and slim live_status to notification bookkeeping
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "streamer_state",
+        sa.Column("soop_channel_id", sa.String(), primary_key=True),
+        sa.Column("is_live", sa.Integer(), nullable=False),
+        sa.Column("broad_no", sa.String(), nullable=True),
+        sa.Column("updated_at", sa.String(), nullable=False),
+    )
+    op.execute(
+        """
+        INSERT INTO streamer_state (soop_channel_id, is_live, broad_no, updated_at)
+        SELECT soop_channel_id, MAX(is_live), MAX(broad_no), MAX(updated_at)
+        FROM live_status
+        GROUP BY soop_channel_id
+        """
+    )
+    # Offline rows carry no notification history; only links that were live
+    # keep a bookkeeping row so the poller still treats them as already notified.
+    op.execute("DELETE FROM live_status WHERE is_live = 0 AND last_notified_at IS NULL")
+    with op.batch_alter_table("live_status") as batch_op:
+        batch_op.drop_column("is_live")
+        batch_op.drop_column("broad_no")
+        batch_op.drop_column("updated_at")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("live_status") as batch_op:
+        batch_op.add_column(
+            sa.Column("is_live", sa.Integer(), nullable=False, server_default="0")
+        )
+        batch_op.add_column(sa.Column("broad_no", sa.String(), nullable=True))
+        batch_op.add_column(
+            sa.Column("updated_at", sa.String(), nullable=False, server_default="")
+        )
+    op.execute(
+        """
+        UPDATE live_status
+        SET is_live = (
+                SELECT is_live FROM streamer_state
+                WHERE streamer_state.soop_channel_id = live_status.soop_channel_id
+            ),
+            broad_no = (
+                SELECT broad_no FROM streamer_state
+                WHERE streamer_state.soop_channel_id = live_status.soop_channel_id
+            ),
+            updated_at = (
+                SELECT updated_at FROM streamer_state
+                WHERE streamer_state.soop_channel_id = live_status.soop_channel_id
+            )
+        WHERE EXISTS (
+            SELECT 1 FROM streamer_state
+            WHERE streamer_state.soop_channel_id = live_status.soop_channel_id
+        )
+        """
+    )
+    op.drop_table("streamer_state")
@@ -0,0 +1,59 @@
+"""add lookup indexes for poller and admin queries
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18
+"""
+
+from contextlib import nullcontext
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+# live_status.guild_id lookups are served by the (guild_id, soop_channel_id)
+# primary key, whose leading column is guild_id.
+INDEXES = (
+    ("ix_guild_streamers_soop_channel_id", "guild_streamers", ["soop_channel_id"], None),
+    ("ix_guild_streamers_notify_channel_id", "guild_streamers", ["notify_channel_id"], None),
+    ("ix_live_status_soop_channel_id", "live_status", ["soop_channel_id"], None),
+    ("ix_streamer_state_live", "streamer_state", ["soop_channel_id"], "is_live = 1"),
+)
+
+
+def _concurrently() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade() -> None:
+    concurrently = _concurrently()
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction, so on Postgres
+    # the indexes are built in autocommit mode without blocking writes.
+    with op.get_context().autocommit_block() if concurrently else nullcontext():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                if_not_exists=True,
+                postgresql_concurrently=concurrently,
+                postgresql_where=sa.text(where) if where else None,
+                sqlite_where=sa.text(where) if where else None,
+            )
+
+
+def downgrade() -> None:
+    concurrently = _concurrently()
+    with op.get_context().autocommit_block() if concurrently else nullcontext():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                if_exists=True,
+                postgresql_concurrently=concurrently,
+            )
+
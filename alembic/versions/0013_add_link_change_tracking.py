@@ -0,0 +1,37 @@
+"""add link change version and deletion tombstones
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0013"
+down_revision = "0012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "guild_streamers",
+        sa.Column("version", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.create_index("ix_guild_streamers_version", "guild_streamers", ["version"])
+    op.create_table(
+        "link_deletions",
+        sa.Column("link_id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("deleted_at", sa.String(), nullable=False),
+    )
+    op.create_index("ix_link_deletions_version", "link_deletions", ["version"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_link_deletions_version", table_name="link_deletions")
+    op.drop_table("link_deletions")
+    op.drop_index("ix_guild_streamers_version", table_name="guild_streamers")
+    with op.batch_alter_table("guild_streamers") as batch_op:
+        batch_op.drop_column("version")
@@ -0,0 +1,42 @@
+"""add (guild_id, id) index for keyset link pages
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-18
+"""
+
+from contextlib import nullcontext
+
+from alembic import op
+
+revision = "0014"
+down_revision = "0013"
+branch_labels = None
+depends_on = None
+
+
+def _concurrently() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade() -> None:
+    concurrently = _concurrently()
+    with op.get_context().autocommit_block() if concurrently else nullcontext():
+        op.create_index(
+            "ix_guild_streamers_guild_id_id",
+            "guild_streamers",
+            ["guild_id", "id"],
+            if_not_exists=True,
+            postgresql_concurrently=concurrently,
+        )
+
+
+def downgrade() -> None:
+    concurrently = _concurrently()
+    with op.get_context().autocommit_block() if concurrently else nullcontext():
+        op.drop_index(
+            "ix_guild_streamers_guild_id_id",
+            table_name="guild_streamers",
+            if_exists=True,
+            postgresql_concurrently=concurrently,
+        )
@@ -0,0 +1,30 @@
+"""add notification outbox for the standalone poller
+
+Revision ID: 0016
+Revises: 0015
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0016"
+down_revision = "0015"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "notification_outbox",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("guild_id", sa.String(), nullable=False),
+        sa.Column("soop_channel_id", sa.String(), nullable=False),
+        sa.Column("info", sa.Text(), nullable=True),
+        sa.Column("detected_at", sa.Float(), nullable=False),
+        sa.Column("created_at", sa.String(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("notification_outbox")
@@ -0,0 +1,27 @@
+"""add shared per-guild rate limit windows for partitioned polling
+
+Revision ID: 0017
+Revises: 0016
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0017"
+down_revision = "0016"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "guild_rate_windows",
+        sa.Column("guild_id", sa.String(), primary_key=True),
+        sa.Column("window_start", sa.Integer(), nullable=False),
+        sa.Column("used", sa.Integer(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("guild_rate_windows")
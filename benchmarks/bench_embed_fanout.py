@@ -0,0 +1,79 @@
+"""Microbenchmark: per-guild embed construction vs one shared base embed.
+
+Run with: uv run python benchmarks/bench_embed_fanout.py
+"""
+
+from __future__ import annotations
+
+import timeit
+
+from soupnotify.core.embeds import apply_embed_overrides, build_live_embed
+from soupnotify.core.render import render_embed_overrides
+
+STREAM_URL_BASE = "https://play.sooplive.co.kr"
+STREAMER_ID = "streamer-1"
+INFO = {
+    "broadTitle": "Benchmark stream",
+    "categoryName": "Just Chatting",
+    "currentSumViewer": 1234,
+    "broadNo": "280000000",
+}
+THUMBNAIL_URL = "https://liveimg.sooplive.co.kr/h/280000000.webp"
+# Roughly one in ten guilds customises the embed.
+CUSTOM = {"title": "{guild}: {soop_channel_id} is live", "description": None, "color": "FF5500"}
+DEFAULT = {"title": None, "description": None, "color": None}
+
+
+def _settings(fanout: int) -> list[dict]:
+    return [CUSTOM if index % 10 == 0 else DEFAULT for index in range(fanout)]
+
+
+def per_guild(settings: list[dict]) -> None:
+    stream_url = f"{STREAM_URL_BASE}/{STREAMER_ID}"
+    for index, embed_settings in enumerate(settings):
+        title, description, color = render_embed_overrides(
+            embed_settings, STREAMER_ID, index, f"guild-{index}", STREAM_URL_BASE
+        )
+        build_live_embed(
+            STREAMER_ID,
+            stream_url,
+            INFO,
+            THUMBNAIL_URL,
+            title_override=title,
+            description_override=description,
+            color_hex=color,
+        )
+
+
+def shared(settings: list[dict]) -> None:
+    stream_url = f"{STREAM_URL_BASE}/{STREAMER_ID}"
+    base = build_live_embed(STREAMER_ID, stream_url, INFO, THUMBNAIL_URL)
+    for index, embed_settings in enumerate(settings):
+        if not any(embed_settings.values()):
+            continue
+        title, description, color = render_embed_overrides(
+            embed_settings, STREAMER_ID, index, f"guild-{index}", STREAM_URL_BASE
+        )
+        apply_embed_overrides(
+            base, title_override=title, description_override=description, color_hex=color
+        )
+
+
+def main() -> None:
+    print(f"{'fanout':>8} {'per-guild ms':>14} {'shared ms':>12} {'speedup':>9}")
+    for fanout in (1, 100, 1000):
+        settings = _settings(fanout)
+        number = max(1, 2000 // fanout)
+        before = min(
+            timeit.repeat(lambda settings=settings: per_guild(settings), number=number, repeat=5)
+        )
+        after = min(
+            timeit.repeat(lambda settings=settings: shared(settings), number=number, repeat=5)
+        )
+        before_ms = before / number * 1000
+        after_ms = after / number * 1000
+        print(f"{fanout:>8} {before_ms:>14.3f} {after_ms:>12.3f} {before_ms / after_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
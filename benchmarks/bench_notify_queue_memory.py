@@ -0,0 +1,80 @@
+"""Memory benchmark: 1,000 pending notifications with a View each vs shared components.
+
+Run with: uv run python benchmarks/bench_notify_queue_memory.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any
+
+import discord
+
+from soupnotify.core.components import watch_button_components
+from soupnotify.core.notifier import NotifyMessage
+
+PENDING = 1000
+# Go-live bursts fan out a handful of streamers to many channels.
+STREAMERS = 20
+
+
+@dataclass(frozen=True)
+class ViewMessage:
+    """Queue entry shape before components were shared."""
+
+    channel_id: int
+    content: str | None
+    embed: Any
+    view: discord.ui.View | None
+
+
+def _stream_url(index: int) -> str:
+    return f"https://play.sooplive.co.kr/streamer-{index % STREAMERS}"
+
+
+def _with_views() -> asyncio.Queue:
+    queue: asyncio.Queue = asyncio.Queue()
+    for index in range(PENDING):
+        view = discord.ui.View(timeout=None)
+        view.add_item(
+            discord.ui.Button(
+                label="Watch Stream", style=discord.ButtonStyle.link, url=_stream_url(index)
+            )
+        )
+        queue.put_nowait(ViewMessage(index, "live", None, view))
+    return queue
+
+
+def _with_components() -> asyncio.Queue:
+    queue: asyncio.Queue = asyncio.Queue()
+    for index in range(PENDING):
+        components = watch_button_components(_stream_url(index))
+        queue.put_nowait(NotifyMessage(index, "live", None, components))
+    return queue
+
+
+def _measure(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    queue = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del queue
+    return current
+
+
+async def main() -> None:
+    watch_button_components.cache_clear()
+    before = _measure(_with_views)
+    after = _measure(_with_components)
+    print(f"pending={PENDING} streamers={STREAMERS}")
+    print(f"View per message:   {before / 1024:8.1f} KiB")
+    print(f"Shared components:  {after / 1024:8.1f} KiB")
+    print(f"Reduction:          {before / max(after, 1):8.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,173 @@
+"""Benchmark: poll throughput with 1, 2 and 4 partitioned worker processes.
+
+Each worker runs a PartitionCoordinator and SoopPoller against a shared SQLite
+database and a local SOOP stand-in that answers every channel request after a
+fixed latency, so a cycle is bound by request latency and the per-process
+connection pool rather than by this machine's CPU count.
+
+Run with: uv run python benchmarks/bench_partitioned_poll.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import multiprocessing as mp
+import os
+import socket
+import tempfile
+import time
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+
+from soupnotify.core.metrics import BotMetrics
+from soupnotify.core.storage import Storage
+from soupnotify.soop.client import SoopClient
+from soupnotify.soop.partition import PartitionCoordinator
+from soupnotify.soop.poller import SoopPoller
+
+STREAMERS = 500
+PARTITIONS = 64
+LATENCY = 0.25
+WORKER_COUNTS = (1, 2, 4)
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _migrate(database_url: str) -> None:
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+    # alembic/env.py prefers DATABASE_URL over the ini setting.
+    os.environ["DATABASE_URL"] = database_url
+    command.upgrade(config, "head")
+
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            request = await reader.readuntil(b"\r\n\r\n")
+            path = request.split(b" ", 2)[1].decode()
+            streamer_id = path.split("/")[3]
+            await asyncio.sleep(LATENCY)
+            body = json.dumps(
+                {"broadNo": streamer_id.rsplit("-", 1)[-1], "broadTitle": streamer_id}
+            ).encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                b"Content-Length: %d\r\n\r\n%s" % (len(body), body)
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+def _serve(sock: socket.socket) -> None:
+    async def main() -> None:
+        server = await asyncio.start_server(_handle, sock=sock, backlog=1024)
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(main())
+
+
+class _CountingNotifier:
+    def __init__(self) -> None:
+        self.sent = 0
+
+    async def enqueue(self, channel_id, content, **kwargs) -> None:
+        self.sent += 1
+
+
+class _Bot:
+    def get_guild(self, guild_id: int):
+        return None
+
+
+def _worker(database_url: str, base_url: str, owner: str, barrier, results) -> None:
+    async def main() -> None:
+        storage = Storage(database_url)
+        coordinator = PartitionCoordinator(storage, PARTITIONS, owner=owner)
+        client = SoopClient(base_url, "", 0, base_url, None, "{broad_no}", 1, 0.1)
+        notifier = _CountingNotifier()
+        poller = SoopPoller(
+            client,
+            storage,
+            notifier,
+            "https://play.sooplive.co.kr",
+            BotMetrics(),
+            interval_seconds=1,
+            info_cooldown_seconds=1,
+            partitions=coordinator,
+        )
+        coordinator.heartbeat()
+        barrier.wait()
+        # Two lockstep rounds: releases land in the first, takeovers in the second.
+        for _ in range(2):
+            coordinator.rebalance()
+            barrier.wait()
+        poller._load_state()
+        barrier.wait()
+        start = time.perf_counter()
+        await poller._poll_once(_Bot())
+        elapsed = time.perf_counter() - start
+        results.put((owner, len(coordinator.held), notifier.sent, elapsed))
+        barrier.wait()
+        coordinator.leave()
+        await client.aclose()
+
+    asyncio.run(main())
+
+
+def _run(workers: int, base_url: str, tmp: Path) -> None:
+    database_url = f"sqlite:///{tmp / f'bench-{workers}.db'}"
+    _migrate(database_url)
+    storage = Storage(database_url)
+    storage.add_links(
+        "1", [(f"streamer-{index}", "123", None) for index in range(STREAMERS)]
+    )
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(
+            target=_worker, args=(database_url, base_url, f"worker-{index}", barrier, results)
+        )
+        for index in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    rows = [results.get(timeout=600) for _ in processes]
+    for process in processes:
+        process.join()
+    sent = sum(row[2] for row in rows)
+    partitions = sum(row[1] for row in rows)
+    slowest = max(row[3] for row in rows)
+    print(
+        f"workers={workers}: cycle {slowest:.2f} s, {STREAMERS / slowest:.0f} streamers/s, "
+        f"partitions={partitions}/{PARTITIONS}, go-lives sent={sent}/{STREAMERS}"
+    )
+
+
+def main() -> None:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(1024)
+    base_url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+    ctx = mp.get_context("fork")
+    server = ctx.Process(target=_serve, args=(sock,), daemon=True)
+    server.start()
+    print(f"streamers={STREAMERS} partitions={PARTITIONS} latency={LATENCY * 1000:.0f} ms")
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for workers in WORKER_COUNTS:
+                _run(workers, base_url, Path(tmp))
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark: f-string keyed poller dicts vs the id-indexed PollerState columns.
+
+Run with: uv run python benchmarks/bench_poller_state.py
+"""
+
+from __future__ import annotations
+
+import gc
+import timeit
+import tracemalloc
+
+from soupnotify.soop.state import PollerState
+
+LINKS = 100_000
+GUILDS = 5_000
+STREAMERS = 2_000
+
+
+def _links() -> list[dict]:
+    # Fresh objects per row, like values decoded from guild_streamers rows.
+    per_guild = LINKS // GUILDS
+    return [
+        {
+            "id": index + 1,
+            "guild_id": str(100000000000000000 + index // per_guild),
+            "soop_channel_id": "streamer-%d" % (index % STREAMERS),
+        }
+        for index in range(LINKS)
+    ]
+
+
+def _legacy_state(links: list[dict]) -> tuple[dict, dict]:
+    last_live: dict[str, bool] = {}
+    last_broad_no: dict[str, str | None] = {}
+    for link in links:
+        key = f"{link['guild_id']}:{link['soop_channel_id']}"
+        last_live[key] = bool(link["id"] % 2)
+        last_broad_no[key] = None
+    return last_live, last_broad_no
+
+
+def _compact_state(links: list[dict]) -> PollerState:
+    state = PollerState()
+    for link in links:
+        state.update(link["id"], bool(link["id"] % 2), None)
+    return state
+
+
+def _measure(build, links) -> int:
+    gc.collect()
+    tracemalloc.start()
+    state = build(links)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del state
+    return current
+
+
+def _legacy_poll(links, last_live, last_broad_no) -> None:
+    active_keys = {f"{link['guild_id']}:{link['soop_channel_id']}" for link in links}
+    for link in links:
+        key = f"{link['guild_id']}:{link['soop_channel_id']}"
+        is_live = last_live.get(key, False)
+        last_live[key] = is_live
+        last_broad_no[key] = None
+    del active_keys
+
+
+def _compact_poll(links, state: PollerState) -> None:
+    for link in links:
+        link_id = link["id"]
+        state.update(link_id, state.is_live(link_id), None)
+
+
+def main() -> None:
+    links = _links()
+    legacy_bytes = _measure(_legacy_state, links)
+    compact_bytes = _measure(_compact_state, links)
+    print(f"links={LINKS} guilds={GUILDS} streamers={STREAMERS}")
+    print(
+        f"resident: legacy={legacy_bytes / 2**20:.2f} MiB "
+        f"compact={compact_bytes / 2**20:.2f} MiB"
+    )
+
+    last_live, last_broad_no = _legacy_state(links)
+    state = _compact_state(links)
+    legacy = min(
+        timeit.repeat(lambda: _legacy_poll(links, last_live, last_broad_no), number=1, repeat=5)
+    )
+    compact = min(timeit.repeat(lambda: _compact_poll(links, state), number=1, repeat=5))
+    print(f"per-poll: legacy={legacy * 1000:.1f} ms compact={compact * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Benchmark: per-row live_status prune vs the set-based anti-join DELETE.
+
+Run with: uv run python benchmarks/bench_prune_live_status.py
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import delete, insert, select
+
+from soupnotify.core.storage import Storage
+
+ROWS = 100_000
+GUILDS = 5_000
+STREAMERS = 2_000
+ORPHANS = 1_000
+NOW = "2026-01-01T00:00:00+00:00"
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _migrate(database_url: str) -> None:
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+    # alembic/env.py prefers DATABASE_URL over the ini setting.
+    os.environ["DATABASE_URL"] = database_url
+    command.upgrade(config, "head")
+
+
+def _rows() -> list[dict]:
+    per_guild = ROWS // GUILDS
+    return [
+        {
+            "guild_id": str(100000000000000000 + index // per_guild),
+            "soop_channel_id": "streamer-%d" % (index % STREAMERS),
+        }
+        for index in range(ROWS)
+    ]
+
+
+def _orphans() -> list[dict]:
+    return [
+        {"guild_id": "orphan-guild", "soop_channel_id": "streamer-%d" % index}
+        for index in range(ORPHANS)
+    ]
+
+
+def _seed(storage: Storage, rows: list[dict]) -> None:
+    tables = storage._tables
+    with storage._engine.begin() as conn:
+        conn.execute(
+            insert(tables.guild_streamers),
+            [{**row, "notify_channel_id": "1", "created_at": NOW} for row in rows],
+        )
+        conn.execute(insert(tables.live_status), rows)
+
+
+def _add_orphans(storage: Storage) -> None:
+    with storage._engine.begin() as conn:
+        conn.execute(insert(storage._tables.live_status), _orphans())
+
+
+def _legacy_prune(storage: Storage, active_keys: set[tuple[str, str]]) -> int:
+    # The previous implementation: read every row, then delete stale ones one by one.
+    live_status = storage._tables.live_status
+    removed = 0
+    with storage._engine.begin() as conn:
+        rows = conn.execute(
+            select(live_status.c.guild_id, live_status.c.soop_channel_id)
+        ).fetchall()
+        for guild_id, soop_channel_id in rows:
+            if (guild_id, soop_channel_id) in active_keys:
+                continue
+            conn.execute(
+                delete(live_status).where(
+                    (live_status.c.guild_id == guild_id)
+                    & (live_status.c.soop_channel_id == soop_channel_id)
+                )
+            )
+            removed += 1
+    return removed
+
+
+def _time(fn) -> tuple[float, int]:
+    start = time.perf_counter()
+    removed = fn()
+    return time.perf_counter() - start, removed
+
+
+def main() -> None:
+    rows = _rows()
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        _migrate(database_url)
+        storage = Storage(database_url)
+        _seed(storage, rows)
+        print(f"rows={ROWS} orphans={ORPHANS}")
+
+        def legacy() -> int:
+            # The poller rebuilt this from list_links() on every cycle.
+            links = storage.list_links()
+            active_keys = {(link["guild_id"], link["soop_channel_id"]) for link in links}
+            return _legacy_prune(storage, active_keys)
+
+        for label, fn in (("legacy", legacy), ("anti-join", storage.prune_live_status)):
+            _add_orphans(storage)
+            elapsed, removed = _time(fn)
+            steady, _ = _time(fn)
+            print(
+                f"{label}: {elapsed * 1000:.1f} ms ({removed} removed), "
+                f"steady state {steady * 1000:.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -14,7 +14,7 @@ def check(required: list[str]) -> None:
 
 def main() -> None:
     mode = os.getenv("ENV_VALIDATE_MODE", "bot")
-    if mode == "api":
+    if mode in {"api", "poller"}:
         check(REQUIRED_API)
     else:
         check(REQUIRED_BOT)
@@ -1,17 +1,36 @@
+import hmac
 import logging
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
 
-from soupnotify.core.config import load_settings
+from soupnotify.core.bulk import (
+    MAX_BULK_BYTES,
+    BulkImportError,
+    detect_format,
+    iter_export,
+    parse_links,
+    summarize_import,
+)
+from soupnotify.core.config import load_api_settings
+from soupnotify.core.discord_http import DiscordHTTPError, DiscordRestClient
+from soupnotify.core.prometheus import CONTENT_TYPE, collect_metrics
 from soupnotify.core.storage import Storage
 
 
-settings = load_settings()
+settings = load_api_settings()
 logging.basicConfig(level=settings.log_level.upper())
 logger = logging.getLogger(__name__)
 
 app = FastAPI()
 storage = Storage(settings.database_url)
+rest = (
+    DiscordRestClient(settings.discord_token, settings.discord_api_base_url)
+    if settings.discord_token
+    else None
+)
+
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "json": "application/json"}
 
 
 @app.get("/healthz")
@@ -24,3 +43,89 @@ async def healthz() -> dict:
         "db": "ok" if db_ok else "error",
         "last_poll_at": last_poll_at,
     }
+
+
+@app.get("/metrics")
+async def prometheus_metrics() -> PlainTextResponse:
+    # The bot and poller export their own metrics to METRICS_DIR; a scrape
+    # only reads those files.
+    if not settings.metrics_dir:
+        raise HTTPException(status_code=404, detail="Metrics export is disabled; set METRICS_DIR.")
+    body = collect_metrics(settings.metrics_dir, settings.metrics_interval_seconds * 4)
+    return PlainTextResponse(body, media_type=CONTENT_TYPE)
+
+
+def require_api_token(request: Request) -> None:
+    if not settings.api_token:
+        raise HTTPException(status_code=404, detail="Link API is disabled; set API_TOKEN.")
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token, settings.api_token):
+        raise HTTPException(status_code=401, detail="Invalid API token.")
+
+
+@app.post("/guilds/{guild_id}/links/import", dependencies=[Depends(require_api_token)])
+async def import_links(
+    guild_id: str,
+    request: Request,
+    file_format: str | None = Query(default=None, alias="format"),
+) -> dict:
+    content_type = request.headers.get("content-type", "")
+    requested = file_format or ("json" if "json" in content_type else None)
+    data = await _read_upload(request)
+    try:
+        fmt = detect_format(None, requested)
+        links = parse_links(data, fmt, storage.get_default_notify_channel(guild_id))
+    except BulkImportError as exc:
+        raise HTTPException(status_code=422, detail=exc.errors[:50]) from None
+    imported = storage.add_links(
+        guild_id,
+        [(link.soop_channel_id, link.notify_channel_id, link.message_template) for link in links],
+    )
+    await _send_audit(guild_id, summarize_import(imported, "the API"))
+    return {"imported": imported}
+
+
+@app.get("/guilds/{guild_id}/links/export", dependencies=[Depends(require_api_token)])
+async def export_links(
+    guild_id: str, file_format: str = Query(default="csv", alias="format")
+) -> StreamingResponse:
+    try:
+        fmt = detect_format(None, file_format)
+    except BulkImportError as exc:
+        raise HTTPException(status_code=422, detail=exc.errors) from None
+    return StreamingResponse(
+        iter_export(storage.iter_links(guild_id), fmt),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="links-{guild_id}.{fmt}"'},
+    )
+
+
+async def _read_upload(request: Request) -> bytes:
+    # Oversized uploads are refused before they are buffered: up front when
+    # Content-Length says so, otherwise as soon as the stream passes the cap.
+    too_large = HTTPException(
+        status_code=413, detail=[f"File is larger than {MAX_BULK_BYTES // 1024} KiB."]
+    )
+    try:
+        declared = int(request.headers.get("content-length", "0"))
+    except ValueError:
+        declared = 0
+    if declared > MAX_BULK_BYTES:
+        raise too_large
+    data = bytearray()
+    async for chunk in request.stream():
+        data += chunk
+        if len(data) > MAX_BULK_BYTES:
+            raise too_large
+    return bytes(data)
+
+
+async def _send_audit(guild_id: str, message: str) -> None:
+    logger.info("Audit for guild %s: %s", guild_id, message)
+    channel_id = storage.get_audit_channel(guild_id)
+    if not rest or not channel_id:
+        return
+    try:
+        await rest.create_message(int(channel_id), {"content": message})
+    except DiscordHTTPError:
+        logger.exception("Failed to send audit log to %s", channel_id)
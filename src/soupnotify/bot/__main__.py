@@ -9,11 +9,20 @@ from soupnotify.bot.cogs.help import HelpCog
 from soupnotify.bot.cogs.linking import LinkingCog
 from soupnotify.bot.cogs.notifications import NotificationsCog
 from soupnotify.bot.cogs.templates import TemplatesCog
+from soupnotify.core.changes import ChangeListener
 from soupnotify.core.config import load_bot_settings
+from soupnotify.core.discord_http import DiscordRestClient
+from soupnotify.core.events import EventBus
+from soupnotify.core.lease import POLLER_LEASE, LeaseKeeper
 from soupnotify.core.metrics import BotMetrics
 from soupnotify.core.notifier import Notifier
+from soupnotify.core.prometheus import MetricsExporter
+from soupnotify.core.shards import ShardSet
 from soupnotify.core.storage import Storage
 from soupnotify.soop.client import SoopClient
+from soupnotify.soop.message import LiveMessageBuilder
+from soupnotify.soop.outbox import OutboxConsumer
+from soupnotify.soop.partition import PartitionCoordinator
 from soupnotify.soop.poller import SoopPoller
 
 
@@ -28,8 +37,18 @@ bot_kwargs = {
 if settings.shard_count:
     bot_kwargs["shard_count"] = settings.shard_count
 
-bot = commands.Bot(**bot_kwargs)
-storage = Storage(settings.database_url)
+# With SHARD_IDS this process is one member of a shard cluster: it connects
+# only those shards and delivers only for the guilds routed to them.
+shards = (
+    ShardSet(frozenset(settings.shard_ids), settings.shard_count)
+    if settings.shard_ids and settings.shard_count
+    else None
+)
+if shards is not None:
+    bot = commands.AutoShardedBot(shard_ids=list(settings.shard_ids), **bot_kwargs)
+else:
+    bot = commands.Bot(**bot_kwargs)
+storage = Storage(settings.database_url, cache_settings=True)
 metrics = BotMetrics()
 soop_client = SoopClient(
     settings.soop_channel_api_base_url,
@@ -42,13 +61,32 @@ soop_client = SoopClient(
     settings.soop_retry_backoff,
     channel_headers=settings.soop_channel_headers,
 )
+discord_rest = DiscordRestClient(settings.discord_token, settings.discord_api_base_url)
 notifier = Notifier(
     bot,
     settings.notify_rate_per_second,
     settings.notify_burst_rate_per_second,
     settings.notify_burst_threshold,
     metrics,
+    storage=storage,
+    rest=discord_rest,
+    concurrency=settings.notify_concurrency,
+    delivery_mode=settings.notify_delivery_mode,
+)
+# Replicas either split the streamers between them or elect a single poller.
+poll_partitions = (
+    PartitionCoordinator(storage, settings.poll_partitions, settings.leader_lease_seconds)
+    if settings.poll_partitions
+    else None
+)
+poller_lease = (
+    None
+    if poll_partitions
+    else LeaseKeeper(storage, POLLER_LEASE, settings.leader_lease_seconds)
 )
+# Live-state transitions for consumers other than the go-live notifications.
+event_bus = EventBus(metrics)
+event_bus.subscribe(metrics.record_transition, name="metrics")
 poller = SoopPoller(
     soop_client,
     storage,
@@ -57,14 +95,106 @@ poller = SoopPoller(
     metrics,
     settings.poll_interval_seconds,
     settings.soop_info_cooldown_seconds,
+    change_events=True,
+    lease=poller_lease,
+    partitions=poll_partitions,
+    shards=shards,
+    events=event_bus,
+    snapshot_path=settings.snapshot_path,
+    snapshot_interval_seconds=settings.snapshot_interval_seconds,
+    catchup_gap_seconds=settings.catchup_gap_seconds,
+)
+change_listener = ChangeListener(
+    storage, settings.database_url, settings.change_poll_interval_seconds
+)
+change_listener.subscribe(storage.apply_change)
+change_listener.subscribe(poller.apply_change)
+# Delivers go-lives queued by a standalone `python -m soupnotify.poller`.
+outbox_consumer = OutboxConsumer(
+    storage,
+    LiveMessageBuilder(storage, soop_client, settings.soop_stream_url_base),
+    notifier,
+    bot,
+    settings.change_poll_interval_seconds,
+    shards=shards,
 )
+change_listener.subscribe(outbox_consumer.apply_change)
+# Served in Prometheus format by the API process from the shared data volume.
+metrics_exporter = (
+    MetricsExporter(
+        metrics,
+        settings.metrics_dir,
+        "bot",
+        settings.metrics_interval_seconds,
+        # Stable across restarts for a shard cluster member.
+        instance=(
+            "shards-" + "-".join(str(shard_id) for shard_id in settings.shard_ids)
+            if settings.shard_ids
+            else None
+        ),
+    )
+    if settings.metrics_dir
+    else None
+)
+background_tasks: dict[str, asyncio.Task] = {}
+
+
+def _start_background(name: str, coro_factory) -> None:
+    # on_ready fires again after reconnects; keep one task of each kind.
+    task = background_tasks.get(name)
+    if task is None or task.done():
+        background_tasks[name] = asyncio.create_task(coro_factory())
 
 
 @bot.event
 async def on_ready() -> None:
     logger.info("Logged in as %s", bot.user)
     await notifier.start()
-    asyncio.create_task(poller.run(bot))
+    _start_background("changes", change_listener.run)
+    _start_background("outbox", outbox_consumer.run)
+    if metrics_exporter is not None:
+        _start_background("metrics", metrics_exporter.run)
+    if settings.poller_mode == "external":
+        return
+    if poll_partitions is not None:
+        _start_background("partitions", poll_partitions.run)
+    else:
+        _start_background("lease", poller_lease.run)
+    _start_background("events", event_bus.run)
+    _start_background("poller", lambda: poller.run(bot))
+
+
+@bot.event
+async def on_guild_channel_delete(channel: discord.abc.GuildChannel) -> None:
+    notifier.mark_unreachable([channel.id], "channel deleted")
+
+
+@bot.event
+async def on_guild_channel_update(
+    before: discord.abc.GuildChannel, after: discord.abc.GuildChannel
+) -> None:
+    # Permissions may have been restored; let the next send re-check.
+    notifier.mark_reachable([after.id])
+
+
+@bot.event
+async def on_guild_remove(guild: discord.Guild) -> None:
+    notifier.mark_unreachable([channel.id for channel in guild.channels], "bot removed from server")
+
+
+@bot.event
+async def on_guild_join(guild: discord.Guild) -> None:
+    notifier.mark_reachable([channel.id for channel in guild.channels])
+
+
+@bot.event
+async def on_guild_available(guild: discord.Guild) -> None:
+    notifier.mark_reachable([channel.id for channel in guild.channels])
+
+
+@bot.event
+async def on_guild_role_update(before: discord.Role, after: discord.Role) -> None:
+    notifier.mark_reachable([channel.id for channel in after.guild.channels])
 
 
 @bot.event
@@ -85,6 +215,21 @@ def _load_cogs() -> None:
     bot.add_cog(HelpCog())
 
 
+_close_bot = bot.close
+
+
+async def _close() -> None:
+    # bot.run() awaits close() on its own loop before shutting it down, which
+    # is the last point where the REST client's connections can be closed.
+    try:
+        await _close_bot()
+    finally:
+        await discord_rest.aclose()
+
+
+bot.close = _close
+
+
 def main() -> None:
     _load_cogs()
     bot.run(settings.discord_token)
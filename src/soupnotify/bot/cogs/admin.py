@@ -6,7 +6,7 @@ from discord.ext import commands
 
 from soupnotify.core.discord_utils import safe_respond
 from soupnotify.core.command_log import log_command
-from soupnotify.core.metrics import BotMetrics
+from soupnotify.core.metrics import POLL_STAGES, RECENT_POLL_CYCLES, BotMetrics
 from soupnotify.core.storage import Storage
 
 logger = logging.getLogger(__name__)
@@ -62,7 +62,7 @@ class AdminCog(commands.Cog):
         if not await _require_admin(ctx, self._storage):
             return
         default_channel = self._storage.get_default_notify_channel(str(ctx.guild.id))
-        link_count = len(self._storage.get_links(str(ctx.guild.id)))
+        link_count, unreachable_count = self._storage.count_links(str(ctx.guild.id))
         embed_settings = self._storage.get_embed_template(str(ctx.guild.id))
         mention = self._storage.get_mention(str(ctx.guild.id))
         admin_role = self._storage.get_admin_role(str(ctx.guild.id))
@@ -76,6 +76,7 @@ class AdminCog(commands.Cog):
         lines = [
             f"Default channel: {f'<#{default_channel}>' if default_channel else 'None'}",
             f"Linked streamers: {link_count}",
+            f"Unreachable notify channels: {unreachable_count}",
             f"Mentions: {mention_display}",
             f"Admin role: {f'<@&{admin_role}>' if admin_role else 'None'}",
             f"Audit channel: {f'<#{audit_channel}>' if audit_channel else 'None'}",
@@ -99,6 +100,7 @@ class AdminCog(commands.Cog):
         lines = [
             f"Messages sent: {self._metrics.messages_sent}",
             f"Messages failed: {self._metrics.messages_failed}",
+            f"Messages skipped: {self._metrics.messages_skipped}",
             f"API errors: {self._metrics.api_errors}",
             f"Cache hits: {self._metrics.cache_hits}",
             f"Cache misses: {self._metrics.cache_misses}",
@@ -109,9 +111,49 @@ class AdminCog(commands.Cog):
             f"Live count: {self._metrics.last_live_count}",
             f"Last empty: {self._metrics.last_empty_count}",
             f"Poll count: {self._metrics.poll_count}",
+            f"Queue wait: {self._metrics.queue_wait.summary()}",
+            f"Send duration: {self._metrics.send_duration.summary()}",
+            f"Detection to delivery: {self._metrics.delivery_latency.summary()}",
+            f"Broadcast start to detection: {self._metrics.detection_lag.summary()}",
+            f"Broadcast start to delivery: {self._metrics.go_live_lag.summary()}",
+            "Transitions: "
+            + (
+                ", ".join(
+                    f"{kind}={count}" for kind, count in sorted(self._metrics.transitions.items())
+                )
+                or "none"
+            ),
+            f"Events dropped: {self._metrics.events_dropped}",
+            f"Catch-up polls: {self._metrics.catch_up_polls}",
         ]
         await safe_respond(ctx, "\n".join(lines), ephemeral=True)
 
+    @commands.slash_command(name="perf", description="Show per-stage timings of recent polls")
+    async def perf(
+        self,
+        ctx: discord.ApplicationContext,
+        cycles: discord.Option(int, "Number of recent polls", required=False),
+    ) -> None:
+        log_command(ctx, "perf")
+        if not ctx.guild:
+            await safe_respond(ctx, "This command must be used in a server.", ephemeral=True)
+            return
+        if not await _require_admin(ctx, self._storage):
+            return
+        if not self._metrics.recent_polls:
+            # With POLLER_MODE=external the poller records these in its own process.
+            await safe_respond(ctx, "No polls recorded by this process yet.", ephemeral=True)
+            return
+        count = min(max(cycles or 10, 1), RECENT_POLL_CYCLES)
+        lines = [
+            f"{stage}: {self._metrics.poll_stages[stage].summary()}"
+            for stage in POLL_STAGES
+            if stage in self._metrics.poll_stages
+        ]
+        table = "\n".join(self._metrics.poll_cycle_table(count))
+        lines.append(f"```\n{table}\n```")
+        await safe_respond(ctx, "\n".join(lines), ephemeral=True)
+
     @commands.slash_command(name="debug_live_status", description="Show live_status rows for this server")
     async def debug_live_status(self, ctx: discord.ApplicationContext) -> None:
         log_command(ctx, "debug_live_status")
@@ -120,11 +162,7 @@ class AdminCog(commands.Cog):
             return
         if not await _require_admin(ctx, self._storage):
             return
-        rows = self._storage.load_live_status()
-        prefix = f"{ctx.guild.id}:"
-        filtered = {
-            key[len(prefix) :]: value for key, value in rows.items() if key.startswith(prefix)
-        }
+        filtered = self._storage.get_live_status(str(ctx.guild.id))
         if not filtered:
             await safe_respond(ctx, "No live_status rows for this server.", ephemeral=True)
             return
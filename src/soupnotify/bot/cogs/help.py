@@ -24,6 +24,7 @@ class HelpCog(commands.Cog):
                 "/unlink soop_channel:<id> (admin)\n"
                 "/unlink_all (admin)\n"
                 "/link_list [page:<n>] [soop_channel:<id>] [notify_channel:<#channel|id>]\n"
+                "/link_bulk action:<import|export> [file] [format:<csv|json>] (admin)\n"
                 "/status"
             ),
             inline=False,
@@ -45,6 +46,7 @@ class HelpCog(commands.Cog):
             value=(
                 "/config (admin)\n"
                 "/metrics (admin)\n"
+                "/perf [cycles] (admin)\n"
                 "/debug_live_status (admin)\n"
                 "/reset_live_status (admin)\n"
                 "/admin_role (admin)\n"
@@ -1,46 +1,72 @@
+import tempfile
+
 import discord
 from discord.ext import commands
 
 from soupnotify.core.audit import send_audit
+from soupnotify.core.bulk import (
+    BULK_FORMATS,
+    MAX_BULK_BYTES,
+    BulkImportError,
+    detect_format,
+    iter_export,
+    parse_links,
+    summarize_import,
+)
 from soupnotify.core.command_log import log_command
 from soupnotify.core.discord_utils import parse_channel_id, safe_respond
 from soupnotify.core.permissions import require_admin
+from soupnotify.core.render import TemplateError, validate_template
 from soupnotify.core.storage import Storage
 
 
-def _format_links_page(links: list[dict], page: int, page_size: int) -> str:
-    start = (page - 1) * page_size
-    end = start + page_size
-    slice_links = links[start:end]
+LINKS_PAGE_SIZE = 10
+
+
+def _format_links_page(links: list[dict], page: int, total_pages: int) -> str:
     lines = [
         f"- `{item['soop_channel_id']}` -> <#{item['notify_channel_id']}>"
-        for item in slice_links
+        + _unreachable_suffix(item)
+        for item in links
     ]
-    total_pages = (len(links) + page_size - 1) // page_size
     lines.append(f"Page {page}/{total_pages}")
     return "\n".join(lines)
 
 
-def _filter_links(
-    links: list[dict],
-    soop_channel_id: str | None,
-    notify_channel_id: str | None,
-) -> list[dict]:
-    filtered = links
-    if soop_channel_id:
-        filtered = [link for link in filtered if link["soop_channel_id"] == soop_channel_id]
-    if notify_channel_id:
-        filtered = [link for link in filtered if link["notify_channel_id"] == notify_channel_id]
-    return filtered
+def _unreachable_suffix(link: dict) -> str:
+    if not link.get("notify_error"):
+        return ""
+    return f" (unreachable: {link['notify_error']})"
 
 
 class _LinkListView(discord.ui.View):
-    def __init__(self, links: list[dict], page: int, page_size: int) -> None:
+    """Prev/Next buttons that fetch each page from storage when clicked.
+
+    Only the current page and its boundary ids are held; pages are keyed on the
+    link id so each click is one small indexed query.
+    """
+
+    def __init__(
+        self,
+        storage: Storage,
+        guild_id: str,
+        links: list[dict],
+        page: int,
+        total_pages: int,
+        soop_channel_id: str | None = None,
+        notify_channel_id: str | None = None,
+    ) -> None:
         super().__init__(timeout=120)
-        self._links = links
+        self._storage = storage
+        self._guild_id = guild_id
+        self._filters = {
+            "soop_channel_id": soop_channel_id,
+            "notify_channel_id": notify_channel_id,
+        }
         self._page = page
-        self._page_size = page_size
-        self._total_pages = (len(links) + page_size - 1) // page_size
+        self._total_pages = total_pages
+        self._first_id = links[0]["id"]
+        self._last_id = links[-1]["id"]
         self._prev = discord.ui.Button(label="Prev", style=discord.ButtonStyle.secondary)
         self._next = discord.ui.Button(label="Next", style=discord.ButtonStyle.secondary)
         self._prev.callback = self._on_prev
@@ -53,20 +79,36 @@ class _LinkListView(discord.ui.View):
         self._prev.disabled = self._page <= 1
         self._next.disabled = self._page >= self._total_pages
 
-    async def _update(self, interaction: discord.Interaction) -> None:
+    async def _show(
+        self, interaction: discord.Interaction, links: list[dict], page: int
+    ) -> None:
+        if links:
+            self._page = page
+            self._first_id = links[0]["id"]
+            self._last_id = links[-1]["id"]
+        else:
+            # Links were removed since the last page; re-read the current one.
+            links = self._storage.get_links_page(
+                self._guild_id,
+                after_id=self._first_id - 1,
+                limit=LINKS_PAGE_SIZE,
+                **self._filters,
+            )
         self._refresh_buttons()
-        content = _format_links_page(self._links, self._page, self._page_size)
+        content = _format_links_page(links, self._page, self._total_pages)
         await interaction.response.edit_message(content=content, view=self)
 
     async def _on_prev(self, interaction: discord.Interaction) -> None:
-        if self._page > 1:
-            self._page -= 1
-        await self._update(interaction)
+        links = self._storage.get_links_page(
+            self._guild_id, before_id=self._first_id, limit=LINKS_PAGE_SIZE, **self._filters
+        )
+        await self._show(interaction, links, max(self._page - 1, 1))
 
     async def _on_next(self, interaction: discord.Interaction) -> None:
-        if self._page < self._total_pages:
-            self._page += 1
-        await self._update(interaction)
+        links = self._storage.get_links_page(
+            self._guild_id, after_id=self._last_id, limit=LINKS_PAGE_SIZE, **self._filters
+        )
+        await self._show(interaction, links, min(self._page + 1, self._total_pages))
 
 
 class LinkingCog(commands.Cog):
@@ -86,7 +128,7 @@ class LinkingCog(commands.Cog):
         ),
         message_template: discord.Option(
             str,
-            "Optional template: {soop_channel_id}, {notify_channel}, {guild}, {soop_url}.",
+            "Optional template: {soop_channel_id}, {soop_url}, {guild}, {title}, {viewers}...",
             required=False,
         ),
     ) -> None:
@@ -96,6 +138,11 @@ class LinkingCog(commands.Cog):
             return
         if not await require_admin(ctx, self._storage):
             return
+        try:
+            validate_template(message_template)
+        except TemplateError as exc:
+            await safe_respond(ctx, str(exc), ephemeral=True)
+            return
         if notify_channel:
             notify_channel_id = parse_channel_id(notify_channel)
             if not notify_channel_id:
@@ -174,26 +221,99 @@ class LinkingCog(commands.Cog):
         else:
             await safe_respond(ctx, "No links found for this server.", ephemeral=True)
 
+    @commands.slash_command(name="link_bulk", description="Import or export links as CSV/JSON")
+    async def link_bulk(
+        self,
+        ctx: discord.ApplicationContext,
+        action: discord.Option(str, "Action", choices=["import", "export"], required=True),
+        file: discord.Option(
+            discord.Attachment,
+            "CSV or JSON file with soop_channel_id, notify_channel_id, message_template",
+            required=False,
+        ),
+        format: discord.Option(str, "Export format", choices=list(BULK_FORMATS), required=False),
+    ) -> None:
+        log_command(ctx, "link_bulk")
+        if not ctx.guild:
+            await safe_respond(ctx, "This command must be used in a server.", ephemeral=True)
+            return
+        if not await require_admin(ctx, self._storage):
+            return
+        guild_id = str(ctx.guild.id)
+        if action == "export":
+            fmt = format or "csv"
+            # Spool to disk past 1 MiB so large guilds don't build the export in memory.
+            spool = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+            for chunk in iter_export(self._storage.iter_links(guild_id), fmt):
+                spool.write(chunk.encode("utf-8"))
+            spool.seek(0)
+            await safe_respond(
+                ctx,
+                "Exported links.",
+                file=discord.File(spool, filename=f"links-{guild_id}.{fmt}"),
+                ephemeral=True,
+            )
+            return
+        if not file:
+            await safe_respond(ctx, "Attach a CSV or JSON file to import.", ephemeral=True)
+            return
+        if file.size > MAX_BULK_BYTES:
+            # Discord reports the size up front; don't download an oversized file.
+            await safe_respond(
+                ctx,
+                f"Nothing imported:\n- File is larger than {MAX_BULK_BYTES // 1024} KiB.",
+                ephemeral=True,
+            )
+            return
+        try:
+            fmt = detect_format(file.filename, format)
+            links = parse_links(
+                await file.read(), fmt, self._storage.get_default_notify_channel(guild_id)
+            )
+        except BulkImportError as exc:
+            shown = exc.errors[:10]
+            if len(exc.errors) > len(shown):
+                shown.append(f"...and {len(exc.errors) - len(shown)} more")
+            lines = "\n".join(f"- {line}" for line in shown)
+            await safe_respond(ctx, f"Nothing imported:\n{lines}", ephemeral=True)
+            return
+        imported = self._storage.add_links(
+            guild_id,
+            [
+                (link.soop_channel_id, link.notify_channel_id, link.message_template)
+                for link in links
+            ],
+        )
+        await safe_respond(ctx, f"Imported {imported} link(s).", ephemeral=True)
+        await send_audit(
+            self._bot,
+            self._storage,
+            guild_id,
+            f"{summarize_import(imported, f'`{file.filename}`')} By {ctx.user.mention}.",
+        )
+
     @commands.slash_command(name="status", description="Show current SOOP link status")
     async def status(self, ctx: discord.ApplicationContext) -> None:
         log_command(ctx, "status")
         if not ctx.guild:
             await safe_respond(ctx, "This command must be used in a server.", ephemeral=True)
             return
-        links = self._storage.get_links(str(ctx.guild.id))
-        if not links:
+        guild_id = str(ctx.guild.id)
+        preview = self._storage.get_links_page(guild_id, limit=LINKS_PAGE_SIZE)
+        if not preview:
             await safe_respond(ctx, "No SOOP links configured.", ephemeral=True)
             return
-        preview = links[:10]
+        total, _ = self._storage.count_links(guild_id)
         lines = [
             (
                 f"- `{item['soop_channel_id']}` -> <#{item['notify_channel_id']}>"
                 + (" (custom template)" if item.get("message_template") else "")
+                + _unreachable_suffix(item)
             )
             for item in preview
         ]
-        if len(links) > len(preview):
-            lines.append(f"...and {len(links) - len(preview)} more")
+        if total > len(preview):
+            lines.append(f"...and {total - len(preview)} more")
         await safe_respond(ctx, "\n".join(lines), ephemeral=True)
 
     @commands.slash_command(name="link_list", description="List linked streamers with pagination")
@@ -208,15 +328,27 @@ class LinkingCog(commands.Cog):
         if not ctx.guild:
             await safe_respond(ctx, "This command must be used in a server.", ephemeral=True)
             return
-        links = self._storage.get_links(str(ctx.guild.id))
-        notify_channel_id = parse_channel_id(notify_channel)
-        filtered = _filter_links(links, soop_channel_id, notify_channel_id)
-        if not filtered:
+        guild_id = str(ctx.guild.id)
+        filters = {
+            "soop_channel_id": soop_channel_id,
+            "notify_channel_id": parse_channel_id(notify_channel),
+        }
+        total, _ = self._storage.count_links(guild_id, **filters)
+        if not total:
             await safe_respond(ctx, "No SOOP links configured.", ephemeral=True)
             return
-        page_size = 10
-        total_pages = (len(filtered) + page_size - 1) // page_size
+        total_pages = (total + LINKS_PAGE_SIZE - 1) // LINKS_PAGE_SIZE
         page = max(1, min(page or 1, total_pages))
-        content = _format_links_page(filtered, page, page_size)
-        view = _LinkListView(filtered, page, page_size)
+        # Jumping straight to a page needs an offset once; Prev/Next are keyset.
+        links = self._storage.get_links_page(
+            guild_id,
+            limit=LINKS_PAGE_SIZE,
+            offset=(page - 1) * LINKS_PAGE_SIZE,
+            **filters,
+        )
+        if not links:
+            await safe_respond(ctx, "No SOOP links configured.", ephemeral=True)
+            return
+        content = _format_links_page(links, page, total_pages)
+        view = _LinkListView(self._storage, guild_id, links, page, total_pages, **filters)
         await safe_respond(ctx, content, view=view, ephemeral=True)
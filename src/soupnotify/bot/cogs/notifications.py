@@ -23,16 +23,16 @@ class NotificationsCog(commands.Cog):
         if not ctx.guild:
             await safe_respond(ctx, "This command must be used in a server.", ephemeral=True)
             return
-        links = self._storage.get_links(str(ctx.guild.id))
-        if not links:
-            await safe_respond(ctx, "No SOOP links configured.", ephemeral=True)
-            return
         if soop_channel_id:
-            target = next((item for item in links if item["soop_channel_id"] == soop_channel_id), None)
+            target = self._storage.get_link(str(ctx.guild.id), soop_channel_id)
             if not target:
                 await safe_respond(ctx, "That SOOP channel is not linked.", ephemeral=True)
                 return
         else:
+            links = self._storage.get_links(str(ctx.guild.id))
+            if not links:
+                await safe_respond(ctx, "No SOOP links configured.", ephemeral=True)
+                return
             target = links[0]
         channel = self._bot.get_channel(int(target["notify_channel_id"]))
         if not channel:
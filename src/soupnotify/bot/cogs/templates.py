@@ -6,10 +6,24 @@ from soupnotify.core.command_log import log_command
 from soupnotify.core.discord_utils import safe_respond
 from soupnotify.core.embeds import build_live_embed
 from soupnotify.core.permissions import require_admin
-from soupnotify.core.render import render_embed_overrides, render_message
+from soupnotify.core.render import (
+    TEMPLATE_FIELDS,
+    TemplateError,
+    render_embed_overrides,
+    render_message,
+    validate_template,
+)
 from soupnotify.core.storage import Storage
 
 
+PREVIEW_INFO = {
+    "broadTitle": "Preview: stream title",
+    "categoryName": "Category",
+    "currentSumViewer": 123,
+    "broadNo": "000000",
+}
+
+
 def _preview_embed(
     soop_channel_id: str,
     notify_channel_id: int,
@@ -24,18 +38,13 @@ def _preview_embed(
         notify_channel_id,
         guild_name,
         stream_url_base,
+        PREVIEW_INFO,
     )
-    info = {
-        "broadTitle": "Preview: stream title",
-        "categoryName": "Category",
-        "currentSumViewer": 123,
-        "broadNo": "000000",
-    }
     thumbnail_url = "https://liveimg.sooplive.co.kr/h/000000.webp"
     return build_live_embed(
         soop_channel_id,
         stream_url,
-        info,
+        PREVIEW_INFO,
         thumbnail_url,
         title_override=title_override,
         description_override=description_override,
@@ -69,6 +78,7 @@ class TemplatesCog(commands.Cog):
             ctx.guild.name,
             self._settings.soop_stream_url_base,
             None,
+            info=PREVIEW_INFO,
         )
         embed_settings = self._storage.get_embed_template(str(ctx.guild.id))
         embed = _preview_embed(
@@ -88,7 +98,7 @@ class TemplatesCog(commands.Cog):
         soop_channel_id: discord.Option(str, "SOOP channel identifier", required=False),
         message_template: discord.Option(
             str,
-            "Template: {soop_channel_id}, {notify_channel}, {guild}, {soop_url}.",
+            "Template: {soop_channel_id}, {soop_url}, {guild}, {title}, {category}, {viewers}...",
             required=False,
         ),
     ) -> None:
@@ -137,6 +147,11 @@ class TemplatesCog(commands.Cog):
         if not message_template:
             await safe_respond(ctx, "Provide a message template.", ephemeral=True)
             return
+        try:
+            validate_template(message_template)
+        except TemplateError as exc:
+            await safe_respond(ctx, str(exc), ephemeral=True)
+            return
 
         updated = self._storage.set_template(str(ctx.guild.id), soop_channel_id, message_template)
         if not updated:
@@ -171,7 +186,7 @@ class TemplatesCog(commands.Cog):
                 f"Title: {current.get('title') or 'default'}",
                 f"Description: {current.get('description') or 'default'}",
                 f"Color: {current.get('color') or 'default'}",
-                "Variables: {soop_channel_id}, {soop_url}, {notify_channel}, {guild}",
+                "Variables: " + ", ".join(f"{{{name}}}" for name in TEMPLATE_FIELDS),
             ]
             await safe_respond(ctx, "\n".join(lines), ephemeral=True)
             return
@@ -198,6 +213,12 @@ class TemplatesCog(commands.Cog):
                 )
                 return
             color = color_value
+        try:
+            validate_template(title)
+            validate_template(description)
+        except TemplateError as exc:
+            await safe_respond(ctx, str(exc), ephemeral=True)
+            return
         self._storage.set_embed_template(str(ctx.guild.id), title, description, color)
         await safe_respond(ctx, "Embed template updated.", ephemeral=True)
         await send_audit(
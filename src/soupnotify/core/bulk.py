@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+from soupnotify.core.render import TemplateError, validate_template
+
+BULK_FORMATS = ("csv", "json")
+BULK_FIELDS = ("soop_channel_id", "notify_channel_id", "message_template")
+MAX_BULK_ROWS = 5000
+MAX_BULK_BYTES = 1024 * 1024
+
+# Accepts a bare channel id or a <#id> mention, like /link does.
+_CHANNEL_RE = re.compile(r"^(?:<#(\d+)>|(\d+))$")
+_SOOP_ID_RE = re.compile(r"^\S{1,64}$")
+
+
+class BulkImportError(ValueError):
+    def __init__(self, errors: list[str]) -> None:
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+@dataclass(frozen=True, slots=True)
+class BulkLink:
+    soop_channel_id: str
+    notify_channel_id: str
+    message_template: str | None = None
+
+
+def detect_format(filename: str | None, requested: str | None = None) -> str:
+    if requested:
+        fmt = requested.lower()
+    elif filename and filename.lower().endswith(".json"):
+        fmt = "json"
+    else:
+        fmt = "csv"
+    if fmt not in BULK_FORMATS:
+        raise BulkImportError([f"Unsupported format `{fmt}`; use csv or json."])
+    return fmt
+
+
+def parse_links(
+    data: bytes,
+    fmt: str,
+    default_notify_channel_id: str | None = None,
+) -> list[BulkLink]:
+    """Parse and validate an import file; raise BulkImportError listing bad rows.
+
+    Nothing is partially accepted: a file with any invalid row is rejected so
+    the import can run as one all-or-nothing transaction.
+    """
+    if len(data) > MAX_BULK_BYTES:
+        raise BulkImportError([f"File is larger than {MAX_BULK_BYTES // 1024} KiB."])
+    try:
+        text = data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise BulkImportError(["File must be UTF-8 encoded."]) from None
+    raw_rows = _read_json(text) if fmt == "json" else _read_csv(text)
+    if len(raw_rows) > MAX_BULK_ROWS:
+        raise BulkImportError([f"At most {MAX_BULK_ROWS} rows can be imported at once."])
+
+    links: list[BulkLink] = []
+    errors: list[str] = []
+    seen: set[str] = set()
+    for number, raw in enumerate(raw_rows, start=1):
+        try:
+            link = _validate_row(raw, default_notify_channel_id)
+        except ValueError as exc:
+            errors.append(f"row {number}: {exc}")
+            continue
+        if link.soop_channel_id in seen:
+            errors.append(f"row {number}: duplicate soop_channel_id `{link.soop_channel_id}`")
+            continue
+        seen.add(link.soop_channel_id)
+        links.append(link)
+    if errors:
+        raise BulkImportError(errors)
+    if not links:
+        raise BulkImportError(["No rows found."])
+    return links
+
+
+def _read_csv(text: str) -> list[dict]:
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames or "soop_channel_id" not in reader.fieldnames:
+        raise BulkImportError(["CSV header must include soop_channel_id."])
+    return list(reader)
+
+
+def _read_json(text: str) -> list[dict]:
+    try:
+        payload = json.loads(text)
+    except json.JSONDecodeError as exc:
+        raise BulkImportError([f"Invalid JSON: {exc.msg} (line {exc.lineno})."]) from None
+    if isinstance(payload, dict):
+        payload = payload.get("links")
+    if not isinstance(payload, list) or not all(isinstance(row, dict) for row in payload):
+        raise BulkImportError(["JSON must be a list of link objects."])
+    return payload
+
+
+def _validate_row(raw: dict, default_notify_channel_id: str | None) -> BulkLink:
+    soop_channel_id = str(raw.get("soop_channel_id") or "").strip()
+    if not _SOOP_ID_RE.match(soop_channel_id):
+        raise ValueError("soop_channel_id is missing or invalid")
+    channel_raw = str(raw.get("notify_channel_id") or "").strip()
+    if channel_raw:
+        match = _CHANNEL_RE.match(channel_raw)
+        if not match:
+            raise ValueError(f"notify_channel_id `{channel_raw}` is not a channel id")
+        notify_channel_id = match.group(1) or match.group(2)
+    elif default_notify_channel_id:
+        notify_channel_id = default_notify_channel_id
+    else:
+        raise ValueError("notify_channel_id is missing and no default channel is set")
+    template = raw.get("message_template") or None
+    if template is not None:
+        template = str(template)
+        try:
+            validate_template(template)
+        except TemplateError as exc:
+            raise ValueError(str(exc)) from None
+    return BulkLink(soop_channel_id, notify_channel_id, template)
+
+
+def iter_export(links: Iterable[dict], fmt: str) -> Iterator[str]:
+    """Yield an export of ``links`` chunk by chunk in the import format."""
+    if fmt == "json":
+        yield "["
+        for index, link in enumerate(links):
+            row = {field: link.get(field) for field in BULK_FIELDS}
+            yield ("," if index else "") + "\n  " + json.dumps(row, ensure_ascii=False)
+        yield "\n]\n"
+        return
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=BULK_FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    for link in links:
+        writer.writerow({field: link.get(field) or "" for field in BULK_FIELDS})
+        if buffer.tell() >= 8192:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def summarize_import(count: int, source: str) -> str:
+    return f"Bulk imported {count} link(s) from {source}."
+
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from typing import Callable
+
+from sqlalchemy.engine import make_url
+
+from soupnotify.core.storage import CHANGES_CHANNEL, Storage
+
+logger = logging.getLogger(__name__)
+
+# Event kinds. "all" is emitted after (re)connecting, when notifications may
+# have been missed, and tells subscribers to drop everything they cache.
+LINKS = "links"
+SETTINGS = "settings"
+# Published when a standalone poller queues go-lives in the outbox.
+OUTBOX = "outbox"
+ALL = "all"
+
+
+@dataclass(frozen=True, slots=True)
+class ChangeEvent:
+    kind: str
+    guild_id: str | None = None
+
+
+ChangeCallback = Callable[[ChangeEvent], None]
+
+
+def parse_change_payload(payload: str) -> ChangeEvent:
+    try:
+        data = json.loads(payload)
+        return ChangeEvent(kind=str(data["kind"]), guild_id=data.get("guild_id"))
+    except (ValueError, KeyError, TypeError):
+        logger.warning("Ignoring malformed change payload: %r", payload)
+        return ChangeEvent(kind=ALL)
+
+
+class ChangeListener:
+    """Delivers Storage change events to in-process caches.
+
+    On Postgres it LISTENs on the channel Storage NOTIFYs after each write. On
+    other databases it polls the change counters kept in poll_state and emits
+    process-wide events when one moves.
+    """
+
+    def __init__(self, storage: Storage, database_url: str, poll_interval: float = 5.0) -> None:
+        self._storage = storage
+        self._database_url = database_url
+        self._poll_interval = max(poll_interval, 0.1)
+        self._callbacks: list[ChangeCallback] = []
+
+    def subscribe(self, callback: ChangeCallback) -> None:
+        self._callbacks.append(callback)
+
+    def dispatch(self, event: ChangeEvent) -> None:
+        for callback in self._callbacks:
+            try:
+                callback(event)
+            except Exception:
+                logger.exception("Change subscriber failed for %s", event)
+
+    async def run(self) -> None:
+        if make_url(self._database_url).get_backend_name() == "postgresql":
+            await self._listen()
+        else:
+            await self._poll()
+
+    async def _listen(self) -> None:
+        import psycopg
+
+        conninfo = (
+            make_url(self._database_url)
+            .set(drivername="postgresql")
+            .render_as_string(hide_password=False)
+        )
+        backoff = 1.0
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    conninfo, autocommit=True
+                ) as conn:
+                    await conn.execute(f"LISTEN {CHANGES_CHANNEL}")
+                    backoff = 1.0
+                    # Anything written while we were disconnected was missed.
+                    self.dispatch(ChangeEvent(kind=ALL))
+                    async for notify in conn.notifies():
+                        self.dispatch(parse_change_payload(notify.payload))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Change listener disconnected: %s; retrying in %.0fs", exc, backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 60.0)
+
+    async def _poll(self) -> None:
+        versions = self._storage.get_change_versions()
+        # Same as a fresh LISTEN: changes made before this point may be cached.
+        self.dispatch(ChangeEvent(kind=ALL))
+        while True:
+            await asyncio.sleep(self._poll_interval)
+            try:
+                current = self._storage.get_change_versions()
+            except Exception:
+                logger.exception("Change poll failed")
+                continue
+            for kind, version in current.items():
+                if versions.get(kind) != version:
+                    self.dispatch(ChangeEvent(kind=kind))
+            versions = current
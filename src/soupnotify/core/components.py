@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any
+
+import discord
+
+# Raw message component payloads (Discord API format). They are shared between
+# queued messages, so callers must treat them as read-only.
+Components = tuple[dict[str, Any], ...]
+
+ACTION_ROW = 1
+BUTTON = 2
+LINK_STYLE = 5
+
+
+@lru_cache(maxsize=4096)
+def watch_button_components(stream_url: str) -> Components:
+    return (
+        {
+            "type": ACTION_ROW,
+            "components": [
+                {"type": BUTTON, "style": LINK_STYLE, "label": "Watch Stream", "url": stream_url}
+            ],
+        },
+    )
+
+
+def view_from_components(components: Components) -> discord.ui.View:
+    """Build a transient View for channel.send from link-button payloads."""
+    view = discord.ui.View(timeout=None)
+    for row_index, row in enumerate(components):
+        for item in row.get("components", []):
+            if item.get("type") == BUTTON and item.get("style") == LINK_STYLE:
+                view.add_item(
+                    discord.ui.Button(
+                        label=item.get("label"),
+                        style=discord.ButtonStyle.link,
+                        url=item["url"],
+                        row=row_index,
+                    )
+                )
+    return view
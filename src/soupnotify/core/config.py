@@ -5,6 +5,8 @@ from typing import Any
 
 from dotenv import load_dotenv
 
+POLLER_MODES = ("embedded", "external")
+
 
 def _parse_json(value: str | None) -> dict[str, Any]:
     if not value:
@@ -16,6 +18,28 @@ def _parse_json(value: str | None) -> dict[str, Any]:
         return {}
 
 
+def _parse_poller_mode(value: str | None) -> str:
+    mode = (value or "embedded").strip().lower()
+    if mode not in POLLER_MODES:
+        # A typo must not silently start a second poller next to the standalone one.
+        raise ValueError(f"POLLER_MODE must be one of {', '.join(POLLER_MODES)}: {value}")
+    return mode
+
+
+def _parse_shard_ids(value: str | None, shard_count: int | None) -> tuple[int, ...] | None:
+    if not value:
+        return None
+    if not shard_count:
+        raise ValueError("SHARD_IDS requires SHARD_COUNT")
+    try:
+        shard_ids = tuple(sorted({int(part) for part in value.split(",") if part.strip()}))
+    except ValueError:
+        raise ValueError(f"SHARD_IDS must be comma-separated integers: {value}") from None
+    if not shard_ids or any(not 0 <= shard_id < shard_count for shard_id in shard_ids):
+        raise ValueError(f"SHARD_IDS must be between 0 and {shard_count - 1}: {value}")
+    return shard_ids
+
+
 @dataclass(frozen=True)
 class Settings:
     soop_channel_api_base_url: str
@@ -29,10 +53,22 @@ class Settings:
     notify_rate_per_second: float
     notify_burst_rate_per_second: float
     notify_burst_threshold: int
+    notify_concurrency: int
+    notify_delivery_mode: str
     shard_count: int | None
+    shard_ids: tuple[int, ...] | None
     soop_retry_max: int
     soop_retry_backoff: float
     soop_info_cooldown_seconds: int
+    change_poll_interval_seconds: float
+    leader_lease_seconds: float
+    poll_partitions: int
+    poller_mode: str
+    snapshot_path: str | None
+    snapshot_interval_seconds: float
+    catchup_gap_seconds: float
+    metrics_dir: str | None
+    metrics_interval_seconds: float
     log_level: str
 
 
@@ -41,6 +77,14 @@ class BotSettings(Settings):
     discord_token: str
     discord_application_id: str
     discord_guild_id: str | None
+    discord_api_base_url: str
+
+
+@dataclass(frozen=True)
+class ApiSettings(Settings):
+    api_token: str | None
+    discord_token: str | None
+    discord_api_base_url: str
 
 
 def _get_env(name: str, required: bool = False, default: str | None = None) -> str | None:
@@ -54,6 +98,7 @@ def load_settings() -> Settings:
     load_dotenv()
     shard_raw = _get_env("SHARD_COUNT")
     shard_count = int(shard_raw) if shard_raw else None
+    shard_ids = _parse_shard_ids(_get_env("SHARD_IDS"), shard_count)
     return Settings(
         soop_channel_api_base_url=_get_env(
             "SOOP_CHANNEL_API_BASE_URL", default="https://api-channel.sooplive.co.kr"
@@ -82,7 +127,10 @@ def load_settings() -> Settings:
         notify_burst_threshold=int(
             _get_env("NOTIFY_BURST_THRESHOLD", default="25") or "25"
         ),
+        notify_concurrency=int(_get_env("NOTIFY_CONCURRENCY", default="4") or "4"),
+        notify_delivery_mode=(_get_env("NOTIFY_DELIVERY_MODE", default="bot") or "bot").lower(),
         shard_count=shard_count,
+        shard_ids=shard_ids,
         soop_retry_max=int(_get_env("SOOP_RETRY_MAX", default="3") or "3"),
         soop_retry_backoff=float(
             _get_env("SOOP_RETRY_BACKOFF", default="0.5") or "0.5"
@@ -90,6 +138,21 @@ def load_settings() -> Settings:
         soop_info_cooldown_seconds=int(
             _get_env("SOOP_INFO_COOLDOWN_SECONDS", default="30") or "30"
         ),
+        change_poll_interval_seconds=float(
+            _get_env("CHANGE_POLL_INTERVAL_SECONDS", default="5") or "5"
+        ),
+        leader_lease_seconds=float(_get_env("LEADER_LEASE_SECONDS", default="30") or "30"),
+        poll_partitions=int(_get_env("POLL_PARTITIONS", default="0") or "0"),
+        poller_mode=_parse_poller_mode(_get_env("POLLER_MODE")),
+        snapshot_path=_get_env("SNAPSHOT_PATH") or None,
+        snapshot_interval_seconds=float(
+            _get_env("SNAPSHOT_INTERVAL_SECONDS", default="60") or "60"
+        ),
+        catchup_gap_seconds=float(_get_env("CATCHUP_GAP_SECONDS", default="180") or "180"),
+        metrics_dir=_get_env("METRICS_DIR") or None,
+        metrics_interval_seconds=float(
+            _get_env("METRICS_INTERVAL_SECONDS", default="15") or "15"
+        ),
         log_level=_get_env("LOG_LEVEL", default="info") or "info",
     )
 
@@ -101,4 +164,21 @@ def load_bot_settings() -> BotSettings:
         discord_token=_get_env("DISCORD_TOKEN", required=True),
         discord_application_id=_get_env("DISCORD_APPLICATION_ID", required=True),
         discord_guild_id=_get_env("DISCORD_GUILD_ID"),
+        discord_api_base_url=_get_env(
+            "DISCORD_API_BASE_URL", default="https://discord.com/api/v10"
+        )
+        or "https://discord.com/api/v10",
+    )
+
+
+def load_api_settings() -> ApiSettings:
+    base = load_settings()
+    return ApiSettings(
+        **base.__dict__,
+        api_token=_get_env("API_TOKEN"),
+        discord_token=_get_env("DISCORD_TOKEN"),
+        discord_api_base_url=_get_env(
+            "DISCORD_API_BASE_URL", default="https://discord.com/api/v10"
+        )
+        or "https://discord.com/api/v10",
     )
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DISCORD_API_BASE_URL = "https://discord.com/api/v10"
+
+CREATE_MESSAGE_ROUTE = "POST /channels/{channel_id}/messages"
+CREATE_WEBHOOK_ROUTE = "POST /channels/{channel_id}/webhooks"
+EXECUTE_WEBHOOK_ROUTE = "POST /webhooks/{webhook_id}/{webhook_token}"
+# Reset times from two responses closer than this belong to the same window.
+SAME_WINDOW_SECONDS = 1.0
+
+
+class DiscordHTTPError(Exception):
+    def __init__(self, status: int, message: str, code: int | None = None) -> None:
+        super().__init__(f"{status}: {message}")
+        self.status = status
+        self.code = code
+
+
+class DiscordForbiddenError(DiscordHTTPError):
+    pass
+
+
+class DiscordNotFoundError(DiscordHTTPError):
+    pass
+
+
+@dataclass
+class _BucketState:
+    limit: int
+    remaining: int
+    reset_at: float
+    # Length of the last known window, used to pace a refill before headers.
+    window: float
+
+
+class RateLimitTracker:
+    """Per-route bucket state learned from Discord's X-RateLimit-* response headers.
+
+    Routes are mapped to the bucket hash Discord reports so routes sharing a
+    bucket also share state. State is further split by the major parameter
+    (channel, guild or webhook id), mirroring how Discord scopes its limits.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._route_buckets: dict[str, str] = {}
+        self._buckets: dict[str, _BucketState] = {}
+        self._global_reset_at = 0.0
+
+    def _key(self, route: str, major: str) -> str:
+        return f"{self._route_buckets.get(route, route)}:{major}"
+
+    def delay_for(self, route: str, major: str, include_global: bool = True) -> float:
+        now = self._clock()
+        delay = self._global_reset_at - now if include_global else 0.0
+        state = self._buckets.get(self._key(route, major))
+        if state and state.remaining <= 0 and state.reset_at > now:
+            delay = max(delay, state.reset_at - now)
+        return max(delay, 0.0)
+
+    async def acquire(self, route: str, major: str, include_global: bool = True) -> None:
+        while True:
+            delay = self.delay_for(route, major, include_global)
+            if delay <= 0:
+                break
+            await asyncio.sleep(delay)
+        state = self._buckets.get(self._key(route, major))
+        if not state:
+            return
+        now = self._clock()
+        if state.reset_at <= now:
+            # The window rolled over without fresh headers; assume a full bucket
+            # and a window like the last one, so concurrent senders count down
+            # this one budget until a response reports the real state.
+            state.remaining = state.limit
+            state.reset_at = now + state.window
+        # Reserve a slot so concurrent senders don't overdraw the bucket.
+        state.remaining -= 1
+
+    def update(self, route: str, major: str, headers: Mapping[str, str]) -> None:
+        bucket = headers.get("x-ratelimit-bucket")
+        if bucket:
+            self._route_buckets[route] = bucket
+        remaining = headers.get("x-ratelimit-remaining")
+        reset_after = headers.get("x-ratelimit-reset-after")
+        if remaining is None or reset_after is None:
+            return
+        try:
+            limit = int(headers.get("x-ratelimit-limit") or remaining)
+            now = self._clock()
+            reset_at = now + float(reset_after)
+            header_remaining = int(remaining)
+        except ValueError:
+            logger.debug("Ignoring malformed rate limit headers for %s", route)
+            return
+        key = self._key(route, major)
+        state = self._buckets.get(key)
+        if state and now < state.reset_at and reset_at - state.reset_at < SAME_WINDOW_SECONDS:
+            # Other workers may have reserved slots since this request was
+            # answered; the header doesn't count those, so keep the lower value.
+            header_remaining = min(header_remaining, state.remaining)
+        self._buckets[key] = _BucketState(
+            limit=limit, remaining=header_remaining, reset_at=reset_at, window=float(reset_after)
+        )
+
+    def block(self, route: str, major: str, retry_after: float, is_global: bool) -> None:
+        retry_after = max(retry_after, 0.0)
+        reset_at = self._clock() + retry_after
+        if is_global:
+            self._global_reset_at = max(self._global_reset_at, reset_at)
+            return
+        key = self._key(route, major)
+        state = self._buckets.get(key)
+        limit = state.limit if state else 1
+        window = state.window if state else retry_after
+        self._buckets[key] = _BucketState(
+            limit=limit, remaining=0, reset_at=reset_at, window=window
+        )
+
+
+class DiscordRestClient:
+    """Minimal Discord REST client that paces requests from rate limit headers."""
+
+    def __init__(
+        self,
+        token: str,
+        base_url: str = DISCORD_API_BASE_URL,
+        tracker: RateLimitTracker | None = None,
+        max_retries: int = 5,
+    ) -> None:
+        self._base_url = base_url.rstrip("/")
+        self._tracker = tracker or RateLimitTracker()
+        self._max_retries = max(max_retries, 1)
+        self._auth_headers = {"Authorization": f"Bot {token}"}
+        self._client = httpx.AsyncClient(
+            timeout=10.0,
+            headers={"User-Agent": "SoupNotify (httpx)"},
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+        )
+
+    @property
+    def tracker(self) -> RateLimitTracker:
+        return self._tracker
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def create_message(self, channel_id: int, payload: dict[str, Any]) -> dict[str, Any]:
+        response = await self.request(
+            "POST",
+            CREATE_MESSAGE_ROUTE,
+            f"/channels/{channel_id}/messages",
+            major=str(channel_id),
+            json=payload,
+        )
+        return response.json()
+
+    async def create_webhook(self, channel_id: int, name: str) -> dict[str, Any]:
+        response = await self.request(
+            "POST",
+            CREATE_WEBHOOK_ROUTE,
+            f"/channels/{channel_id}/webhooks",
+            major=str(channel_id),
+            json={"name": name},
+        )
+        return response.json()
+
+    async def execute_webhook(
+        self, webhook_id: str, webhook_token: str, payload: dict[str, Any]
+    ) -> None:
+        # Webhook executions are authenticated by the token in the URL. Sending
+        # them without the bot Authorization header keeps them out of the bot's
+        # global rate limit; each webhook gets its own bucket.
+        await self.request(
+            "POST",
+            EXECUTE_WEBHOOK_ROUTE,
+            f"/webhooks/{webhook_id}/{webhook_token}",
+            major=webhook_id,
+            json=payload,
+            authenticated=False,
+        )
+
+    async def request(
+        self,
+        method: str,
+        route: str,
+        path: str,
+        major: str,
+        json: dict[str, Any] | None = None,
+        params: dict[str, Any] | None = None,
+        authenticated: bool = True,
+    ) -> httpx.Response:
+        last_error: Exception | None = None
+        for attempt in range(self._max_retries):
+            await self._tracker.acquire(route, major, include_global=authenticated)
+            try:
+                response = await self._client.request(
+                    method,
+                    f"{self._base_url}{path}",
+                    json=json,
+                    params=params,
+                    headers=self._auth_headers if authenticated else None,
+                )
+            except httpx.TransportError as exc:
+                last_error = exc
+                await asyncio.sleep(0.5 * (2**attempt) + random.uniform(0, 0.2))
+                continue
+            self._tracker.update(route, major, response.headers)
+            if response.status_code == 429:
+                retry_after, is_global = _retry_after(response)
+                logger.warning(
+                    "Discord rate limited %s (global=%s); retrying in %.2fs",
+                    route,
+                    is_global,
+                    retry_after,
+                )
+                self._tracker.block(route, major, retry_after, is_global and authenticated)
+                last_error = DiscordHTTPError(429, "rate limited")
+                continue
+            if response.status_code >= 500:
+                last_error = DiscordHTTPError(response.status_code, response.text[:200])
+                await asyncio.sleep(0.5 * (2**attempt) + random.uniform(0, 0.2))
+                continue
+            if response.status_code >= 400:
+                raise _http_error(response)
+            return response
+        if last_error:
+            raise last_error
+        raise RuntimeError("Discord request failed")
+
+
+def _retry_after(response: httpx.Response) -> tuple[float, bool]:
+    is_global = response.headers.get("x-ratelimit-global", "").lower() == "true"
+    retry_after: float | None = None
+    try:
+        payload = response.json()
+        retry_after = float(payload.get("retry_after"))
+        is_global = is_global or bool(payload.get("global"))
+    except (ValueError, TypeError, AttributeError):
+        pass
+    if retry_after is None:
+        try:
+            retry_after = float(response.headers.get("retry-after", "1"))
+        except ValueError:
+            retry_after = 1.0
+    return retry_after, is_global
+
+
+def _http_error(response: httpx.Response) -> DiscordHTTPError:
+    message = response.text[:200]
+    code: int | None = None
+    try:
+        payload = response.json()
+        message = str(payload.get("message", message))
+        code = payload.get("code")
+    except (ValueError, AttributeError):
+        pass
+    if response.status_code == 403:
+        return DiscordForbiddenError(403, message, code)
+    if response.status_code == 404:
+        return DiscordNotFoundError(404, message, code)
+    return DiscordHTTPError(response.status_code, message, code)
@@ -11,11 +11,14 @@ async def safe_respond(
     *,
     embed: discord.Embed | None = None,
     view: discord.ui.View | None = None,
+    file: discord.File | None = None,
     ephemeral: bool = False,
 ) -> None:
     kwargs = {"content": content, "embed": embed, "ephemeral": ephemeral}
     if view is not None:
         kwargs["view"] = view
+    if file is not None:
+        kwargs["file"] = file
     if ctx.response.is_done():
         await ctx.followup.send(**kwargs)
     else:
@@ -30,9 +30,6 @@ def build_live_embed(
         if broad_title:
             embed.description = str(broad_title)
 
-    if description_override:
-        embed.description = description_override
-
         category = info.get("categoryName")
         viewers = info.get("currentSumViewer")
         if category:
@@ -40,7 +37,33 @@ def build_live_embed(
         if viewers is not None:
             embed.add_field(name="Viewers", value=str(viewers), inline=True)
 
+    if description_override:
+        embed.description = description_override
+
     embed.add_field(name="Watch", value=stream_url, inline=False)
     if thumbnail_url:
         embed.set_image(url=thumbnail_url)
     return embed
+
+
+def apply_embed_overrides(
+    base: discord.Embed,
+    title_override: str | None = None,
+    description_override: str | None = None,
+    color_hex: str | None = None,
+) -> discord.Embed:
+    """Return a copy of a shared base embed with per-guild overrides applied.
+
+    Produces the same result as calling ``build_live_embed`` with the overrides,
+    without rebuilding fields and images. The base embed is left untouched.
+    """
+    if not title_override and not description_override and not color_hex:
+        return base
+    embed = base.copy()
+    if title_override:
+        embed.title = title_override
+    if description_override:
+        embed.description = description_override
+    if color_hex:
+        embed.colour = _parse_color(color_hex)
+    return embed
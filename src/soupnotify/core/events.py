@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, ClassVar
+
+from soupnotify.core.metrics import BotMetrics
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class StreamEvent:
+    """A live-state transition of one SOOP streamer, seen by the poller."""
+
+    kind: ClassVar[str] = "stream"
+    soop_channel_id: str
+    broad_no: str | None
+    detected_at: float
+
+
+@dataclass(frozen=True, slots=True)
+class WentLive(StreamEvent):
+    kind: ClassVar[str] = "went_live"
+    info: dict[str, Any] | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class WentOffline(StreamEvent):
+    kind: ClassVar[str] = "went_offline"
+
+
+@dataclass(frozen=True, slots=True)
+class BroadcastRestarted(StreamEvent):
+    """Still live, but under a new broad_no (the stream was restarted)."""
+
+    kind: ClassVar[str] = "broadcast_restarted"
+    previous_broad_no: str | None = None
+    info: dict[str, Any] | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class TitleChanged(StreamEvent):
+    kind: ClassVar[str] = "title_changed"
+    previous_title: str = ""
+    title: str = ""
+
+
+EventHandler = Callable[[StreamEvent], Awaitable[None] | None]
+
+
+class _Subscriber:
+    def __init__(
+        self,
+        handler: EventHandler,
+        event_types: tuple[type[StreamEvent], ...],
+        maxsize: int,
+        name: str,
+    ) -> None:
+        self.handler = handler
+        self.event_types = event_types
+        self.name = name
+        self.queue: asyncio.Queue[StreamEvent] = asyncio.Queue(maxsize=max(maxsize, 1))
+
+    def wants(self, event: StreamEvent) -> bool:
+        return not self.event_types or isinstance(event, self.event_types)
+
+    async def run(self) -> None:
+        while True:
+            event = await self.queue.get()
+            try:
+                result = self.handler(event)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                logger.exception("Event subscriber %s failed on %s", self.name, event.kind)
+            finally:
+                self.queue.task_done()
+
+
+class EventBus:
+    """In-process fan-out of StreamEvents to independent subscribers.
+
+    publish() never waits: each subscriber has its own bounded queue drained
+    by its own task, so a slow subscriber neither delays the poll loop nor the
+    other subscribers. When a queue is full the new event is dropped for that
+    subscriber and counted in BotMetrics.events_dropped.
+    """
+
+    def __init__(self, metrics: BotMetrics | None = None) -> None:
+        self._metrics = metrics
+        self._subscribers: list[_Subscriber] = []
+
+    def subscribe(
+        self,
+        handler: EventHandler,
+        *event_types: type[StreamEvent],
+        maxsize: int = 1000,
+        name: str | None = None,
+    ) -> None:
+        """Call ``handler`` for every event of ``event_types`` (all if none given)."""
+        name = name or getattr(handler, "__qualname__", repr(handler))
+        self._subscribers.append(_Subscriber(handler, event_types, maxsize, name))
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def publish(self, event: StreamEvent) -> None:
+        for subscriber in self._subscribers:
+            if not subscriber.wants(event):
+                continue
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logger.debug("Event queue for %s is full; dropped %s", subscriber.name, event.kind)
+                if self._metrics:
+                    self._metrics.record_event_dropped()
+
+    async def join(self) -> None:
+        """Wait until every subscriber has handled everything published so far."""
+        for subscriber in self._subscribers:
+            await subscriber.queue.join()
+
+    async def run(self) -> None:
+        await asyncio.gather(*(subscriber.run() for subscriber in self._subscribers))
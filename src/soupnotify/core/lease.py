@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Callable
+
+from soupnotify.core.storage import Storage
+
+logger = logging.getLogger(__name__)
+
+POLLER_LEASE = "poller"
+
+
+def default_owner_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class LeaseKeeper:
+    """Holds a named lease row, renewing it until the process stops.
+
+    Replicas all run a keeper; whichever holds the lease is the leader and the
+    rest stay on standby, retrying every ``renew_interval``. A dead leader's
+    lease lapses after ``ttl_seconds``, so a standby takes over within
+    ``ttl_seconds + renew_interval``.
+    """
+
+    def __init__(
+        self,
+        storage: Storage,
+        name: str,
+        ttl_seconds: float = 30.0,
+        owner: str | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._storage = storage
+        self._name = name
+        self._ttl = max(ttl_seconds, 1.0)
+        self._renew_interval = self._ttl / 3
+        self._owner = owner or default_owner_id()
+        self._clock = clock
+        self._valid_until = 0.0
+        self._leader_event = asyncio.Event()
+
+    @property
+    def owner(self) -> str:
+        return self._owner
+
+    @property
+    def is_leader(self) -> bool:
+        # Stop acting as leader once our own copy of the lease would have
+        # lapsed, even if the renewal that would tell us so is still hanging.
+        return self._clock() < self._valid_until
+
+    async def wait_until_leader(self) -> None:
+        while not self.is_leader:
+            self._leader_event.clear()
+            await self._leader_event.wait()
+
+    def renew(self) -> bool:
+        started = self._clock()
+        was_leader = self.is_leader
+        try:
+            held = self._storage.acquire_lease(self._name, self._owner, self._ttl)
+        except Exception:
+            logger.exception("Lease %s renewal failed", self._name)
+            held = False
+        if held:
+            self._valid_until = started + self._ttl
+            self._leader_event.set()
+        else:
+            self._valid_until = 0.0
+        if held and not was_leader:
+            logger.info("Acquired %s lease as %s", self._name, self._owner)
+        elif was_leader and not held:
+            logger.warning("Lost %s lease; standing by", self._name)
+        return held
+
+    async def run(self) -> None:
+        try:
+            while True:
+                self.renew()
+                await asyncio.sleep(self._renew_interval)
+        finally:
+            if self.is_leader:
+                self._storage.release_lease(self._name, self._owner)
@@ -1,13 +1,120 @@
 from __future__ import annotations
 
+import bisect
 import time
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, field
+
+# Upper bounds (ms) for cumulative histogram buckets; the last bucket is +Inf.
+DEFAULT_LATENCY_BUCKETS_MS: tuple[float, ...] = (
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    10000,
+    30000,
+    60000,
+    120000,
+)
+
+# Coarser buckets (ms) for lags measured from the SOOP broadcast start.
+BROADCAST_LAG_BUCKETS_MS: tuple[float, ...] = (
+    1000,
+    5000,
+    10000,
+    15000,
+    30000,
+    45000,
+    60000,
+    90000,
+    120000,
+    180000,
+    300000,
+    600000,
+)
+
+
+# Poll cycle stages in pipeline order, as recorded by StageTimer.mark().
+POLL_STAGES: tuple[str, ...] = ("links", "fetch", "diff", "render", "enqueue", "store")
+RECENT_POLL_CYCLES = 20
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram plus a rolling window of samples for percentiles."""
+
+    def __init__(
+        self,
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS_MS,
+        window: int = 1024,
+    ) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self._recent: deque[float] = deque(maxlen=window)
+
+    def observe(self, value_ms: float) -> None:
+        value_ms = max(value_ms, 0.0)
+        self.bucket_counts[bisect.bisect_left(self.buckets, value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+        self._recent.append(value_ms)
+
+    def percentile(self, pct: float) -> float | None:
+        if not self._recent:
+            return None
+        ordered = sorted(self._recent)
+        index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def summary(self) -> str:
+        if not self._recent:
+            return "n/a"
+        p50 = self.percentile(50)
+        p95 = self.percentile(95)
+        p99 = self.percentile(99)
+        return f"p50={p50:.0f}ms p95={p95:.0f}ms p99={p99:.0f}ms (n={self.count})"
+
+
+class StageTimer:
+    """Splits one poll cycle into consecutive stages.
+
+    Each mark() charges the time since the previous mark to ``stage``; stages
+    marked more than once (e.g. per delivery) accumulate.
+    """
+
+    def __init__(self) -> None:
+        self.stages: dict[str, float] = {}
+        self._started = self._last = time.perf_counter()
+
+    def mark(self, stage: str) -> None:
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + (now - self._last) * 1000
+        self._last = now
+
+    @property
+    def total_ms(self) -> float:
+        return (self._last - self._started) * 1000
+
+
+@dataclass(frozen=True, slots=True)
+class PollCycle:
+    finished_at: float
+    duration_ms: float
+    stages: dict[str, float]
 
 
 @dataclass
 class BotMetrics:
     messages_sent: int = 0
     messages_failed: int = 0
+    messages_skipped: int = 0
     api_errors: int = 0
     cache_hits: int = 0
     cache_misses: int = 0
@@ -18,15 +125,55 @@ class BotMetrics:
     live_detected: int = 0
     empty_responses: int = 0
     last_empty_count: int = 0
+    events_dropped: int = 0
+    catch_up_polls: int = 0
+    transitions: dict[str, int] = field(default_factory=dict)
     _queue_size: int = 0
+    queue_wait: LatencyHistogram = field(default_factory=LatencyHistogram)
+    send_duration: LatencyHistogram = field(default_factory=LatencyHistogram)
+    delivery_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    detection_lag: LatencyHistogram = field(
+        default_factory=lambda: LatencyHistogram(BROADCAST_LAG_BUCKETS_MS)
+    )
+    go_live_lag: LatencyHistogram = field(
+        default_factory=lambda: LatencyHistogram(BROADCAST_LAG_BUCKETS_MS)
+    )
+    poll_duration: LatencyHistogram = field(default_factory=LatencyHistogram)
+    # One sample per SOOP broad info request, failed ones included.
+    fetch_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    poll_stages: dict[str, LatencyHistogram] = field(default_factory=dict)
+    recent_polls: deque[PollCycle] = field(
+        default_factory=lambda: deque(maxlen=RECENT_POLL_CYCLES)
+    )
 
     def record_poll(self, duration_ms: float, live_count: int) -> None:
         self.last_poll_duration_ms = duration_ms
+        self.poll_duration.observe(duration_ms)
         self.last_poll_at = time.time()
         self.poll_count += 1
         self.last_live_count = live_count
         self.last_empty_count = 0
 
+    def record_poll_stages(self, timer: StageTimer) -> None:
+        for stage, duration_ms in timer.stages.items():
+            histogram = self.poll_stages.get(stage)
+            if histogram is None:
+                histogram = self.poll_stages[stage] = LatencyHistogram(window=256)
+            histogram.observe(duration_ms)
+        self.recent_polls.append(PollCycle(time.time(), timer.total_ms, dict(timer.stages)))
+
+    def poll_cycle_table(self, limit: int = 10) -> list[str]:
+        """Fixed-width rows (ms per stage) for the last ``limit`` poll cycles."""
+        header = f"{'time':<8} {'total':>7}" + "".join(f" {stage:>7}" for stage in POLL_STAGES)
+        rows = [header]
+        for cycle in list(self.recent_polls)[-max(limit, 1) :]:
+            finished = time.strftime("%H:%M:%S", time.gmtime(cycle.finished_at))
+            rows.append(
+                f"{finished:<8} {cycle.duration_ms:>7.1f}"
+                + "".join(f" {cycle.stages.get(stage, 0.0):>7.1f}" for stage in POLL_STAGES)
+            )
+        return rows
+
     def record_live_detected(self, count: int) -> None:
         self.live_detected += count
 
@@ -40,6 +187,18 @@ class BotMetrics:
     def record_failed(self) -> None:
         self.messages_failed += 1
 
+    def record_skipped(self) -> None:
+        self.messages_skipped += 1
+
+    def record_transition(self, event) -> None:
+        self.transitions[event.kind] = self.transitions.get(event.kind, 0) + 1
+
+    def record_event_dropped(self) -> None:
+        self.events_dropped += 1
+
+    def record_catch_up(self) -> None:
+        self.catch_up_polls += 1
+
     def record_api_error(self) -> None:
         self.api_errors += 1
 
@@ -49,6 +208,22 @@ class BotMetrics:
     def record_cache_miss(self) -> None:
         self.cache_misses += 1
 
+    def record_fetch_latency(self, latency_ms: float) -> None:
+        self.fetch_latency.observe(latency_ms)
+
+    def record_queue_wait(self, wait_ms: float) -> None:
+        self.queue_wait.observe(wait_ms)
+
+    def record_send_duration(self, duration_ms: float) -> None:
+        self.send_duration.observe(duration_ms)
+
+    def record_delivery_latency(self, latency_ms: float) -> None:
+        self.delivery_latency.observe(latency_ms)
+
+    def record_broadcast_lag(self, detection_lag_ms: float, delivery_lag_ms: float) -> None:
+        self.detection_lag.observe(detection_lag_ms)
+        self.go_live_lag.observe(delivery_lag_ms)
+
     def set_queue_size(self, size: int) -> None:
         self._queue_size = size
 
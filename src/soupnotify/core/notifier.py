@@ -1,21 +1,43 @@
 import asyncio
 import logging
 import random
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
+from typing import Any
 
 import discord
 
+from soupnotify.core.components import Components, view_from_components
+from soupnotify.core.discord_http import (
+    DiscordForbiddenError,
+    DiscordHTTPError,
+    DiscordNotFoundError,
+    DiscordRestClient,
+)
 from soupnotify.core.metrics import BotMetrics
+from soupnotify.core.storage import Storage
 
 logger = logging.getLogger(__name__)
 
+DELIVERY_MODES = {"bot", "webhook"}
+WEBHOOK_NAME = "SoupNotify"
+# Nothing in the content may ping unless the guild configured that mention.
+NO_MENTIONS: dict[str, Any] = {"parse": []}
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class NotifyMessage:
     channel_id: int
     content: str | None
     embed: discord.Embed | None
-    view: discord.ui.View | None
+    # Shared raw component payload; a View is only built at send time if needed.
+    components: Components | None
+    # Raw allowed_mentions payload; None allows no mentions at all.
+    allowed_mentions: dict[str, Any] | None = None
+    # Wall-clock timestamps (time.time()) used for latency histograms.
+    detected_at: float | None = None
+    broad_started_at: float | None = None
+    enqueued_at: float = field(default_factory=time.time)
 
 
 class Notifier:
@@ -27,56 +49,162 @@ class Notifier:
         burst_threshold: int,
         metrics: BotMetrics,
         max_queue: int = 1000,
+        storage: Storage | None = None,
+        rest: DiscordRestClient | None = None,
+        concurrency: int = 1,
+        delivery_mode: str = "bot",
     ) -> None:
+        if delivery_mode not in DELIVERY_MODES:
+            raise ValueError(f"Unknown notify delivery mode: {delivery_mode}")
         self._bot = bot
         self._queue: asyncio.Queue[NotifyMessage] = asyncio.Queue(maxsize=max_queue)
+        # Fixed pacing is only used for channel.send; the REST client paces itself
+        # from Discord's rate limit headers, so several workers can share it.
         self._base_delay = 1.0 / max(rate_per_second, 0.1)
         self._burst_delay = 1.0 / max(burst_rate_per_second, 0.1)
         self._burst_threshold = max(burst_threshold, 1)
-        self._task: asyncio.Task | None = None
+        self._rest = rest
+        self._concurrency = max(concurrency, 1) if rest else 1
+        self._tasks: list[asyncio.Task] = []
+        # Webhook mode needs the REST client; without it everything goes through the bot.
+        self._use_webhooks = rest is not None and delivery_mode == "webhook"
+        # channel id -> webhook credentials, or None when creation is not permitted.
+        self._webhooks: dict[int, dict[str, str] | None] = {}
+        self._webhook_locks: dict[int, asyncio.Lock] = {}
         self._metrics = metrics
+        self._storage = storage
+        # Channels that are known to be deleted or missing permissions, with a reason.
+        self._unreachable: dict[int, str] = {}
 
     async def start(self) -> None:
-        if self._task and not self._task.done():
+        if any(not task.done() for task in self._tasks):
+            return
+        if self._storage:
+            self._unreachable = {
+                int(channel_id): reason
+                for channel_id, reason in self._storage.list_flagged_notify_channels().items()
+                if channel_id.isdigit()
+            }
+            self.mark_reachable(
+                [channel_id for channel_id in self._unreachable if self._can_send(channel_id)]
+            )
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self._concurrency)]
+
+    def is_unreachable(self, channel_id: int) -> bool:
+        return channel_id in self._unreachable
+
+    def mark_unreachable(self, channel_ids: list[int], reason: str) -> None:
+        new_ids = [
+            channel_id
+            for channel_id in channel_ids
+            if self._unreachable.get(channel_id) != reason
+        ]
+        if not new_ids:
+            return
+        for channel_id in new_ids:
+            self._unreachable[channel_id] = reason
+        if self._storage:
+            flagged = self._storage.flag_notify_channels(
+                [str(channel_id) for channel_id in new_ids], reason
+            )
+            if flagged:
+                logger.warning("Flagged %s link(s) as unreachable: %s", flagged, reason)
+
+    def mark_reachable(self, channel_ids: list[int]) -> None:
+        known = [channel_id for channel_id in channel_ids if channel_id in self._unreachable]
+        if not known:
             return
-        self._task = asyncio.create_task(self._worker())
+        for channel_id in known:
+            self._unreachable.pop(channel_id, None)
+            if self._webhooks.get(channel_id, {}) is None:
+                # Permissions changed; allow another webhook creation attempt.
+                self._webhooks.pop(channel_id, None)
+        if self._storage:
+            self._storage.clear_notify_channel_flags([str(channel_id) for channel_id in known])
 
     async def enqueue(
         self,
         channel_id: int,
         content: str | None = None,
         embed: discord.Embed | None = None,
-        view: discord.ui.View | None = None,
+        components: Components | None = None,
+        detected_at: float | None = None,
+        broad_started_at: float | None = None,
+        allowed_mentions: dict[str, Any] | None = None,
     ) -> None:
         if not content and not embed:
             return
         try:
             self._queue.put_nowait(
-                NotifyMessage(channel_id=channel_id, content=content, embed=embed, view=view)
+                NotifyMessage(
+                    channel_id=channel_id,
+                    content=content,
+                    embed=embed,
+                    components=components,
+                    detected_at=detected_at,
+                    broad_started_at=broad_started_at,
+                    allowed_mentions=allowed_mentions,
+                )
             )
             self._metrics.set_queue_size(self._queue.qsize())
         except asyncio.QueueFull:
             logger.warning("Notification queue is full; dropping message for %s", channel_id)
 
+    def _can_send(self, channel_id: int) -> bool:
+        channel = self._bot.get_channel(channel_id)
+        guild = getattr(channel, "guild", None)
+        if not channel or not guild:
+            return False
+        return channel.permissions_for(guild.me).send_messages
+
     async def _worker(self) -> None:
         while True:
             message = await self._queue.get()
             self._metrics.set_queue_size(self._queue.qsize())
+            self._metrics.record_queue_wait((time.time() - message.enqueued_at) * 1000)
+            if message.channel_id in self._unreachable:
+                self._metrics.record_skipped()
+                continue
+            if self._rest:
+                # REST sends by channel id. The gateway cache may still be cold
+                # after a start or reconnect, so only Discord's 403/404 flags
+                # a channel here.
+                await self._send_with_retry(None, message)
+                continue
             channel = self._bot.get_channel(message.channel_id)
-            if channel:
-                await self._send_with_retry(channel, message)
+            if not channel:
+                self.mark_unreachable([message.channel_id], "channel not found")
+                self._metrics.record_skipped()
+                continue
+            await self._send_with_retry(channel, message)
             delay = self._burst_delay if self._queue.qsize() >= self._burst_threshold else self._base_delay
             await asyncio.sleep(delay)
 
-    async def _send_with_retry(self, channel: discord.abc.Messageable, message: NotifyMessage) -> None:
+    async def _send_with_retry(
+        self, channel: discord.abc.Messageable | None, message: NotifyMessage
+    ) -> None:
         for attempt in range(3):
             try:
-                await channel.send(
-                    content=message.content,
-                    embed=message.embed,
-                    view=message.view,
-                )
+                started = time.perf_counter()
+                await self._deliver(channel, message)
+                self._metrics.record_send_duration((time.perf_counter() - started) * 1000)
                 self._metrics.record_sent()
+                delivered_at = time.time()
+                origin = message.detected_at or message.enqueued_at
+                self._metrics.record_delivery_latency((delivered_at - origin) * 1000)
+                self._record_broadcast_lag(message, delivered_at)
+                return
+            except (
+                discord.Forbidden,
+                discord.NotFound,
+                DiscordForbiddenError,
+                DiscordNotFoundError,
+            ) as exc:
+                # Retrying cannot fix a deleted channel or missing permission.
+                self._metrics.record_failed()
+                forbidden = isinstance(exc, (discord.Forbidden, DiscordForbiddenError))
+                reason = "missing permissions" if forbidden else "not found"
+                self.mark_unreachable([message.channel_id], reason)
                 return
             except Exception:
                 self._metrics.record_failed()
@@ -84,3 +212,97 @@ class Notifier:
                 base_delay = 0.5 * (2**attempt)
                 jitter = random.uniform(0, 0.2)
                 await asyncio.sleep(base_delay + jitter)
+
+    async def _deliver(
+        self, channel: discord.abc.Messageable | None, message: NotifyMessage
+    ) -> None:
+        if self._rest:
+            payload = _message_payload(message)
+            if self._use_webhooks and await self._deliver_webhook(message.channel_id, payload):
+                return
+            await self._rest.create_message(message.channel_id, payload)
+            return
+        await channel.send(
+            content=message.content,
+            embed=message.embed,
+            view=view_from_components(message.components) if message.components else None,
+            allowed_mentions=_allowed_mentions_object(message.allowed_mentions or NO_MENTIONS),
+        )
+
+    async def _deliver_webhook(self, channel_id: int, payload: dict[str, Any]) -> bool:
+        webhook = await self._webhook_for(channel_id)
+        if not webhook:
+            return False
+        try:
+            await self._rest.execute_webhook(webhook["id"], webhook["token"], payload)
+            return True
+        except DiscordNotFoundError:
+            # The webhook was deleted from Discord; recreate it on the next message.
+            logger.info("Webhook for %s is gone; falling back to bot send", channel_id)
+            self._webhooks.pop(channel_id, None)
+            if self._storage:
+                self._storage.remove_channel_webhook(str(channel_id))
+            return False
+
+    async def _webhook_for(self, channel_id: int) -> dict[str, str] | None:
+        if channel_id in self._webhooks:
+            return self._webhooks[channel_id]
+        lock = self._webhook_locks.setdefault(channel_id, asyncio.Lock())
+        async with lock:
+            if channel_id in self._webhooks:
+                return self._webhooks[channel_id]
+            webhook = self._storage.get_channel_webhook(str(channel_id)) if self._storage else None
+            if not webhook:
+                webhook = await self._create_webhook(channel_id)
+            self._webhooks[channel_id] = webhook
+            return webhook
+
+    async def _create_webhook(self, channel_id: int) -> dict[str, str] | None:
+        try:
+            created = await self._rest.create_webhook(channel_id, WEBHOOK_NAME)
+        except DiscordForbiddenError:
+            logger.info("No Manage Webhooks permission in %s; using bot send", channel_id)
+            return None
+        except DiscordHTTPError as exc:
+            # e.g. the per-channel webhook limit was reached.
+            logger.warning("Webhook creation failed for %s: %s", channel_id, exc)
+            return None
+        webhook = {"id": str(created["id"]), "token": str(created["token"])}
+        if self._storage:
+            self._storage.set_channel_webhook(str(channel_id), webhook["id"], webhook["token"])
+        return webhook
+
+    def _record_broadcast_lag(self, message: NotifyMessage, delivered_at: float) -> None:
+        if not message.broad_started_at or not message.detected_at:
+            return
+        detection_lag_ms = (message.detected_at - message.broad_started_at) * 1000
+        delivery_lag_ms = (delivered_at - message.broad_started_at) * 1000
+        self._metrics.record_broadcast_lag(detection_lag_ms, delivery_lag_ms)
+        logger.debug(
+            "Go-live lag for %s: detection=%.1fs delivery=%.1fs",
+            message.channel_id,
+            detection_lag_ms / 1000,
+            delivery_lag_ms / 1000,
+        )
+
+
+def _message_payload(message: NotifyMessage) -> dict[str, Any]:
+    payload: dict[str, Any] = {}
+    if message.content:
+        payload["content"] = message.content
+    if message.embed:
+        payload["embeds"] = [message.embed.to_dict()]
+    if message.components:
+        payload["components"] = message.components
+    payload["allowed_mentions"] = message.allowed_mentions or NO_MENTIONS
+    return payload
+
+
+def _allowed_mentions_object(raw: dict[str, Any]) -> discord.AllowedMentions:
+    roles = [discord.Object(id=int(role_id)) for role_id in raw.get("roles", [])]
+    return discord.AllowedMentions(
+        everyone="everyone" in raw.get("parse", []),
+        users=False,
+        roles=roles or False,
+        replied_user=False,
+    )
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from pathlib import Path
+from typing import Iterable
+
+from soupnotify.core.metrics import BotMetrics, LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+FILE_SUFFIX = ".prom"
+PREFIX = "soupnotify"
+
+
+def render_metrics(metrics: BotMetrics, labels: dict[str, str] | None = None) -> str:
+    """Render ``metrics`` in the Prometheus text exposition format."""
+    out = _Exposition(labels or {})
+    counters = [
+        ("messages_sent_total", "Notifications delivered.", metrics.messages_sent),
+        ("messages_failed_total", "Notification sends that failed.", metrics.messages_failed),
+        (
+            "messages_skipped_total",
+            "Notifications skipped for unreachable channels.",
+            metrics.messages_skipped,
+        ),
+        ("api_errors_total", "SOOP API requests that failed.", metrics.api_errors),
+        ("info_cache_hits_total", "Broad info served from the cache.", metrics.cache_hits),
+        ("info_cache_misses_total", "Broad info fetched from SOOP.", metrics.cache_misses),
+        ("polls_total", "Completed poll cycles.", metrics.poll_count),
+        (
+            "catch_up_polls_total",
+            "Poll cycles run early after a long gap.",
+            metrics.catch_up_polls,
+        ),
+        (
+            "live_detected_total",
+            "Live streamers seen, summed over polls.",
+            metrics.live_detected,
+        ),
+        (
+            "empty_responses_total",
+            "Streamers without broad info, summed over polls.",
+            metrics.empty_responses,
+        ),
+        (
+            "events_dropped_total",
+            "Stream events dropped for full subscriber queues.",
+            metrics.events_dropped,
+        ),
+    ]
+    for name, help_text, value in counters:
+        out.counter(name, help_text, value)
+    out.counter(
+        "transitions_total",
+        "Live-state transitions by kind.",
+        *[({"kind": kind}, count) for kind, count in sorted(metrics.transitions.items())],
+    )
+
+    lookups = metrics.cache_hits + metrics.cache_misses
+    gauges = [
+        ("queue_size", "Notifications waiting to be sent.", metrics.queue_size),
+        ("live_streamers", "Live streamers in the last poll.", metrics.last_live_count),
+        (
+            "info_cache_hit_ratio",
+            "Share of broad info lookups served from the cache.",
+            metrics.cache_hits / lookups if lookups else 0.0,
+        ),
+        (
+            "last_poll_timestamp_seconds",
+            "UNIX time of the last completed poll.",
+            metrics.last_poll_at or 0.0,
+        ),
+    ]
+    for name, help_text, value in gauges:
+        out.gauge(name, help_text, value)
+
+    out.histogram("poll_duration_seconds", "Poll cycle duration.", [({}, metrics.poll_duration)])
+    out.histogram(
+        "poll_stage_duration_seconds",
+        "Time spent in each poll stage; fetch is the wall time of all SOOP requests.",
+        [({"stage": stage}, histogram) for stage, histogram in metrics.poll_stages.items()],
+    )
+    histograms = [
+        (
+            "soop_fetch_latency_seconds",
+            "Duration of each SOOP broad info request.",
+            metrics.fetch_latency,
+        ),
+        ("queue_wait_seconds", "Time notifications spent queued.", metrics.queue_wait),
+        ("send_duration_seconds", "Discord send duration.", metrics.send_duration),
+        ("delivery_latency_seconds", "Detection to delivery.", metrics.delivery_latency),
+        ("detection_lag_seconds", "Broadcast start to detection.", metrics.detection_lag),
+        ("go_live_lag_seconds", "Broadcast start to delivery.", metrics.go_live_lag),
+    ]
+    for name, help_text, histogram in histograms:
+        out.histogram(name, help_text, [({}, histogram)])
+    return out.text()
+
+
+def merge_expositions(texts: Iterable[str]) -> str:
+    """Combine expositions from several processes into one valid document.
+
+    Samples of a metric family must be contiguous with a single HELP/TYPE
+    header, so families are regrouped rather than concatenated.
+    """
+    families: dict[str, tuple[list[str], list[str]]] = {}
+    current: tuple[list[str], list[str]] | None = None
+    for text in texts:
+        for line in text.splitlines():
+            if line.startswith("# HELP ") or line.startswith("# TYPE "):
+                name = line.split(" ", 3)[2]
+                current = families.setdefault(name, ([], []))
+                if not any(meta.startswith(line[:7]) for meta in current[0]):
+                    current[0].append(line)
+            elif line and current is not None:
+                current[1].append(line)
+    lines = [line for header, samples in families.values() for line in (*header, *samples)]
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def collect_metrics(directory: str | Path, max_age_seconds: float) -> str:
+    """Merge the metric files exported into ``directory`` by live processes."""
+    texts = []
+    now = time.time()
+    for path in sorted(Path(directory).glob(f"*{FILE_SUFFIX}")):
+        try:
+            # Files of processes that stopped exporting are left out.
+            if now - path.stat().st_mtime > max_age_seconds:
+                continue
+            texts.append(path.read_text(encoding="utf-8"))
+        except OSError:
+            continue
+    return merge_expositions(texts)
+
+
+class MetricsExporter:
+    """Periodically writes a process's BotMetrics to a shared directory.
+
+    The API process serves the merged files on /metrics, so scrapes never
+    reach into the bot or poller and never touch the database.
+    """
+
+    def __init__(
+        self,
+        metrics: BotMetrics,
+        directory: str | Path,
+        process: str,
+        interval_seconds: float = 15.0,
+        instance: str | None = None,
+    ) -> None:
+        host = socket.gethostname()
+        # Several processes of one kind can share a host (shard clusters,
+        # partitioned pollers); each needs its own file and series.
+        instance = instance or str(os.getpid())
+        self._metrics = metrics
+        self._path = Path(directory) / f"{process}-{host}-{instance}{FILE_SUFFIX}"
+        self._labels = {"process": process, "host": host, "instance": instance}
+        self._interval = max(interval_seconds, 1.0)
+
+    def write(self) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path.with_name(self._path.name + ".tmp")
+        tmp_path.write_text(render_metrics(self._metrics, self._labels), encoding="utf-8")
+        os.replace(tmp_path, self._path)
+
+    async def run(self) -> None:
+        try:
+            while True:
+                try:
+                    self.write()
+                except Exception:
+                    logger.exception("Writing metrics to %s failed", self._path)
+                await asyncio.sleep(self._interval)
+        finally:
+            # Pid-named files of stopped processes would otherwise pile up.
+            self._path.unlink(missing_ok=True)
+
+
+class _Exposition:
+    def __init__(self, labels: dict[str, str]) -> None:
+        self._labels = labels
+        self._lines: list[str] = []
+
+    def counter(self, name: str, help_text: str, *samples) -> None:
+        self._family(name, "counter", help_text, samples)
+
+    def gauge(self, name: str, help_text: str, *samples) -> None:
+        self._family(name, "gauge", help_text, samples)
+
+    def _family(self, name: str, kind: str, help_text: str, samples) -> None:
+        name = f"{PREFIX}_{name}"
+        self._header(name, kind, help_text)
+        for sample in samples:
+            labels, value = sample if isinstance(sample, tuple) else ({}, sample)
+            self._sample(name, labels, value)
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        series: list[tuple[dict[str, str], LatencyHistogram]],
+    ) -> None:
+        name = f"{PREFIX}_{name}"
+        self._header(name, "histogram", help_text)
+        for labels, histogram in series:
+            cumulative = 0
+            bounds = [f"{bound / 1000:g}" for bound in histogram.buckets] + ["+Inf"]
+            for bound, count in zip(bounds, histogram.bucket_counts, strict=True):
+                cumulative += count
+                self._sample(f"{name}_bucket", {**labels, "le": bound}, cumulative)
+            self._sample(f"{name}_sum", labels, histogram.total / 1000)
+            self._sample(f"{name}_count", labels, histogram.count)
+
+    def _header(self, name: str, kind: str, help_text: str) -> None:
+        self._lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+
+    def _sample(self, name: str, labels: dict[str, str], value: float) -> None:
+        merged = {**self._labels, **labels}
+        label_text = ",".join(f'{key}="{_escape(str(val))}"' for key, val in merged.items())
+        rendered = str(value) if isinstance(value, int) else repr(float(value))
+        series = f"{name}{{{label_text}}}" if label_text else name
+        self._lines.append(f"{series} {rendered}")
+
+    def text(self) -> str:
+        return "\n".join(self._lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
@@ -2,6 +2,10 @@ from __future__ import annotations
 
 import time
 from collections import deque
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from soupnotify.core.storage import Storage
 
 
 class GuildRateLimiter:
@@ -20,3 +24,23 @@ class GuildRateLimiter:
             return False
         queue.append(now)
         return True
+
+
+class SharedGuildRateLimiter:
+    """Per-guild limit shared through the database.
+
+    With partitioned polling one guild's streamers are spread over several
+    workers, each of which would otherwise allow the full per-minute limit.
+    This counts fixed one-minute windows instead of a sliding one, so a
+    guild can get up to twice its limit across a window boundary.
+    """
+
+    def __init__(self, storage: Storage, clock=time.time) -> None:
+        self._storage = storage
+        self._clock = clock
+
+    def allow(self, guild_id: str, limit_per_min: int | None) -> bool:
+        if not limit_per_min or limit_per_min <= 0:
+            return True
+        window_start = int(self._clock() // 60)
+        return self._storage.take_rate_slot(guild_id, limit_per_min, window_start)
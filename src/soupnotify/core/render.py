@@ -1,7 +1,94 @@
 from __future__ import annotations
 
+import re
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
+from discord.utils import escape_mentions
+
+PLACEHOLDER_RE = re.compile(r"\{([A-Za-z_]+)\}")
+
+TEMPLATE_FIELDS: tuple[str, ...] = (
+    "soop_channel_id",
+    "soop_url",
+    "notify_channel",
+    "guild",
+    "title",
+    "category",
+    "viewers",
+    "broad_no",
+)
+
+
+class TemplateError(ValueError):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledTemplate:
+    # Each segment is (is_placeholder, text): literal text or a placeholder name.
+    segments: tuple[tuple[bool, str], ...]
+    unknown: frozenset[str]
+
+    def render(self, context: dict[str, str]) -> str:
+        return "".join(
+            context.get(text, f"{{{text}}}") if is_placeholder else text
+            for is_placeholder, text in self.segments
+        )
+
+
+@lru_cache(maxsize=4096)
+def compile_template(template: str) -> CompiledTemplate:
+    segments: list[tuple[bool, str]] = []
+    unknown: set[str] = set()
+    position = 0
+    for match in PLACEHOLDER_RE.finditer(template):
+        name = match.group(1)
+        if name not in TEMPLATE_FIELDS:
+            # Unknown names stay literal so older stored templates keep rendering.
+            unknown.add(name)
+            continue
+        if match.start() > position:
+            segments.append((False, template[position : match.start()]))
+        segments.append((True, name))
+        position = match.end()
+    if position < len(template):
+        segments.append((False, template[position:]))
+    return CompiledTemplate(segments=tuple(segments), unknown=frozenset(unknown))
+
+
+def validate_template(template: str | None) -> None:
+    if not template:
+        return
+    unknown = compile_template(template).unknown
+    if unknown:
+        names = ", ".join(f"{{{name}}}" for name in sorted(unknown))
+        available = ", ".join(f"{{{name}}}" for name in TEMPLATE_FIELDS)
+        raise TemplateError(f"Unknown placeholder(s): {names}. Available: {available}")
+
+
+def template_context(
+    soop_channel_id: str,
+    notify_channel_id: int,
+    guild_name: str,
+    stream_url_base: str,
+    info: dict[str, Any] | None = None,
+) -> dict[str, str]:
+    info = info or {}
+    viewers = info.get("currentSumViewer")
+    # Titles and categories are set by the streamer; they must not ping anyone.
+    return {
+        "soop_channel_id": soop_channel_id,
+        "soop_url": f"{stream_url_base.rstrip('/')}/{soop_channel_id}",
+        "notify_channel": f"<#{notify_channel_id}>",
+        "guild": guild_name,
+        "title": escape_mentions(str(info.get("broadTitle") or "")),
+        "category": escape_mentions(str(info.get("categoryName") or "")),
+        "viewers": str(viewers) if viewers is not None else "",
+        "broad_no": str(info.get("broadNo") or ""),
+    }
+
 
 def render_template_value(
     template: str | None,
@@ -9,16 +96,16 @@ def render_template_value(
     notify_channel_id: int,
     guild_name: str,
     stream_url_base: str,
+    info: dict[str, Any] | None = None,
+    context: dict[str, str] | None = None,
 ) -> str | None:
     if not template:
         return None
-    soop_url = f"{stream_url_base.rstrip('/')}/{soop_channel_id}"
-    return (
-        template.replace("{soop_channel_id}", soop_channel_id)
-        .replace("{notify_channel}", f"<#{notify_channel_id}>")
-        .replace("{guild}", guild_name)
-        .replace("{soop_url}", soop_url)
-    )
+    if context is None:
+        context = template_context(
+            soop_channel_id, notify_channel_id, guild_name, stream_url_base, info
+        )
+    return compile_template(template).render(context)
 
 
 def render_message(
@@ -28,9 +115,10 @@ def render_message(
     guild_name: str,
     stream_url_base: str,
     mention: str | None = None,
+    info: dict[str, Any] | None = None,
 ) -> str:
     rendered = render_template_value(
-        template, soop_channel_id, notify_channel_id, guild_name, stream_url_base
+        template, soop_channel_id, notify_channel_id, guild_name, stream_url_base, info
     )
     if rendered:
         return f"{mention} {rendered}".strip() if mention else rendered
@@ -45,13 +133,18 @@ def render_embed_overrides(
     notify_channel_id: int,
     guild_name: str,
     stream_url_base: str,
+    info: dict[str, Any] | None = None,
 ) -> tuple[str | None, str | None, str | None]:
+    context = template_context(
+        soop_channel_id, notify_channel_id, guild_name, stream_url_base, info
+    )
     title = render_template_value(
         embed_settings.get("title"),
         soop_channel_id,
         notify_channel_id,
         guild_name,
         stream_url_base,
+        context=context,
     )
     description = render_template_value(
         embed_settings.get("description"),
@@ -59,6 +152,7 @@ def render_embed_overrides(
         notify_channel_id,
         guild_name,
         stream_url_base,
+        context=context,
     )
     color = embed_settings.get("color")
     return title, description, color
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+def shard_for_guild(guild_id: int | str, shard_count: int) -> int:
+    """Discord's shard routing rule: (guild_id >> 22) % shard_count."""
+    return (int(guild_id) >> 22) % shard_count
+
+
+@dataclass(frozen=True, slots=True)
+class ShardSet:
+    """The shards one process of a multi-process shard cluster runs."""
+
+    shard_ids: frozenset[int]
+    shard_count: int
+
+    def owns(self, guild_id: str) -> bool:
+        if not guild_id.isdigit():
+            return 0 in self.shard_ids
+        return shard_for_guild(guild_id, self.shard_count) in self.shard_ids
@@ -1,38 +1,67 @@
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Iterator
 
 from sqlalchemy import (
+    BigInteger,
     Column,
+    Float,
+    Index,
     Integer,
     MetaData,
     String,
     Table,
     Text,
     UniqueConstraint,
+    and_,
+    bindparam,
+    case,
+    cast,
     create_engine,
     delete,
+    func,
+    insert,
+    not_,
     select,
     text,
     update,
 )
 
+from soupnotify.core.shards import ShardSet
+
+LINKS_VERSION_KEY = "links_version"
+SETTINGS_VERSION_KEY = "settings_version"
+# Postgres NOTIFY channel for change events; see soupnotify.core.changes.
+CHANGES_CHANNEL = "soupnotify_changes"
+
 
 @dataclass
 class StorageTables:
     guild_streamers: Table
     guild_settings: Table
     live_status: Table
+    streamer_state: Table
     poll_state: Table
+    channel_webhooks: Table
+    link_deletions: Table
+    leases: Table
+    notification_outbox: Table
+    guild_rate_windows: Table
 
 
 class Storage:
-    def __init__(self, database_url: str) -> None:
+    def __init__(self, database_url: str, cache_settings: bool = False) -> None:
         connect_args = {}
         if database_url.startswith("sqlite"):
             connect_args = {"check_same_thread": False}
         self._engine = create_engine(database_url, future=True, connect_args=connect_args)
+        self._notify_changes = self._engine.dialect.name == "postgresql"
+        # Guild settings rows by guild id. Only safe with a ChangeListener
+        # feeding apply_change(), otherwise writes from other processes are missed.
+        self._settings_cache: dict[str, dict | None] | None = {} if cache_settings else None
         self._tables = self._define_tables()
         self._ensure_schema()
 
@@ -47,7 +76,14 @@ class Storage:
             Column("notify_channel_id", String, nullable=False),
             Column("message_template", Text, nullable=True),
             Column("created_at", String, nullable=False),
+            Column("notify_error", String, nullable=True),
+            Column("notify_error_at", String, nullable=True),
+            Column("version", Integer, nullable=False, server_default="0"),
             UniqueConstraint("guild_id", "soop_channel_id", name="uq_guild_streamer"),
+            Index("ix_guild_streamers_soop_channel_id", "soop_channel_id"),
+            Index("ix_guild_streamers_notify_channel_id", "notify_channel_id"),
+            Index("ix_guild_streamers_version", "version"),
+            Index("ix_guild_streamers_guild_id_id", "guild_id", "id"),
         )
         guild_settings = Table(
             "guild_settings",
@@ -68,10 +104,22 @@ class Storage:
             metadata,
             Column("guild_id", String, primary_key=True),
             Column("soop_channel_id", String, primary_key=True),
+            Column("last_notified_at", String, nullable=True),
+            Index("ix_live_status_soop_channel_id", "soop_channel_id"),
+        )
+        streamer_state = Table(
+            "streamer_state",
+            metadata,
+            Column("soop_channel_id", String, primary_key=True),
             Column("is_live", Integer, nullable=False),
             Column("broad_no", String, nullable=True),
-            Column("last_notified_at", String, nullable=True),
             Column("updated_at", String, nullable=False),
+            Index(
+                "ix_streamer_state_live",
+                "soop_channel_id",
+                sqlite_where=text("is_live = 1"),
+                postgresql_where=text("is_live = 1"),
+            ),
         )
         poll_state = Table(
             "poll_state",
@@ -79,12 +127,58 @@ class Storage:
             Column("key", String, primary_key=True),
             Column("value", String, nullable=True),
         )
+        channel_webhooks = Table(
+            "channel_webhooks",
+            metadata,
+            Column("channel_id", String, primary_key=True),
+            Column("webhook_id", String, nullable=False),
+            Column("webhook_token", String, nullable=False),
+            Column("created_at", String, nullable=False),
+        )
+        link_deletions = Table(
+            "link_deletions",
+            metadata,
+            Column("link_id", Integer, primary_key=True, autoincrement=False),
+            Column("version", Integer, nullable=False),
+            Column("deleted_at", String, nullable=False),
+            Index("ix_link_deletions_version", "version"),
+        )
+        leases = Table(
+            "leases",
+            metadata,
+            Column("name", String, primary_key=True),
+            Column("owner", String, nullable=False),
+            Column("expires_at", Float, nullable=False),
+        )
+        notification_outbox = Table(
+            "notification_outbox",
+            metadata,
+            Column("id", Integer, primary_key=True, autoincrement=True),
+            Column("guild_id", String, nullable=False),
+            Column("soop_channel_id", String, nullable=False),
+            Column("info", Text, nullable=True),
+            Column("detected_at", Float, nullable=False),
+            Column("created_at", String, nullable=False),
+        )
+        guild_rate_windows = Table(
+            "guild_rate_windows",
+            metadata,
+            Column("guild_id", String, primary_key=True),
+            Column("window_start", Integer, nullable=False),
+            Column("used", Integer, nullable=False),
+        )
         self._metadata = metadata
         return StorageTables(
             guild_streamers=guild_streamers,
             guild_settings=guild_settings,
             live_status=live_status,
+            streamer_state=streamer_state,
             poll_state=poll_state,
+            channel_webhooks=channel_webhooks,
+            link_deletions=link_deletions,
+            leases=leases,
+            notification_outbox=notification_outbox,
+            guild_rate_windows=guild_rate_windows,
         )
 
     def _ensure_schema(self) -> None:
@@ -148,28 +242,108 @@ class Storage:
         notify_channel_id: str,
         message_template: str | None = None,
     ) -> None:
-        stmt = text(
-            """
-            INSERT INTO guild_streamers
-            (guild_id, soop_channel_id, notify_channel_id, message_template, created_at)
-            VALUES (:guild_id, :soop_channel_id, :notify_channel_id, :message_template, :created_at)
-            ON CONFLICT (guild_id, soop_channel_id)
-            DO UPDATE SET notify_channel_id=excluded.notify_channel_id,
-                          message_template=excluded.message_template
-            """
-        )
         with self._engine.begin() as conn:
             conn.execute(
-                stmt,
+                self._upsert_link_stmt(),
                 {
                     "guild_id": guild_id,
                     "soop_channel_id": soop_channel_id,
                     "notify_channel_id": notify_channel_id,
                     "message_template": message_template,
                     "created_at": datetime.utcnow().isoformat(),
+                    "version": self._bump_links_version(conn, guild_id),
                 },
             )
 
+    def _upsert_link_stmt(self):
+        return text(
+            """
+            INSERT INTO guild_streamers
+            (guild_id, soop_channel_id, notify_channel_id, message_template, created_at, version)
+            VALUES (:guild_id, :soop_channel_id, :notify_channel_id, :message_template, :created_at,
+                    :version)
+            ON CONFLICT (guild_id, soop_channel_id)
+            DO UPDATE SET notify_channel_id=excluded.notify_channel_id,
+                          message_template=excluded.message_template,
+                          notify_error=NULL,
+                          notify_error_at=NULL,
+                          version=excluded.version
+            """
+        )
+
+    def add_links(self, guild_id: str, rows: list[tuple[str, str, str | None]]) -> int:
+        """Upsert (soop_channel_id, notify_channel_id, message_template) rows at once.
+
+        Everything runs in one transaction with a single links version bump.
+        Postgres streams the rows with COPY into a temp table and upserts from
+        it; other databases use one executemany.
+        """
+        if not rows:
+            return 0
+        params = {"guild_id": guild_id, "created_at": datetime.utcnow().isoformat()}
+        with self._engine.begin() as conn:
+            params["version"] = self._bump_links_version(conn, guild_id)
+            if self._engine.dialect.name == "postgresql":
+                conn.execute(
+                    text(
+                        """
+                        CREATE TEMP TABLE bulk_links (
+                            soop_channel_id TEXT, notify_channel_id TEXT, message_template TEXT
+                        ) ON COMMIT DROP
+                        """
+                    )
+                )
+                cursor = conn.connection.driver_connection.cursor()
+                with cursor.copy(
+                    "COPY bulk_links (soop_channel_id, notify_channel_id, message_template) "
+                    "FROM STDIN"
+                ) as copy:
+                    for row in rows:
+                        copy.write_row(row)
+                conn.execute(
+                    text(
+                        """
+                        INSERT INTO guild_streamers
+                        (guild_id, soop_channel_id, notify_channel_id, message_template,
+                         created_at, version)
+                        SELECT :guild_id, soop_channel_id, notify_channel_id, message_template,
+                               :created_at, :version
+                        FROM bulk_links
+                        ON CONFLICT (guild_id, soop_channel_id)
+                        DO UPDATE SET notify_channel_id=excluded.notify_channel_id,
+                                      message_template=excluded.message_template,
+                                      notify_error=NULL,
+                                      notify_error_at=NULL,
+                                      version=excluded.version
+                        """
+                    ),
+                    params,
+                )
+            else:
+                conn.execute(
+                    self._upsert_link_stmt(),
+                    [
+                        {
+                            **params,
+                            "soop_channel_id": soop_channel_id,
+                            "notify_channel_id": notify_channel_id,
+                            "message_template": message_template,
+                        }
+                        for soop_channel_id, notify_channel_id, message_template in rows
+                    ],
+                )
+        return len(rows)
+
+    def iter_links(self, guild_id: str, batch_size: int = 500) -> Iterator[dict]:
+        """Yield a guild's links in id order, one keyset page at a time."""
+        after_id = None
+        while True:
+            page = self.get_links_page(guild_id, after_id=after_id, limit=batch_size)
+            yield from page
+            if len(page) < batch_size:
+                return
+            after_id = page[-1]["id"]
+
     def get_links(self, guild_id: str) -> list[dict]:
         stmt = select(self._tables.guild_streamers).where(
             self._tables.guild_streamers.c.guild_id == guild_id
@@ -178,19 +352,102 @@ class Storage:
             rows = conn.execute(stmt).mappings().all()
         return [dict(row) for row in rows]
 
+    def get_link(self, guild_id: str, soop_channel_id: str) -> dict | None:
+        stmt = select(self._tables.guild_streamers).where(
+            (self._tables.guild_streamers.c.guild_id == guild_id)
+            & (self._tables.guild_streamers.c.soop_channel_id == soop_channel_id)
+        )
+        with self._engine.begin() as conn:
+            row = conn.execute(stmt).mappings().fetchone()
+        return dict(row) if row else None
+
+    def get_links_page(
+        self,
+        guild_id: str,
+        after_id: int | None = None,
+        before_id: int | None = None,
+        limit: int = 10,
+        offset: int = 0,
+        soop_channel_id: str | None = None,
+        notify_channel_id: str | None = None,
+    ) -> list[dict]:
+        """Return one page of a guild's links ordered by id.
+
+        Pages are keyed on the link id: pass the last id of the current page as
+        ``after_id`` for the next page, or the first id as ``before_id`` for the
+        previous one. ``offset`` is only meant for jumping to a page directly.
+        """
+        links = self._tables.guild_streamers
+        stmt = select(links).where(
+            self._link_filter(guild_id, soop_channel_id, notify_channel_id)
+        )
+        if before_id is not None:
+            stmt = stmt.where(links.c.id < before_id).order_by(links.c.id.desc())
+        else:
+            if after_id is not None:
+                stmt = stmt.where(links.c.id > after_id)
+            stmt = stmt.order_by(links.c.id)
+        stmt = stmt.limit(limit)
+        if offset:
+            stmt = stmt.offset(offset)
+        with self._engine.begin() as conn:
+            rows = [dict(row) for row in conn.execute(stmt).mappings().all()]
+        if before_id is not None:
+            rows.reverse()
+        return rows
+
+    def _link_filter(
+        self,
+        guild_id: str,
+        soop_channel_id: str | None = None,
+        notify_channel_id: str | None = None,
+    ):
+        links = self._tables.guild_streamers
+        condition = links.c.guild_id == guild_id
+        if soop_channel_id:
+            condition &= links.c.soop_channel_id == soop_channel_id
+        if notify_channel_id:
+            condition &= links.c.notify_channel_id == notify_channel_id
+        return condition
+
+    def count_links(
+        self,
+        guild_id: str,
+        soop_channel_id: str | None = None,
+        notify_channel_id: str | None = None,
+    ) -> tuple[int, int]:
+        """Return (total, unreachable) link counts for a guild."""
+        links = self._tables.guild_streamers
+        stmt = select(func.count(), func.count(links.c.notify_error)).where(
+            self._link_filter(guild_id, soop_channel_id, notify_channel_id)
+        )
+        with self._engine.begin() as conn:
+            row = conn.execute(stmt).fetchone()
+        return row[0], row[1]
+
     def remove_link(self, guild_id: str, soop_channel_id: str | None = None) -> int:
+        links = self._tables.guild_streamers
+        live_status = self._tables.live_status
         if soop_channel_id:
-            stmt = delete(self._tables.guild_streamers).where(
-                (self._tables.guild_streamers.c.guild_id == guild_id)
-                & (self._tables.guild_streamers.c.soop_channel_id == soop_channel_id)
+            condition = (links.c.guild_id == guild_id) & (
+                links.c.soop_channel_id == soop_channel_id
             )
-        else:
-            stmt = delete(self._tables.guild_streamers).where(
-                self._tables.guild_streamers.c.guild_id == guild_id
+            status_stmt = delete(live_status).where(
+                (live_status.c.guild_id == guild_id)
+                & (live_status.c.soop_channel_id == soop_channel_id)
             )
+        else:
+            condition = links.c.guild_id == guild_id
+            status_stmt = delete(live_status).where(live_status.c.guild_id == guild_id)
         with self._engine.begin() as conn:
-            result = conn.execute(stmt)
-            return result.rowcount or 0
+            link_ids = conn.execute(select(links.c.id).where(condition)).scalars().all()
+            if not link_ids:
+                return 0
+            self._record_link_deletions(conn, guild_id, link_ids)
+            conn.execute(delete(links).where(condition))
+            # Live status belongs to the link; drop it in the same transaction.
+            conn.execute(status_stmt)
+            return len(link_ids)
 
     def list_links(self, guild_id: str | None = None) -> list[dict]:
         stmt = select(self._tables.guild_streamers)
@@ -201,17 +458,167 @@ class Storage:
         return [dict(row) for row in rows]
 
     def set_template(self, guild_id: str, soop_channel_id: str, template: str | None) -> bool:
+        stmt = update(self._tables.guild_streamers).where(
+            (self._tables.guild_streamers.c.guild_id == guild_id)
+            & (self._tables.guild_streamers.c.soop_channel_id == soop_channel_id)
+        )
+        with self._engine.begin() as conn:
+            result = conn.execute(
+                stmt.values(
+                    message_template=template,
+                    version=self._bump_links_version(conn, guild_id),
+                )
+            )
+            return (result.rowcount or 0) > 0
+
+    def _bump_links_version(self, conn, guild_id: str) -> int:
+        version = self._bump_version(conn, LINKS_VERSION_KEY)
+        self._publish(conn, "links", guild_id)
+        return version
+
+    def _bump_version(self, conn, key: str) -> int:
+        # The poll_state row lock serialises concurrent writers, so versions are
+        # handed out in commit order.
+        stmt = text(
+            """
+            INSERT INTO poll_state (key, value)
+            VALUES (:key, '1')
+            ON CONFLICT (key)
+            DO UPDATE SET value=CAST(CAST(poll_state.value AS INTEGER) + 1 AS TEXT)
+            RETURNING value
+            """
+        )
+        return int(conn.execute(stmt, {"key": key}).scalar_one())
+
+    def _publish(self, conn, kind: str, guild_id: str | None) -> None:
+        # NOTIFY is transactional: listeners only hear about committed writes.
+        if not self._notify_changes:
+            return
+        payload = json.dumps({"kind": kind, "guild_id": guild_id})
+        conn.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": CHANGES_CHANNEL, "payload": payload},
+        )
+
+    def get_change_versions(self) -> dict[str, int]:
+        """Return the links and settings change counters, for polling listeners."""
+        stmt = select(self._tables.poll_state.c.key, self._tables.poll_state.c.value).where(
+            self._tables.poll_state.c.key.in_([LINKS_VERSION_KEY, SETTINGS_VERSION_KEY])
+        )
+        with self._engine.begin() as conn:
+            rows = dict(conn.execute(stmt).all())
+        return {
+            "links": int(rows.get(LINKS_VERSION_KEY) or 0),
+            "settings": int(rows.get(SETTINGS_VERSION_KEY) or 0),
+        }
+
+    def apply_change(self, event) -> None:
+        """Drop cached guild settings named by a ChangeEvent."""
+        if self._settings_cache is None or event.kind not in {"settings", "all"}:
+            return
+        if event.kind == "settings" and event.guild_id:
+            self._settings_cache.pop(event.guild_id, None)
+        else:
+            self._settings_cache.clear()
+
+    def _record_link_deletions(self, conn, guild_id: str, link_ids: list[int]) -> None:
+        stmt = text(
+            """
+            INSERT INTO link_deletions (link_id, version, deleted_at)
+            VALUES (:link_id, :version, :deleted_at)
+            ON CONFLICT (link_id)
+            DO UPDATE SET version=excluded.version, deleted_at=excluded.deleted_at
+            """
+        )
+        version = self._bump_links_version(conn, guild_id)
+        deleted_at = datetime.utcnow().isoformat()
+        conn.execute(
+            stmt,
+            [
+                {"link_id": link_id, "version": version, "deleted_at": deleted_at}
+                for link_id in link_ids
+            ],
+        )
+
+    def get_links_version(self) -> int:
+        return int(self.get_poll_state(LINKS_VERSION_KEY) or 0)
+
+    def list_link_changes(self, since: int | None) -> tuple[int, list[dict], list[int]]:
+        """Return (version, changed links, deleted link ids) since a links version.
+
+        ``since=None`` returns every link. Deleted ids are reported before
+        re-added rows can reuse them, so callers apply deletions first.
+        """
+        links = self._tables.guild_streamers
+        deletions = self._tables.link_deletions
+        with self._engine.begin() as conn:
+            # Read the version first: rows committed after it are picked up
+            # again on the next refresh, which is harmless.
+            version = conn.execute(
+                select(self._tables.poll_state.c.value).where(
+                    self._tables.poll_state.c.key == LINKS_VERSION_KEY
+                )
+            ).scalar()
+            stmt = select(links)
+            deleted: list[int] = []
+            if since is not None:
+                stmt = stmt.where(links.c.version > since)
+                deleted = list(
+                    conn.execute(
+                        select(deletions.c.link_id).where(deletions.c.version > since)
+                    ).scalars()
+                )
+            rows = conn.execute(stmt).mappings().all()
+        return int(version or 0), [dict(row) for row in rows], deleted
+
+    def prune_link_deletions(self, max_age_seconds: int = 24 * 60 * 60) -> int:
+        cutoff = (datetime.utcnow() - timedelta(seconds=max_age_seconds)).isoformat()
+        stmt = delete(self._tables.link_deletions).where(
+            self._tables.link_deletions.c.deleted_at < cutoff
+        )
+        with self._engine.begin() as conn:
+            result = conn.execute(stmt)
+            return result.rowcount or 0
+
+    def flag_notify_channels(self, channel_ids: list[str], reason: str) -> int:
+        if not channel_ids:
+            return 0
+        stmt = (
+            update(self._tables.guild_streamers)
+            .where(self._tables.guild_streamers.c.notify_channel_id.in_(channel_ids))
+            .values(notify_error=reason, notify_error_at=datetime.utcnow().isoformat())
+        )
+        with self._engine.begin() as conn:
+            result = conn.execute(stmt)
+            return result.rowcount or 0
+
+    def clear_notify_channel_flags(self, channel_ids: list[str]) -> int:
+        if not channel_ids:
+            return 0
         stmt = (
             update(self._tables.guild_streamers)
             .where(
-                (self._tables.guild_streamers.c.guild_id == guild_id)
-                & (self._tables.guild_streamers.c.soop_channel_id == soop_channel_id)
+                self._tables.guild_streamers.c.notify_channel_id.in_(channel_ids)
+                & self._tables.guild_streamers.c.notify_error.is_not(None)
             )
-            .values(message_template=template)
+            .values(notify_error=None, notify_error_at=None)
         )
         with self._engine.begin() as conn:
             result = conn.execute(stmt)
-            return (result.rowcount or 0) > 0
+            return result.rowcount or 0
+
+    def list_flagged_notify_channels(self) -> dict[str, str]:
+        stmt = (
+            select(
+                self._tables.guild_streamers.c.notify_channel_id,
+                self._tables.guild_streamers.c.notify_error,
+            )
+            .where(self._tables.guild_streamers.c.notify_error.is_not(None))
+            .distinct()
+        )
+        with self._engine.begin() as conn:
+            rows = conn.execute(stmt).all()
+        return {row[0]: row[1] for row in rows}
 
     def set_default_notify_channel(self, guild_id: str, channel_id: str | None) -> None:
         if channel_id:
@@ -225,22 +632,18 @@ class Storage:
             )
             with self._engine.begin() as conn:
                 conn.execute(stmt, {"guild_id": guild_id, "channel_id": channel_id})
+                self._settings_changed(conn, guild_id)
         else:
             stmt = delete(self._tables.guild_settings).where(
                 self._tables.guild_settings.c.guild_id == guild_id
             )
             with self._engine.begin() as conn:
                 conn.execute(stmt)
+                self._settings_changed(conn, guild_id)
 
     def get_default_notify_channel(self, guild_id: str) -> str | None:
-        stmt = select(self._tables.guild_settings.c.default_notify_channel_id).where(
-            self._tables.guild_settings.c.guild_id == guild_id
-        )
-        with self._engine.begin() as conn:
-            row = conn.execute(stmt).fetchone()
-        if not row:
-            return None
-        return row[0]
+        row = self._guild_settings(guild_id)
+        return row["default_notify_channel_id"] if row else None
 
     def set_embed_template(
         self,
@@ -269,18 +672,17 @@ class Storage:
                     "embed_color": color,
                 },
             )
+            self._settings_changed(conn, guild_id)
 
     def get_embed_template(self, guild_id: str) -> dict[str, str | None]:
-        stmt = select(
-            self._tables.guild_settings.c.embed_title,
-            self._tables.guild_settings.c.embed_description,
-            self._tables.guild_settings.c.embed_color,
-        ).where(self._tables.guild_settings.c.guild_id == guild_id)
-        with self._engine.begin() as conn:
-            row = conn.execute(stmt).fetchone()
+        row = self._guild_settings(guild_id)
         if not row:
             return {"title": None, "description": None, "color": None}
-        return {"title": row[0], "description": row[1], "color": row[2]}
+        return {
+            "title": row["embed_title"],
+            "description": row["embed_description"],
+            "color": row["embed_color"],
+        }
 
     def set_mention(self, guild_id: str, mention_type: str | None, mention_value: str | None) -> None:
         stmt = text(
@@ -301,17 +703,13 @@ class Storage:
                     "mention_value": mention_value,
                 },
             )
+            self._settings_changed(conn, guild_id)
 
     def get_mention(self, guild_id: str) -> dict[str, str | None]:
-        stmt = select(
-            self._tables.guild_settings.c.mention_type,
-            self._tables.guild_settings.c.mention_value,
-        ).where(self._tables.guild_settings.c.guild_id == guild_id)
-        with self._engine.begin() as conn:
-            row = conn.execute(stmt).fetchone()
+        row = self._guild_settings(guild_id)
         if not row:
             return {"type": None, "value": None}
-        return {"type": row[0], "value": row[1]}
+        return {"type": row["mention_type"], "value": row["mention_value"]}
 
     def set_admin_role(self, guild_id: str, role_id: str | None) -> None:
         stmt = text(
@@ -324,16 +722,11 @@ class Storage:
         )
         with self._engine.begin() as conn:
             conn.execute(stmt, {"guild_id": guild_id, "role_id": role_id})
+            self._settings_changed(conn, guild_id)
 
     def get_admin_role(self, guild_id: str) -> str | None:
-        stmt = select(self._tables.guild_settings.c.admin_role_id).where(
-            self._tables.guild_settings.c.guild_id == guild_id
-        )
-        with self._engine.begin() as conn:
-            row = conn.execute(stmt).fetchone()
-        if not row:
-            return None
-        return row[0]
+        row = self._guild_settings(guild_id)
+        return row["admin_role_id"] if row else None
 
     def set_audit_channel(self, guild_id: str, channel_id: str | None) -> None:
         stmt = text(
@@ -346,16 +739,11 @@ class Storage:
         )
         with self._engine.begin() as conn:
             conn.execute(stmt, {"guild_id": guild_id, "channel_id": channel_id})
+            self._settings_changed(conn, guild_id)
 
     def get_audit_channel(self, guild_id: str) -> str | None:
-        stmt = select(self._tables.guild_settings.c.audit_channel_id).where(
-            self._tables.guild_settings.c.guild_id == guild_id
-        )
-        with self._engine.begin() as conn:
-            row = conn.execute(stmt).fetchone()
-        if not row:
-            return None
-        return row[0]
+        row = self._guild_settings(guild_id)
+        return row["audit_channel_id"] if row else None
 
     def set_rate_limit(self, guild_id: str, rate_per_min: int | None) -> None:
         stmt = text(
@@ -368,80 +756,231 @@ class Storage:
         )
         with self._engine.begin() as conn:
             conn.execute(stmt, {"guild_id": guild_id, "rate_limit": rate_per_min})
+            self._settings_changed(conn, guild_id)
 
     def get_rate_limit(self, guild_id: str) -> int | None:
-        stmt = select(self._tables.guild_settings.c.rate_limit_per_min).where(
+        row = self._guild_settings(guild_id)
+        return row["rate_limit_per_min"] if row else None
+
+    def _guild_settings(self, guild_id: str) -> dict | None:
+        cache = self._settings_cache
+        if cache is not None and guild_id in cache:
+            return cache[guild_id]
+        stmt = select(self._tables.guild_settings).where(
             self._tables.guild_settings.c.guild_id == guild_id
         )
         with self._engine.begin() as conn:
-            row = conn.execute(stmt).fetchone()
-        if not row:
-            return None
-        return row[0]
+            row = conn.execute(stmt).mappings().fetchone()
+        settings = dict(row) if row else None
+        if cache is not None:
+            cache[guild_id] = settings
+        return settings
 
-    def set_live_status(
-        self,
-        guild_id: str,
-        soop_channel_id: str,
-        is_live: bool,
-        broad_no: str | None,
-        last_notified_at: str | None = None,
-    ) -> None:
+    def _settings_changed(self, conn, guild_id: str) -> None:
+        if self._settings_cache is not None:
+            self._settings_cache.pop(guild_id, None)
+        self._bump_version(conn, SETTINGS_VERSION_KEY)
+        self._publish(conn, "settings", guild_id)
+
+    def set_streamer_states(self, states: list[tuple[str, bool, str | None]]) -> None:
+        """Upsert (soop_channel_id, is_live, broad_no) for streamers whose state changed."""
+        if not states:
+            return
         stmt = text(
             """
-            INSERT INTO live_status
-            (guild_id, soop_channel_id, is_live, broad_no, last_notified_at, updated_at)
-            VALUES (:guild_id, :soop_channel_id, :is_live, :broad_no, :last_notified_at, :updated_at)
-            ON CONFLICT (guild_id, soop_channel_id)
+            INSERT INTO streamer_state (soop_channel_id, is_live, broad_no, updated_at)
+            VALUES (:soop_channel_id, :is_live, :broad_no, :updated_at)
+            ON CONFLICT (soop_channel_id)
             DO UPDATE SET is_live=excluded.is_live,
                           broad_no=excluded.broad_no,
-                          last_notified_at=excluded.last_notified_at,
                           updated_at=excluded.updated_at
             """
         )
+        updated_at = datetime.utcnow().isoformat()
         with self._engine.begin() as conn:
             conn.execute(
                 stmt,
-                {
-                    "guild_id": guild_id,
-                    "soop_channel_id": soop_channel_id,
-                    "is_live": int(is_live),
-                    "broad_no": broad_no,
-                    "last_notified_at": last_notified_at,
-                    "updated_at": datetime.utcnow().isoformat(),
-                },
+                [
+                    {
+                        "soop_channel_id": soop_channel_id,
+                        "is_live": int(is_live),
+                        "broad_no": broad_no,
+                        "updated_at": updated_at,
+                    }
+                    for soop_channel_id, is_live, broad_no in states
+                ],
             )
 
-    def load_live_status(self) -> dict[str, dict[str, str | bool | None]]:
-        stmt = select(self._tables.live_status)
+    def load_streamer_states(self) -> dict[str, tuple[bool, str | None]]:
+        stmt = select(
+            self._tables.streamer_state.c.soop_channel_id,
+            self._tables.streamer_state.c.is_live,
+            self._tables.streamer_state.c.broad_no,
+        )
+        with self._engine.begin() as conn:
+            rows = conn.execute(stmt).all()
+        return {row[0]: (bool(row[1]), row[2]) for row in rows}
+
+    def record_notifications(
+        self,
+        rows: list[tuple[str, str, str | None]],
+        outbox: list[dict] | None = None,
+    ) -> None:
+        """Mark (guild_id, soop_channel_id, last_notified_at) links as seen live.
+
+        A None timestamp records the link without notifying (e.g. rate limited)
+        and keeps any earlier last_notified_at. ``outbox`` rows from a
+        standalone poller are queued in the same transaction, so a go-live is
+        delivered exactly when it is recorded.
+        """
+        if not rows and not outbox:
+            return
+        stmt = text(
+            """
+            INSERT INTO live_status (guild_id, soop_channel_id, last_notified_at)
+            VALUES (:guild_id, :soop_channel_id, :last_notified_at)
+            ON CONFLICT (guild_id, soop_channel_id)
+            DO UPDATE SET last_notified_at=COALESCE(
+                excluded.last_notified_at, live_status.last_notified_at
+            )
+            """
+        )
+        with self._engine.begin() as conn:
+            if rows:
+                conn.execute(
+                    stmt,
+                    [
+                        {
+                            "guild_id": guild_id,
+                            "soop_channel_id": soop_channel_id,
+                            "last_notified_at": last_notified_at,
+                        }
+                        for guild_id, soop_channel_id, last_notified_at in rows
+                    ],
+                )
+            if outbox:
+                now = datetime.utcnow().isoformat()
+                conn.execute(
+                    insert(self._tables.notification_outbox),
+                    [
+                        {
+                            "guild_id": row["guild_id"],
+                            "soop_channel_id": row["soop_channel_id"],
+                            "info": json.dumps(row["info"]) if row.get("info") else None,
+                            "detected_at": row["detected_at"],
+                            "created_at": now,
+                        }
+                        for row in outbox
+                    ],
+                )
+                self._publish(conn, "outbox", None)
+
+    def claim_outbox(self, limit: int = 100, shards: ShardSet | None = None) -> list[dict]:
+        """Remove and return the oldest queued go-lives, oldest first.
+
+        Claiming deletes the rows in the same statement, so when several bot
+        processes drain the outbox each row goes to exactly one of them.
+        """
+        outbox = self._tables.notification_outbox
+        ids = select(outbox.c.id).order_by(outbox.c.id).limit(limit)
+        if shards is not None:
+            ids = ids.where(self._owned_by(outbox.c.guild_id, shards))
+        if self._engine.dialect.name == "postgresql":
+            # Concurrent claimers skip each other's rows instead of waiting.
+            ids = ids.with_for_update(skip_locked=True)
+        stmt = delete(outbox).where(outbox.c.id.in_(ids)).returning(*outbox.c)
+        with self._engine.begin() as conn:
+            rows = sorted(conn.execute(stmt).mappings().all(), key=lambda row: row["id"])
+        return [
+            {**row, "info": json.loads(row["info"]) if row["info"] else None} for row in rows
+        ]
+
+    def _owned_by(self, guild_id, shards: ShardSet):
+        """SQL version of ``ShardSet.owns``: non-numeric guild ids go to shard 0."""
+        if self._engine.dialect.name == "postgresql":
+            numeric = guild_id.op("~", is_comparison=True)("^[0-9]+$")
+        else:
+            non_digit = guild_id.op("GLOB", is_comparison=True)("*[^0-9]*")
+            numeric = and_(guild_id != "", not_(non_digit))
+        # The CASE keeps Postgres from casting ids that aren't numbers.
+        shard_id = case(
+            (numeric, cast(guild_id, BigInteger).op(">>")(22) % shards.shard_count),
+            else_=0,
+        )
+        return shard_id.in_(sorted(shards.shard_ids))
+
+    def get_live_status(self, guild_id: str) -> dict[str, dict[str, str | bool | None]]:
+        """Return live_status rows for one guild, keyed by soop_channel_id."""
+        live_status = self._tables.live_status
+        streamer_state = self._tables.streamer_state
+        stmt = (
+            select(
+                live_status.c.soop_channel_id,
+                live_status.c.last_notified_at,
+                streamer_state.c.is_live,
+                streamer_state.c.broad_no,
+            )
+            .outerjoin(
+                streamer_state,
+                streamer_state.c.soop_channel_id == live_status.c.soop_channel_id,
+            )
+            .where(live_status.c.guild_id == guild_id)
+        )
         with self._engine.begin() as conn:
             rows = conn.execute(stmt).mappings().all()
         return {
-            f"{row['guild_id']}:{row['soop_channel_id']}": {
+            row["soop_channel_id"]: {
                 "is_live": bool(row["is_live"]),
                 "broad_no": row["broad_no"],
-                "last_notified_at": row.get("last_notified_at"),
+                "last_notified_at": row["last_notified_at"],
             }
             for row in rows
         }
 
-    def prune_live_status(self, active_keys: set[str]) -> None:
+    def iter_live_status(self) -> list[tuple[int, bool, str | None]]:
+        """Return (link id, True, broad_no) for notified links whose streamer is live."""
+        links = self._tables.guild_streamers
+        live_status = self._tables.live_status
+        streamer_state = self._tables.streamer_state
+        stmt = (
+            select(links.c.id, streamer_state.c.is_live, streamer_state.c.broad_no)
+            .join(
+                live_status,
+                (live_status.c.guild_id == links.c.guild_id)
+                & (live_status.c.soop_channel_id == links.c.soop_channel_id),
+            )
+            .join(streamer_state, streamer_state.c.soop_channel_id == links.c.soop_channel_id)
+            .where(streamer_state.c.is_live == 1)
+        )
         with self._engine.begin() as conn:
-            rows = conn.execute(
-                select(
-                    self._tables.live_status.c.guild_id,
-                    self._tables.live_status.c.soop_channel_id,
-                )
-            ).all()
-            for row in rows:
-                key = f"{row[0]}:{row[1]}"
-                if key not in active_keys:
-                    conn.execute(
-                        delete(self._tables.live_status).where(
-                            (self._tables.live_status.c.guild_id == row[0])
-                            & (self._tables.live_status.c.soop_channel_id == row[1])
-                        )
-                    )
+            rows = conn.execute(stmt).all()
+        return [(row[0], bool(row[1]), row[2]) for row in rows]
+
+    def prune_live_status(self) -> int:
+        """Delete state for links and streamers that no longer exist, set-based."""
+        stmt = text(
+            """
+            DELETE FROM live_status
+            WHERE NOT EXISTS (
+                SELECT 1 FROM guild_streamers
+                WHERE guild_streamers.guild_id = live_status.guild_id
+                  AND guild_streamers.soop_channel_id = live_status.soop_channel_id
+            )
+            """
+        )
+        streamer_stmt = text(
+            """
+            DELETE FROM streamer_state
+            WHERE NOT EXISTS (
+                SELECT 1 FROM guild_streamers
+                WHERE guild_streamers.soop_channel_id = streamer_state.soop_channel_id
+            )
+            """
+        )
+        with self._engine.begin() as conn:
+            result = conn.execute(stmt)
+            conn.execute(streamer_stmt)
+            return result.rowcount or 0
 
     def remove_live_status(self, guild_id: str, soop_channel_id: str) -> int:
         stmt = delete(self._tables.live_status).where(
@@ -452,6 +991,101 @@ class Storage:
             result = conn.execute(stmt)
             return result.rowcount or 0
 
+    def _db_epoch_sql(self) -> str:
+        # Lease expiry uses the database clock so replicas with skewed clocks
+        # still agree on when a lease has lapsed.
+        if self._engine.dialect.name == "postgresql":
+            return "EXTRACT(EPOCH FROM clock_timestamp())"
+        return "((julianday('now') - 2440587.5) * 86400.0)"
+
+    def take_rate_slot(self, guild_id: str, limit: int, window_start: int) -> bool:
+        """Count one notification against the guild's window; False once over ``limit``.
+
+        The increment is a single upsert, so pollers in several processes
+        share one budget per guild and window.
+        """
+        stmt = text(
+            """
+            INSERT INTO guild_rate_windows (guild_id, window_start, used)
+            VALUES (:guild_id, :window_start, 1)
+            ON CONFLICT (guild_id)
+            DO UPDATE SET
+                used = CASE
+                    WHEN guild_rate_windows.window_start = excluded.window_start
+                    THEN guild_rate_windows.used + 1
+                    ELSE 1
+                END,
+                window_start = excluded.window_start
+            RETURNING used
+            """
+        )
+        with self._engine.begin() as conn:
+            used = conn.execute(
+                stmt, {"guild_id": guild_id, "window_start": window_start}
+            ).scalar_one()
+        return used <= limit
+
+    def acquire_lease(self, name: str, owner: str, ttl_seconds: float) -> bool:
+        """Take or renew a named lease; True if ``owner`` holds it afterwards."""
+        now = self._db_epoch_sql()
+        stmt = text(
+            f"""
+            INSERT INTO leases (name, owner, expires_at)
+            VALUES (:name, :owner, {now} + :ttl)
+            ON CONFLICT (name)
+            DO UPDATE SET owner=excluded.owner, expires_at=excluded.expires_at
+            WHERE leases.owner = excluded.owner OR leases.expires_at < {now}
+            """
+        )
+        with self._engine.begin() as conn:
+            result = conn.execute(stmt, {"name": name, "owner": owner, "ttl": ttl_seconds})
+            return (result.rowcount or 0) > 0
+
+    def renew_leases(self, owner: str, names: list[str], ttl_seconds: float) -> set[str]:
+        """Extend every lease in ``names`` still held by ``owner``; return those renewed."""
+        if not names:
+            return set()
+        now = self._db_epoch_sql()
+        stmt = text(
+            f"""
+            UPDATE leases SET expires_at = {now} + :ttl
+            WHERE owner = :owner AND name IN :names
+            RETURNING name
+            """
+        ).bindparams(bindparam("names", expanding=True))
+        with self._engine.begin() as conn:
+            rows = conn.execute(
+                stmt, {"owner": owner, "names": list(names), "ttl": ttl_seconds}
+            ).all()
+        return {row[0] for row in rows}
+
+    def release_lease(self, name: str, owner: str) -> bool:
+        stmt = delete(self._tables.leases).where(
+            (self._tables.leases.c.name == name) & (self._tables.leases.c.owner == owner)
+        )
+        with self._engine.begin() as conn:
+            result = conn.execute(stmt)
+            return (result.rowcount or 0) > 0
+
+    def list_leases(self, prefix: str) -> dict[str, str]:
+        """Return {name: owner} for unexpired leases whose name starts with ``prefix``."""
+        now = self._db_epoch_sql()
+        stmt = text(
+            f"SELECT name, owner FROM leases WHERE name LIKE :pattern AND expires_at >= {now}"
+        )
+        with self._engine.begin() as conn:
+            rows = conn.execute(stmt, {"pattern": f"{prefix}%"}).all()
+        return {row[0]: row[1] for row in rows}
+
+    def get_lease(self, name: str) -> dict | None:
+        now = self._db_epoch_sql()
+        stmt = text(f"SELECT owner, expires_at - {now} FROM leases WHERE name = :name")
+        with self._engine.begin() as conn:
+            row = conn.execute(stmt, {"name": name}).fetchone()
+        if not row:
+            return None
+        return {"owner": row[0], "expires_in": float(row[1])}
+
     def ping(self) -> bool:
         try:
             with self._engine.begin() as conn:
@@ -479,3 +1113,44 @@ class Storage:
         if not row:
             return None
         return row[0]
+
+    def set_channel_webhook(self, channel_id: str, webhook_id: str, webhook_token: str) -> None:
+        stmt = text(
+            """
+            INSERT INTO channel_webhooks (channel_id, webhook_id, webhook_token, created_at)
+            VALUES (:channel_id, :webhook_id, :webhook_token, :created_at)
+            ON CONFLICT (channel_id)
+            DO UPDATE SET webhook_id=excluded.webhook_id,
+                          webhook_token=excluded.webhook_token,
+                          created_at=excluded.created_at
+            """
+        )
+        with self._engine.begin() as conn:
+            conn.execute(
+                stmt,
+                {
+                    "channel_id": channel_id,
+                    "webhook_id": webhook_id,
+                    "webhook_token": webhook_token,
+                    "created_at": datetime.utcnow().isoformat(),
+                },
+            )
+
+    def get_channel_webhook(self, channel_id: str) -> dict[str, str] | None:
+        stmt = select(
+            self._tables.channel_webhooks.c.webhook_id,
+            self._tables.channel_webhooks.c.webhook_token,
+        ).where(self._tables.channel_webhooks.c.channel_id == channel_id)
+        with self._engine.begin() as conn:
+            row = conn.execute(stmt).fetchone()
+        if not row:
+            return None
+        return {"id": row[0], "token": row[1]}
+
+    def remove_channel_webhook(self, channel_id: str) -> int:
+        stmt = delete(self._tables.channel_webhooks).where(
+            self._tables.channel_webhooks.c.channel_id == channel_id
+        )
+        with self._engine.begin() as conn:
+            result = conn.execute(stmt)
+            return result.rowcount or 0
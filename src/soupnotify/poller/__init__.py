@@ -0,0 +1 @@
+"""Standalone SOOP poller entrypoint."""
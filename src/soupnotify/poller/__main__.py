@@ -0,0 +1,88 @@
+import asyncio
+import logging
+
+from soupnotify.core.changes import ChangeListener
+from soupnotify.core.config import load_settings
+from soupnotify.core.lease import POLLER_LEASE, LeaseKeeper
+from soupnotify.core.metrics import BotMetrics
+from soupnotify.core.prometheus import MetricsExporter
+from soupnotify.core.storage import Storage
+from soupnotify.soop.client import SoopClient
+from soupnotify.soop.partition import PartitionCoordinator
+from soupnotify.soop.poller import SoopPoller
+
+
+settings = load_settings()
+logging.basicConfig(level=settings.log_level.upper())
+logger = logging.getLogger(__name__)
+
+
+async def run() -> None:
+    # No Discord connection here: go-lives are written to the outbox and the
+    # bot processes render and deliver them.
+    storage = Storage(settings.database_url, cache_settings=True)
+    soop_client = SoopClient(
+        settings.soop_channel_api_base_url,
+        "",
+        0,
+        settings.soop_channel_api_base_url,
+        settings.soop_hardcode_streamer_id,
+        settings.soop_thumbnail_url_template,
+        settings.soop_retry_max,
+        settings.soop_retry_backoff,
+        channel_headers=settings.soop_channel_headers,
+    )
+    poll_partitions = (
+        PartitionCoordinator(storage, settings.poll_partitions, settings.leader_lease_seconds)
+        if settings.poll_partitions
+        else None
+    )
+    poller_lease = (
+        None
+        if poll_partitions
+        else LeaseKeeper(storage, POLLER_LEASE, settings.leader_lease_seconds)
+    )
+    metrics = BotMetrics()
+    poller = SoopPoller(
+        soop_client,
+        storage,
+        None,
+        settings.soop_stream_url_base,
+        metrics,
+        settings.poll_interval_seconds,
+        settings.soop_info_cooldown_seconds,
+        change_events=True,
+        lease=poller_lease,
+        partitions=poll_partitions,
+        snapshot_path=settings.snapshot_path,
+        snapshot_interval_seconds=settings.snapshot_interval_seconds,
+        catchup_gap_seconds=settings.catchup_gap_seconds,
+    )
+    change_listener = ChangeListener(
+        storage, settings.database_url, settings.change_poll_interval_seconds
+    )
+    change_listener.subscribe(storage.apply_change)
+    change_listener.subscribe(poller.apply_change)
+    tasks = [
+        change_listener.run(),
+        poll_partitions.run() if poll_partitions else poller_lease.run(),
+        poller.run(None),
+    ]
+    if settings.metrics_dir:
+        exporter = MetricsExporter(
+            metrics, settings.metrics_dir, "poller", settings.metrics_interval_seconds
+        )
+        tasks.append(exporter.run())
+    logger.info("Starting standalone SOOP poller")
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        await soop_client.aclose()
+
+
+def main() -> None:
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import asyncio
 import logging
 import random
+from datetime import datetime, timedelta, timezone
 from typing import Any, Iterable
 
 import httpx
@@ -17,6 +18,26 @@ DEFAULT_HEADERS = {
     "Origin": "https://www.sooplive.co.kr",
 }
 
+# SOOP reports broadcast start as a naive local (KST) timestamp.
+SOOP_TIMEZONE = timezone(timedelta(hours=9))
+
+
+def parse_broad_start(info: dict[str, Any] | None) -> float | None:
+    """Return the broadcast start from a broad info payload as a UNIX timestamp."""
+    if not info:
+        return None
+    raw = info.get("broadStart")
+    if not raw:
+        return None
+    try:
+        started = datetime.fromisoformat(str(raw).strip())
+    except ValueError:
+        logger.debug("Unparseable SOOP broadStart: %s", raw)
+        return None
+    if started.tzinfo is None:
+        started = started.replace(tzinfo=SOOP_TIMEZONE)
+    return started.timestamp()
+
 
 class SoopClient:
     def __init__(
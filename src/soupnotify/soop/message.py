@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import discord
+
+from soupnotify.core.components import Components, watch_button_components
+from soupnotify.core.embeds import apply_embed_overrides, build_live_embed
+from soupnotify.core.render import render_embed_overrides, render_message
+from soupnotify.core.storage import Storage
+from soupnotify.soop.client import SoopClient
+
+
+class LiveMessageBuilder:
+    """Renders a link's go-live message, embed and watch button.
+
+    Used by the in-process poller and by the bot's outbox consumer when a
+    standalone poller records go-lives instead of sending them.
+    """
+
+    def __init__(self, storage: Storage, client: SoopClient, stream_url_base: str) -> None:
+        self._storage = storage
+        self._client = client
+        self._stream_url_base = stream_url_base.rstrip("/")
+
+    def build(
+        self,
+        link: dict,
+        info: dict | None,
+        guild_name: str,
+        base_embeds: dict[str, discord.Embed] | None = None,
+    ) -> tuple[str | None, discord.Embed, Components, dict]:
+        guild_id = link["guild_id"]
+        soop_channel_id = link["soop_channel_id"]
+        notify_channel_id = int(link["notify_channel_id"])
+        mention_settings = self._storage.get_mention(guild_id)
+        mention = _mention_text(mention_settings)
+        message = render_message(
+            link.get("message_template"),
+            soop_channel_id,
+            notify_channel_id,
+            guild_name,
+            self._stream_url_base,
+            mention,
+            info=info,
+        )
+        stream_url = f"{self._stream_url_base}/{soop_channel_id}"
+        embed = base_embeds.get(soop_channel_id) if base_embeds is not None else None
+        if embed is None:
+            # Built once per streamer per poll and shared by every guild
+            # that has no embed customisation.
+            embed = build_live_embed(
+                soop_channel_id,
+                stream_url,
+                info,
+                _thumbnail_url(self._client, info),
+            )
+            if base_embeds is not None:
+                base_embeds[soop_channel_id] = embed
+        embed_settings = self._storage.get_embed_template(guild_id)
+        if any(embed_settings.values()):
+            title_override, description_override, color_override = render_embed_overrides(
+                embed_settings,
+                soop_channel_id,
+                notify_channel_id,
+                guild_name,
+                self._stream_url_base,
+                info,
+            )
+            embed = apply_embed_overrides(
+                embed,
+                title_override=title_override,
+                description_override=description_override,
+                color_hex=color_override,
+            )
+        return (
+            message,
+            embed,
+            watch_button_components(stream_url),
+            _allowed_mentions(mention_settings),
+        )
+
+
+def guild_name(bot: discord.Bot | None, guild_id: str) -> str:
+    guild = bot.get_guild(int(guild_id)) if bot and guild_id.isdigit() else None
+    return guild.name if guild else guild_id
+
+
+def _thumbnail_url(client: SoopClient, info: dict | None) -> str | None:
+    if not info:
+        return None
+    return client.build_thumbnail_url(info.get("broadNo"))
+
+
+def _allowed_mentions(mention: dict[str, str | None]) -> dict:
+    """Discord allowed_mentions payload permitting only the configured mention."""
+    mention_type = mention.get("type")
+    value = mention.get("value")
+    if mention_type == "everyone":
+        return {"parse": ["everyone"]}
+    if mention_type == "role" and value:
+        return {"parse": [], "roles": [value]}
+    return {"parse": []}
+
+
+def _mention_text(mention: dict[str, str | None]) -> str | None:
+    mention_type = mention.get("type")
+    value = mention.get("value")
+    if mention_type == "everyone":
+        return "@everyone"
+    if mention_type == "role" and value:
+        return f"<@&{value}>"
+    return None
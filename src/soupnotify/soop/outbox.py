@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+import discord
+
+from soupnotify.core.notifier import Notifier
+from soupnotify.core.shards import ShardSet
+from soupnotify.core.storage import Storage
+from soupnotify.soop.client import parse_broad_start
+from soupnotify.soop.message import LiveMessageBuilder, guild_name
+
+logger = logging.getLogger(__name__)
+
+# Go-lives queued longer ago than this (e.g. while every bot process was down)
+# are dropped instead of announcing broadcasts that may be long over.
+MAX_OUTBOX_AGE_SECONDS = 900
+
+
+class OutboxConsumer:
+    """Delivers go-lives that a standalone poller queued in the outbox.
+
+    Rendering happens here rather than in the poller because only the bot
+    knows guild names. Rows are drained when a change event says the outbox
+    grew and every ``poll_interval`` as a fallback.
+    """
+
+    def __init__(
+        self,
+        storage: Storage,
+        messages: LiveMessageBuilder,
+        notifier: Notifier,
+        bot: discord.Bot | None,
+        poll_interval: float = 5.0,
+        batch_size: int = 100,
+        shards: ShardSet | None = None,
+    ) -> None:
+        self._storage = storage
+        self._messages = messages
+        self._notifier = notifier
+        self._bot = bot
+        self._poll_interval = max(poll_interval, 0.1)
+        self._batch_size = max(batch_size, 1)
+        self._shards = shards
+        self._wake = asyncio.Event()
+
+    def apply_change(self, event) -> None:
+        if event.kind in {"outbox", "all"}:
+            self._wake.set()
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.drain()
+            except Exception:
+                logger.exception("Outbox delivery failed")
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self._poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def drain(self) -> int:
+        delivered = 0
+        while True:
+            # Rows are claimed before delivery; another bot process draining
+            # at the same time gets different ones.
+            rows = self._storage.claim_outbox(self._batch_size, self._shards)
+            if not rows:
+                return delivered
+            now = time.time()
+            base_embeds: dict[str, discord.Embed] = {}
+            for row in rows:
+                if now - row["detected_at"] > MAX_OUTBOX_AGE_SECONDS:
+                    logger.warning(
+                        "Dropping stale go-live for %s in guild %s",
+                        row["soop_channel_id"],
+                        row["guild_id"],
+                    )
+                    continue
+                # The link may have been removed or re-pointed since it went live.
+                link = self._storage.get_link(row["guild_id"], row["soop_channel_id"])
+                if link is None:
+                    continue
+                message, embed, components, allowed_mentions = self._messages.build(
+                    link, row["info"], guild_name(self._bot, row["guild_id"]), base_embeds
+                )
+                await self._notifier.enqueue(
+                    int(link["notify_channel_id"]),
+                    message,
+                    embed=embed,
+                    components=components,
+                    allowed_mentions=allowed_mentions,
+                    detected_at=row["detected_at"],
+                    broad_started_at=parse_broad_start(row["info"]),
+                )
+                delivered += 1
+            if len(rows) < self._batch_size:
+                return delivered
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import hashlib
+import logging
+import time
+import zlib
+from typing import Callable, Iterable
+
+from soupnotify.core.lease import default_owner_id
+from soupnotify.core.storage import Storage
+
+logger = logging.getLogger(__name__)
+
+MEMBER_LEASE_PREFIX = "poll-worker:"
+PARTITION_LEASE_PREFIX = "poll-partition:"
+
+
+def partition_for(soop_channel_id: str, partitions: int) -> int:
+    # crc32 rather than hash(): it must agree across processes.
+    return zlib.crc32(soop_channel_id.encode("utf-8")) % partitions
+
+
+def _ring_point(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hash ring: adding or removing a member only moves its share."""
+
+    def __init__(self, members: Iterable[str], vnodes: int = 64) -> None:
+        points = sorted(
+            (_ring_point(f"{member}#{index}"), member)
+            for member in set(members)
+            for index in range(vnodes)
+        )
+        self._hashes = [point for point, _ in points]
+        self._members = [member for _, member in points]
+
+    def owner(self, key: str) -> str | None:
+        if not self._hashes:
+            return None
+        index = bisect.bisect(self._hashes, _ring_point(key)) % len(self._hashes)
+        return self._members[index]
+
+
+class PartitionCoordinator:
+    """Splits the poller's streamers across workers sharing one database.
+
+    Streamers hash into a fixed number of partitions, and live workers (those
+    holding an unexpired member lease) are placed on a HashRing that decides
+    which worker each partition belongs to. A worker only polls partitions
+    whose partition lease it holds. Leases change hands between poll cycles:
+    the old owner releases a partition after writing its state, and the new
+    owner takes it on its next cycle and reloads that state, so a go-live is
+    neither lost nor sent twice during a rebalance.
+    """
+
+    def __init__(
+        self,
+        storage: Storage,
+        partitions: int,
+        ttl_seconds: float = 30.0,
+        owner: str | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._storage = storage
+        self._partitions = max(partitions, 1)
+        self._ttl = max(ttl_seconds, 1.0)
+        self._renew_interval = self._ttl / 3
+        self._owner = owner or default_owner_id()
+        self._clock = clock
+        self._held: set[int] = set()
+        self._valid_until = 0.0
+        self._loaded: frozenset[int] = frozenset()
+
+    @property
+    def owner(self) -> str:
+        return self._owner
+
+    @property
+    def held(self) -> frozenset[int]:
+        if self._clock() >= self._valid_until:
+            return frozenset()
+        return frozenset(self._held)
+
+    def owns(self, soop_channel_id: str) -> bool:
+        return partition_for(soop_channel_id, self._partitions) in self.held
+
+    def owned_links(self, links: list[dict]) -> list[dict]:
+        held = self.held
+        return [
+            link
+            for link in links
+            if partition_for(link["soop_channel_id"], self._partitions) in held
+        ]
+
+    def heartbeat(self) -> frozenset[int]:
+        """Renew the member lease and every held partition lease."""
+        started = self._clock()
+        try:
+            self._storage.acquire_lease(self._member_name(self._owner), self._owner, self._ttl)
+            renewed = self._storage.renew_leases(
+                self._owner, [self._partition_name(p) for p in self._held], self._ttl
+            )
+        except Exception:
+            logger.exception("Poll partition heartbeat failed")
+            self._valid_until = 0.0
+            return frozenset()
+        lost = {p for p in self._held if self._partition_name(p) not in renewed}
+        if lost:
+            logger.warning("Lost poll partitions %s", sorted(lost))
+            self._held -= lost
+            # Someone else may poll it before we get it back; reload then.
+            self._loaded = self._loaded - lost
+        self._valid_until = started + self._ttl
+        return self.held
+
+    # Called right before a cycle commits notifications, so a partition that
+    # moved during the SOOP fetch is left to its new owner.
+    confirm = heartbeat
+
+    def rebalance(self) -> bool:
+        """Converge on this worker's ring share; True if the held set changed.
+
+        Only call this between poll cycles: released partitions must already
+        have their state written.
+        """
+        self.heartbeat()
+        members = {self._owner}
+        try:
+            members.update(self._storage.list_leases(MEMBER_LEASE_PREFIX).values())
+            ring = HashRing(members)
+            wanted = {
+                p for p in range(self._partitions) if ring.owner(str(p)) == self._owner
+            }
+            for partition in sorted(self._held - wanted):
+                self._storage.release_lease(self._partition_name(partition), self._owner)
+                self._held.discard(partition)
+            for partition in sorted(wanted - self._held):
+                # Fails while the previous owner still holds it; retried next cycle.
+                if self._storage.acquire_lease(
+                    self._partition_name(partition), self._owner, self._ttl
+                ):
+                    self._held.add(partition)
+        except Exception:
+            logger.exception("Poll partition rebalance failed")
+        held = self.held
+        changed = held != self._loaded
+        if changed:
+            logger.info(
+                "Polling %s/%s partitions across %s workers",
+                len(held),
+                self._partitions,
+                len(members),
+            )
+        self._loaded = held
+        return changed
+
+    async def run(self) -> None:
+        try:
+            while True:
+                await asyncio.sleep(self._renew_interval)
+                self.heartbeat()
+        finally:
+            self.leave()
+
+    def leave(self) -> None:
+        for partition in sorted(self._held):
+            self._storage.release_lease(self._partition_name(partition), self._owner)
+        self._held.clear()
+        self._valid_until = 0.0
+        self._storage.release_lease(self._member_name(self._owner), self._owner)
+
+    @staticmethod
+    def _member_name(owner: str) -> str:
+        return f"{MEMBER_LEASE_PREFIX}{owner}"
+
+    @staticmethod
+    def _partition_name(partition: int) -> str:
+        return f"{PARTITION_LEASE_PREFIX}{partition}"
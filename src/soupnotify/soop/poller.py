@@ -1,63 +1,266 @@
 import asyncio
 import logging
 import time
-from datetime import datetime
+import uuid
+from datetime import datetime, timezone
+from typing import Callable
 
 import discord
 
-from soupnotify.core.embeds import build_live_embed
-from soupnotify.core.metrics import BotMetrics
+from soupnotify.core.events import (
+    BroadcastRestarted,
+    EventBus,
+    TitleChanged,
+    WentLive,
+    WentOffline,
+)
+from soupnotify.core.lease import LeaseKeeper
+from soupnotify.core.metrics import BotMetrics, StageTimer
 from soupnotify.core.notifier import Notifier
-from soupnotify.core.rate_limit import GuildRateLimiter
-from soupnotify.core.render import render_embed_overrides, render_message
+from soupnotify.core.rate_limit import GuildRateLimiter, SharedGuildRateLimiter
+from soupnotify.core.shards import ShardSet
 from soupnotify.core.storage import Storage
-from soupnotify.soop.client import SoopClient
+from soupnotify.soop.client import SoopClient, parse_broad_start
+from soupnotify.soop.message import LiveMessageBuilder, guild_name
+from soupnotify.soop.partition import PartitionCoordinator
+from soupnotify.soop.snapshot import PollerSnapshot, read_snapshot, write_snapshot
+from soupnotify.soop.state import PollerState
 
 
 logger = logging.getLogger(__name__)
 
+# poll_state key rewritten at the start of every cycle when snapshots are on; a
+# snapshot is only trusted while the database still holds its token.
+POLL_TOKEN_KEY = "poll_token"
+# How often the sleep between polls checks the wall clock for a suspend/resume.
+RESUME_CHECK_SECONDS = 5.0
+
 
 class SoopPoller:
     def __init__(
         self,
         client: SoopClient,
         storage: Storage,
-        notifier: Notifier,
+        notifier: Notifier | None,
         stream_url_base: str,
         metrics: BotMetrics,
         interval_seconds: int,
         info_cooldown_seconds: int,
+        change_events: bool = False,
+        lease: LeaseKeeper | None = None,
+        partitions: PartitionCoordinator | None = None,
+        shards: ShardSet | None = None,
+        events: EventBus | None = None,
+        snapshot_path: str | None = None,
+        snapshot_interval_seconds: float = 60.0,
+        catchup_gap_seconds: float = 180.0,
+        clock: Callable[[], float] = time.time,
     ) -> None:
         self._client = client
         self._storage = storage
+        # Without a notifier (the standalone poller) go-lives are written to
+        # the outbox for a bot process to render and deliver.
         self._notifier = notifier
-        self._stream_url_base = stream_url_base.rstrip("/")
+        # In a multi-process shard cluster, go-lives for guilds on other
+        # processes' shards go through the outbox as well.
+        self._shards = shards
+        self._messages = LiveMessageBuilder(storage, client, stream_url_base)
+        self._events = events if events is not None and events.has_subscribers else None
+        # Last seen title per live streamer, for TitleChanged events.
+        self._titles: dict[str, str] = {}
         self._interval = interval_seconds
         self._metrics = metrics
-        self._last_live: dict[str, bool] = {}
-        self._last_broad_no: dict[str, str | None] = {}
+        self._state = PollerState()
+        self._streamers: dict[str, tuple[bool, str | None]] = {}
+        self._links: dict[int, dict] = {}
+        self._links_version: int | None = None
+        # With a ChangeListener subscribed, link changes arrive as events and
+        # the per-poll links_version read is skipped.
+        self._change_events = change_events
+        self._links_dirty = True
         self._info_cache: dict[str, dict] = {}
         self._info_cache_ts: dict[str, float] = {}
         self._info_cooldown = max(info_cooldown_seconds, 1)
-        self._rate_limiter = GuildRateLimiter()
-        for key, status in self._storage.load_live_status().items():
-            self._last_live[key] = bool(status.get("is_live"))
-            self._last_broad_no[key] = status.get("broad_no")  # type: ignore[assignment]
+        # Partitions spread a guild's streamers over several workers, so the
+        # guild's budget has to live in the database.
+        self._rate_limiter = (
+            SharedGuildRateLimiter(storage) if partitions is not None else GuildRateLimiter()
+        )
+        self._snapshot_path = snapshot_path or None
+        self._snapshot_interval = max(snapshot_interval_seconds, 1.0)
+        self._poll_token: str | None = None
+        self._catchup_gap = max(catchup_gap_seconds, float(interval_seconds))
+        # Wall clock; catch-up and cache ages use it, sleeps stay monotonic.
+        self._clock = clock
+        # Wall-clock time of the last completed cycle, None until one ran here.
+        self._last_poll_at: float | None = None
+        # With a lease only the replica holding it polls; the others wait and
+        # reload state from the database when they take over.
+        self._lease = lease
+        # With partitions each replica polls only its share of the streamers,
+        # and state is loaded once the first partitions are taken.
+        self._partitions = partitions
+        if lease is None and partitions is None:
+            self._load_state()
+
+    def _load_state(self) -> None:
+        self._state = PollerState()
+        self._streamers = {}
+        self._titles = {}
+        self._links = {}
+        self._links_version = None
+        # Another process may have polled since; take the gap from storage.
+        self._last_poll_at = None
+        self._links_dirty = True
+        # remove_link cleans up live_status; this only catches rows orphaned
+        # by older versions or manual edits.
+        self._storage.prune_live_status()
+        self._storage.prune_link_deletions()
+        snapshot = self._read_snapshot()
+        if snapshot is not None:
+            self._state = snapshot.state
+            self._streamers.update(snapshot.streamers)
+            logger.info("Restored poller state from snapshot %s", self._snapshot_path)
+            return
+        for link_id, is_live, broad_no in self._storage.iter_live_status():
+            self._state.update(link_id, is_live, broad_no)
+        self._streamers.update(self._storage.load_streamer_states())
 
-    async def run(self, bot: discord.Bot) -> None:
-        while True:
+    def _read_snapshot(self) -> PollerSnapshot | None:
+        if not self._snapshot_path:
+            return None
+        snapshot = read_snapshot(self._snapshot_path)
+        if snapshot is None:
+            return None
+        # Cached broad info stays usable for the rest of its cooldown either way.
+        now = self._clock()
+        for streamer_id, (fetched_at, info) in snapshot.info_cache.items():
+            if now - fetched_at < self._info_cooldown:
+                self._info_cache[streamer_id] = info
+                self._info_cache_ts[streamer_id] = fetched_at
+        if self._partitions is not None:
+            # Workers of other replicas poll the same storage and owner ids
+            # change on restart, so no token can vouch for partition state.
+            return None
+        if (
+            snapshot.poll_token != self._storage.get_poll_state(POLL_TOKEN_KEY)
+            or snapshot.links_version != self._storage.get_links_version()
+        ):
+            # Someone polled or links changed after it was written.
+            logger.info("Poller snapshot is stale; loading state from the database")
+            return None
+        return snapshot
+
+    def _build_snapshot(self) -> PollerSnapshot | None:
+        if not self._snapshot_path:
+            return None
+        if self._partitions is None and self._poll_token is None:
+            return None
+        # Copies, so the file can be written off the event loop while polls
+        # keep mutating the live state.
+        return PollerSnapshot(
+            created_at=self._clock(),
+            links_version=self._links_version or 0,
+            poll_token=self._poll_token or "",
+            state=PollerState.from_columns(*self._state.columns()),
+            streamers=dict(self._streamers),
+            info_cache={
+                streamer_id: (self._info_cache_ts.get(streamer_id, 0.0), info)
+                for streamer_id, info in self._info_cache.items()
+            },
+        )
+
+    async def run(self, bot: discord.Bot | None) -> None:
+        # State is reloaded whenever another replica may have polled our
+        # streamers in the meantime.
+        stale = self._lease is not None or self._partitions is not None
+        last_snapshot = time.monotonic()
+        try:
+            while True:
+                if self._lease is not None and not self._lease.is_leader:
+                    if not stale:
+                        logger.warning("Poller lease lost; standing by")
+                        stale = True
+                    await self._lease.wait_until_leader()
+                    continue
+                try:
+                    if self._partitions is not None and self._partitions.rebalance():
+                        stale = True
+                    if stale:
+                        self._load_state()
+                        stale = False
+                    self._log_catch_up()
+                    await self._poll_once(bot)
+                except Exception:
+                    logger.exception("SOOP poller failed")
+                now = time.monotonic()
+                if self._snapshot_path and now - last_snapshot >= self._snapshot_interval:
+                    last_snapshot = now
+                    await self._save_snapshot_safely()
+                await self._sleep_until_next_poll()
+        finally:
+            # A snapshot taken on shutdown makes the next start warm.
+            if not stale:
+                await self._save_snapshot_safely()
+
+    def _poll_gap(self) -> float | None:
+        """Seconds since the last completed cycle, by this or an earlier process."""
+        last_poll_at = self._last_poll_at
+        if last_poll_at is None:
+            raw = self._storage.get_poll_state("last_poll_at")
+            if not raw:
+                return None
             try:
-                await self._poll_once(bot)
-            except Exception:
-                logger.exception("SOOP poller failed")
-            await asyncio.sleep(self._interval)
-
-    async def _poll_once(self, bot: discord.Bot) -> None:
-        start = time.perf_counter()
-        links = self._storage.list_links()
-        active_keys = {f"{link['guild_id']}:{link['soop_channel_id']}" for link in links}
-        self._storage.prune_live_status(active_keys)
+                stored = datetime.fromisoformat(raw)
+            except ValueError:
+                return None
+            last_poll_at = stored.replace(tzinfo=timezone.utc).timestamp()
+        return self._clock() - last_poll_at
+
+    def _log_catch_up(self) -> None:
+        gap = self._poll_gap()
+        if gap is not None and gap > self._catchup_gap:
+            logger.warning("No poll for %.0fs; running a catch-up cycle", gap)
+            self._metrics.record_catch_up()
+
+    async def _sleep_until_next_poll(self) -> None:
+        # asyncio.sleep follows the monotonic clock, which stands still while
+        # the machine is suspended, so a resumed process would otherwise wait
+        # out the rest of the interval. Waking early on a wall-clock jump
+        # polls straight away instead.
+        deadline = time.monotonic() + self._interval
+        wall_started = self._clock()
+        while (remaining := deadline - time.monotonic()) > 0:
+            await asyncio.sleep(min(remaining, RESUME_CHECK_SECONDS))
+            if self._clock() - wall_started > self._catchup_gap:
+                return
+
+    async def _save_snapshot_safely(self) -> None:
+        try:
+            snapshot = self._build_snapshot()
+            if snapshot is None:
+                return
+            # Serializing the info cache and fsyncing would stall the loop.
+            size = await asyncio.to_thread(write_snapshot, self._snapshot_path, snapshot)
+            logger.debug("Wrote poller snapshot (%s bytes)", size)
+        except Exception:
+            logger.exception("Writing poller snapshot failed")
+
+    async def _poll_once(self, bot: discord.Bot | None) -> None:
+        timer = StageTimer()
+        poll_token = None
+        if self._snapshot_path and self._partitions is None:
+            # Written before any state so a crash mid-cycle invalidates the
+            # previous snapshot; only a completed cycle can be snapshotted.
+            self._poll_token = None
+            poll_token = uuid.uuid4().hex
+            self._storage.set_poll_state(POLL_TOKEN_KEY, poll_token)
+        self._refresh_links()
+        links = list(self._links.values())
+        if self._partitions is not None:
+            links = self._partitions.owned_links(links)
         target_ids = {link["soop_channel_id"] for link in links}
+        timer.mark("links")
         info_map: dict[str, dict | None] = {}
         if target_ids:
             results = await asyncio.gather(
@@ -71,78 +274,116 @@ class SoopPoller:
                     info_map[streamer_id] = None
                 else:
                     info_map[streamer_id] = result
+        timer.mark("fetch")
 
-        live_ids = {streamer_id for streamer_id, info in info_map.items() if info}
-        empty_count = sum(1 for info in info_map.values() if not info)
+        if self._partitions is not None:
+            # A partition that moved during the fetch belongs to its new owner.
+            self._partitions.confirm()
+            links = self._partitions.owned_links(links)
+            target_ids = {link["soop_channel_id"] for link in links}
+
+        live_ids = {streamer_id for streamer_id in target_ids if info_map.get(streamer_id)}
+        empty_count = sum(1 for streamer_id in target_ids if not info_map.get(streamer_id))
         if empty_count:
             self._metrics.record_empty_response(empty_count)
 
+        broad_nos: dict[str, str | None] = {}
+        streamer_changes: list[tuple[str, bool, str | None]] = []
+        for streamer_id in target_ids:
+            info = info_map.get(streamer_id)
+            broad_no = str(info.get("broadNo")) if info and info.get("broadNo") else None
+            broad_nos[streamer_id] = broad_no
+            state = (streamer_id in live_ids, broad_no)
+            previous = self._streamers.get(streamer_id)
+            if previous != state:
+                self._streamers[streamer_id] = state
+                streamer_changes.append((streamer_id, *state))
+            if self._events is not None:
+                self._publish_transition(streamer_id, previous, state, info_map.get(streamer_id))
+        for streamer_id in self._streamers.keys() - target_ids:
+            del self._streamers[streamer_id]
+            self._titles.pop(streamer_id, None)
+
+        notifications: list[tuple[str, str, str | None]] = []
+        outbox: list[dict] = []
+        deliveries: list[tuple[dict, dict | None, float]] = []
         for link in links:
+            link_id = link["id"]
             guild_id = link["guild_id"]
             soop_channel_id = link["soop_channel_id"]
-            notify_channel_id = int(link["notify_channel_id"])
-            key = f"{guild_id}:{soop_channel_id}"
 
             is_live = soop_channel_id in live_ids
-            was_live = self._last_live.get(key, False)
-            prev_broad_no = self._last_broad_no.get(key)
-
-            info = None
-            broad_no = None
-            if is_live:
-                info = info_map.get(soop_channel_id)
-                broad_no = str(info.get("broadNo")) if info and info.get("broadNo") else None
-
-            should_notify = is_live and not was_live
-            rate_limit = self._storage.get_rate_limit(guild_id)
-            if should_notify and not self._rate_limiter.allow(guild_id, rate_limit):
-                should_notify = False
+            was_live = self._state.is_live(link_id)
 
+            info = info_map.get(soop_channel_id) if is_live else None
+            broad_no = broad_nos.get(soop_channel_id)
+            went_live = is_live and not was_live
+            should_notify = went_live
+            detected_at = self._clock()
             if should_notify:
-                guild = bot.get_guild(int(guild_id)) if guild_id.isdigit() else None
-                template = link.get("message_template")
-                mention = _mention_text(self._storage.get_mention(guild_id))
-                message = render_message(
-                    template,
-                    soop_channel_id,
-                    notify_channel_id,
-                    guild.name if guild else guild_id,
-                    self._stream_url_base,
-                    mention,
-                )
-                stream_url = f"{self._stream_url_base}/{soop_channel_id}"
-                thumbnail_url = _thumbnail_url(self._client, info)
-                embed_settings = self._storage.get_embed_template(guild_id)
-                title_override, description_override, color_override = render_embed_overrides(
-                    embed_settings,
-                    soop_channel_id,
-                    notify_channel_id,
-                    guild.name if guild else guild_id,
-                    self._stream_url_base,
+                rate_limit = self._storage.get_rate_limit(guild_id)
+                should_notify = self._rate_limiter.allow(guild_id, rate_limit)
+
+            delivers_here = self._notifier is not None and (
+                self._shards is None or self._shards.owns(guild_id)
+            )
+            if should_notify and not delivers_here:
+                outbox.append(
+                    {
+                        "guild_id": guild_id,
+                        "soop_channel_id": soop_channel_id,
+                        "info": info,
+                        "detected_at": detected_at,
+                    }
                 )
-                embed = build_live_embed(
-                    soop_channel_id,
-                    stream_url,
-                    info,
-                    thumbnail_url,
-                    title_override=title_override,
-                    description_override=description_override,
-                    color_hex=color_override,
+            elif should_notify:
+                deliveries.append((link, info, detected_at))
+            if went_live:
+                # Rate-limited links are recorded too so a restart doesn't
+                # notify them for the same broadcast.
+                notifications.append(
+                    (
+                        guild_id,
+                        soop_channel_id,
+                        datetime.utcnow().isoformat() if should_notify else None,
+                    )
                 )
-                view = _watch_view(stream_url)
-                await self._notifier.enqueue(notify_channel_id, message, embed=embed, view=view)
-                last_notified_at = datetime.utcnow().isoformat()
-            self._last_live[key] = is_live
-            self._last_broad_no[key] = broad_no
-            self._storage.set_live_status(
-                guild_id,
-                soop_channel_id,
-                is_live,
-                broad_no,
-                last_notified_at if should_notify else None,
+            self._state.update(link_id, is_live, broad_no)
+
+        # Oldest broadcasts first, so after a gap (e.g. a catch-up cycle on
+        # resume) notifications go out in the order the streams started.
+        deliveries.sort(key=lambda item: _start_order(item[1]))
+        outbox.sort(key=lambda row: _start_order(row["info"]))
+        timer.mark("diff")
+        base_embeds: dict[str, discord.Embed] = {}
+        for link, info, detected_at in deliveries:
+            message, embed, components, allowed_mentions = self._messages.build(
+                link, info, guild_name(bot, link["guild_id"]), base_embeds
             )
-        duration_ms = (time.perf_counter() - start) * 1000
+            timer.mark("render")
+            await self._notifier.enqueue(
+                int(link["notify_channel_id"]),
+                message,
+                embed=embed,
+                components=components,
+                allowed_mentions=allowed_mentions,
+                detected_at=detected_at,
+                broad_started_at=parse_broad_start(info),
+            )
+            timer.mark("enqueue")
+        # Live state is stored once per streamer; per-link rows only change on
+        # go-live, so steady-state polls write nothing here.
+        self._storage.set_streamer_states(streamer_changes)
+        self._storage.record_notifications(notifications, outbox)
+        finished_at = self._clock()
+        self._storage.set_poll_state(
+            "last_poll_at",
+            datetime.fromtimestamp(finished_at, timezone.utc).replace(tzinfo=None).isoformat(),
+        )
+        timer.mark("store")
+        duration_ms = timer.total_ms
         self._metrics.record_poll(duration_ms, len(live_ids))
+        self._metrics.record_poll_stages(timer)
         self._metrics.record_live_detected(len(live_ids))
         logger.info(
             "Poll summary: links=%s live=%s empty=%s duration_ms=%.1f",
@@ -151,42 +392,79 @@ class SoopPoller:
             empty_count,
             duration_ms,
         )
-        self._storage.set_poll_state("last_poll_at", datetime.utcnow().isoformat())
+        self._last_poll_at = finished_at
+        self._poll_token = poll_token
+
+    def _publish_transition(
+        self,
+        streamer_id: str,
+        previous: tuple[bool, str | None] | None,
+        state: tuple[bool, str | None],
+        info: dict | None,
+    ) -> None:
+        was_live, previous_broad_no = previous or (False, None)
+        is_live, broad_no = state
+        now = self._clock()
+        previous_title = self._titles.pop(streamer_id, None)
+        title = str(info.get("broadTitle") or "") if info else ""
+        if is_live:
+            self._titles[streamer_id] = title
+        if is_live and not was_live:
+            self._events.publish(WentLive(streamer_id, broad_no, now, info=info))
+        elif was_live and not is_live:
+            self._events.publish(WentOffline(streamer_id, previous_broad_no, now))
+        elif is_live and broad_no != previous_broad_no:
+            self._events.publish(
+                BroadcastRestarted(
+                    streamer_id, broad_no, now, previous_broad_no=previous_broad_no, info=info
+                )
+            )
+        elif is_live and previous_title is not None and title != previous_title:
+            self._events.publish(
+                TitleChanged(streamer_id, broad_no, now, previous_title=previous_title, title=title)
+            )
+
+    def apply_change(self, event) -> None:
+        if event.kind in {"links", "all"}:
+            self._links_dirty = True
+
+    def _refresh_links(self) -> None:
+        # Rows are only fetched when add_link, remove_link or set_template
+        # bumped the links version since the last refresh.
+        if self._links_version is not None:
+            if self._change_events:
+                if not self._links_dirty:
+                    return
+            elif self._storage.get_links_version() == self._links_version:
+                return
+        self._links_dirty = False
+        version, rows, deleted = self._storage.list_link_changes(self._links_version)
+        for link_id in deleted:
+            if self._links.pop(link_id, None) is not None:
+                self._state.discard(link_id)
+        for row in rows:
+            self._links[row["id"]] = row
+        self._links_version = version
 
     async def _get_broad_info(self, streamer_id: str) -> dict | None:
-        now = time.time()
+        now = self._clock()
         cached = self._info_cache.get(streamer_id)
         last_fetch = self._info_cache_ts.get(streamer_id, 0.0)
         if cached and now - last_fetch < self._info_cooldown:
             self._metrics.record_cache_hit()
             return cached
         self._metrics.record_cache_miss()
-        info = await self._client.fetch_broad_info(streamer_id)
+        started = time.perf_counter()
+        try:
+            info = await self._client.fetch_broad_info(streamer_id)
+        finally:
+            self._metrics.record_fetch_latency((time.perf_counter() - started) * 1000)
         if info:
             self._info_cache[streamer_id] = info
             self._info_cache_ts[streamer_id] = now
         return info
 
 
-def _thumbnail_url(client: SoopClient, info: dict | None) -> str | None:
-    if not info:
-        return None
-    return client.build_thumbnail_url(info.get("broadNo"))
-
-
-def _mention_text(mention: dict[str, str | None]) -> str | None:
-    mention_type = mention.get("type")
-    value = mention.get("value")
-    if mention_type == "everyone":
-        return "@everyone"
-    if mention_type == "role" and value:
-        return f"<@&{value}>"
-    return None
-
-
-def _watch_view(stream_url: str) -> discord.ui.View:
-    view = discord.ui.View(timeout=None)
-    view.add_item(
-        discord.ui.Button(label="Watch Stream", style=discord.ButtonStyle.link, url=stream_url)
-    )
-    return view
+def _start_order(info: dict | None) -> tuple[bool, float]:
+    started = parse_broad_start(info)
+    return started is None, started or 0.0
@@ -0,0 +1,164 @@
+"""Compact on-disk snapshot of poller state for warm restarts.
+
+Layout (little-endian), read through mmap so the flag column is copied once
+straight out of the page cache:
+
+    header   8s magic, u32 format, f64 created_at, i64 links_version
+    strings  u16 length + UTF-8 bytes: poll token
+    flags    u32 length + PollerState flag bytes (one per link id)
+    broad    u32 count, then (u32 link id, str broad_no) pairs
+    streams  u32 count, then (str id, u8 is_live, str broad_no or 0xFFFF) rows
+    info     u32 count, then (str id, f64 fetched_at, u32 length + JSON) rows
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import mmap
+import os
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from soupnotify.soop.state import PollerState
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SOUPSNAP"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<8sIdq")
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_F64 = struct.Struct("<d")
+_NONE = 0xFFFF
+
+
+@dataclass
+class PollerSnapshot:
+    created_at: float
+    links_version: int
+    # Storage poll_state token of the cycle the snapshot was taken after. It
+    # only matches the database if no poll has started since.
+    poll_token: str
+    state: PollerState
+    streamers: dict[str, tuple[bool, str | None]] = field(default_factory=dict)
+    # streamer id -> (fetched_at wall-clock time, broad info payload)
+    info_cache: dict[str, tuple[float, dict]] = field(default_factory=dict)
+
+
+def write_snapshot(path: str | Path, snapshot: PollerSnapshot) -> int:
+    """Atomically write ``snapshot`` to ``path``; return the size in bytes."""
+    path = Path(path)
+    parts: list[bytes] = [
+        _HEADER.pack(MAGIC, FORMAT_VERSION, snapshot.created_at, snapshot.links_version),
+        _pack_str(snapshot.poll_token),
+    ]
+    flags, broad_nos = snapshot.state.columns()
+    parts += [_U32.pack(len(flags)), flags, _U32.pack(len(broad_nos))]
+    for link_id, broad_no in broad_nos.items():
+        parts += [_U32.pack(link_id), _pack_str(broad_no)]
+    parts.append(_U32.pack(len(snapshot.streamers)))
+    for streamer_id, (is_live, broad_no) in snapshot.streamers.items():
+        parts += [_pack_str(streamer_id), _U8.pack(int(is_live)), _pack_str(broad_no)]
+    parts.append(_U32.pack(len(snapshot.info_cache)))
+    for streamer_id, (fetched_at, info) in snapshot.info_cache.items():
+        payload = json.dumps(info, separators=(",", ":")).encode("utf-8")
+        parts += [_pack_str(streamer_id), _F64.pack(fetched_at), _U32.pack(len(payload)), payload]
+
+    data = b"".join(parts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as handle:
+        handle.write(data)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+    return len(data)
+
+
+def read_snapshot(path: str | Path) -> PollerSnapshot | None:
+    """Load a snapshot, or None if it is missing, truncated or another format."""
+    try:
+        with open(path, "rb") as handle, mmap.mmap(
+            handle.fileno(), 0, access=mmap.ACCESS_READ
+        ) as view:
+            return _decode(view)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, struct.error, UnicodeDecodeError) as exc:
+        logger.warning("Ignoring unreadable poller snapshot %s: %s", path, exc)
+        return None
+
+
+def _decode(view: mmap.mmap) -> PollerSnapshot | None:
+    magic, version, created_at, links_version = _HEADER.unpack_from(view, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        return None
+    offset = _HEADER.size
+    poll_token, offset = _read_str(view, offset)
+    (flag_count,) = _U32.unpack_from(view, offset)
+    offset += _U32.size
+    flags = view[offset : offset + flag_count]
+    if len(flags) != flag_count:
+        raise ValueError("truncated flag column")
+    offset += flag_count
+
+    (count,) = _U32.unpack_from(view, offset)
+    offset += _U32.size
+    broad_nos: dict[int, str] = {}
+    for _ in range(count):
+        (link_id,) = _U32.unpack_from(view, offset)
+        broad_no, offset = _read_str(view, offset + _U32.size)
+        broad_nos[link_id] = broad_no
+
+    (count,) = _U32.unpack_from(view, offset)
+    offset += _U32.size
+    streamers: dict[str, tuple[bool, str | None]] = {}
+    for _ in range(count):
+        streamer_id, offset = _read_str(view, offset)
+        (is_live,) = _U8.unpack_from(view, offset)
+        broad_no, offset = _read_str(view, offset + _U8.size)
+        streamers[streamer_id] = (bool(is_live), broad_no)
+
+    (count,) = _U32.unpack_from(view, offset)
+    offset += _U32.size
+    info_cache: dict[str, tuple[float, dict]] = {}
+    for _ in range(count):
+        streamer_id, offset = _read_str(view, offset)
+        (fetched_at,) = _F64.unpack_from(view, offset)
+        (length,) = _U32.unpack_from(view, offset + _F64.size)
+        offset += _F64.size + _U32.size
+        info_cache[streamer_id] = (fetched_at, json.loads(view[offset : offset + length]))
+        offset += length
+
+    return PollerSnapshot(
+        created_at=created_at,
+        links_version=links_version,
+        poll_token=poll_token or "",
+        state=PollerState.from_columns(flags, broad_nos),
+        streamers=streamers,
+        info_cache=info_cache,
+    )
+
+
+def _pack_str(value: str | None) -> bytes:
+    if value is None:
+        return _U16.pack(_NONE)
+    encoded = value.encode("utf-8")
+    if len(encoded) >= _NONE:
+        raise ValueError("snapshot string too long")
+    return _U16.pack(len(encoded)) + encoded
+
+
+def _read_str(view: mmap.mmap, offset: int) -> tuple[str | None, int]:
+    (length,) = _U16.unpack_from(view, offset)
+    offset += _U16.size
+    if length == _NONE:
+        return None, offset
+    raw = view[offset : offset + length]
+    if len(raw) != length:
+        raise ValueError("truncated string")
+    return raw.decode("utf-8"), offset + length
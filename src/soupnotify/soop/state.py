@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+_PRESENT = 1
+_LIVE = 2
+
+
+class PollerState:
+    """Last observed live state per link, stored in columns indexed by link id.
+
+    ``guild_streamers.id`` is a small integer, so state lives in a bytearray of
+    flags plus a parallel list of broad numbers instead of per-link dict entries
+    keyed by formatted strings. Lookups during a poll allocate nothing.
+
+    The columns are sized by the largest id seen, not by the number of links.
+    On Postgres ids come from a sequence and only grow, so this costs about
+    nine bytes per id ever issued, roughly 9 MB after a million links have
+    been created; that is accepted in exchange for index-only lookups, and
+    ids are not remapped. SQLite may hand out the largest id again once its
+    row is deleted, which is why removed links must be ``discard``-ed.
+    """
+
+    __slots__ = ("_flags", "_broad_no")
+
+    def __init__(self) -> None:
+        self._flags = bytearray()
+        self._broad_no: list[str | None] = []
+
+    def __len__(self) -> int:
+        return len(self._flags) - self._flags.count(0)
+
+    def __contains__(self, link_id: int) -> bool:
+        return link_id < len(self._flags) and bool(self._flags[link_id] & _PRESENT)
+
+    def _grow(self, link_id: int) -> None:
+        extra = link_id + 1 - len(self._flags)
+        if extra > 0:
+            # Over-allocate so a stream of new links doesn't resize every time.
+            extra = max(extra, len(self._flags) // 4, 64)
+            self._flags.extend(bytes(extra))
+            self._broad_no.extend([None] * extra)
+
+    def is_live(self, link_id: int) -> bool:
+        return link_id < len(self._flags) and bool(self._flags[link_id] & _LIVE)
+
+    def broad_no(self, link_id: int) -> str | None:
+        if link_id not in self:
+            return None
+        return self._broad_no[link_id]
+
+    def update(self, link_id: int, is_live: bool, broad_no: str | None) -> None:
+        self._grow(link_id)
+        self._flags[link_id] = _PRESENT | (_LIVE if is_live else 0)
+        self._broad_no[link_id] = broad_no
+
+    def discard(self, link_id: int) -> None:
+        if link_id < len(self._flags):
+            self._flags[link_id] = 0
+            self._broad_no[link_id] = None
+
+    def columns(self) -> tuple[bytes, dict[int, str]]:
+        """Return the flag column and the non-empty broad numbers, for snapshots."""
+        broad_nos = {
+            link_id: broad_no
+            for link_id, broad_no in enumerate(self._broad_no)
+            if broad_no is not None and self._flags[link_id]
+        }
+        return bytes(self._flags), broad_nos
+
+    @classmethod
+    def from_columns(cls, flags: bytes | bytearray, broad_nos: dict[int, str]) -> PollerState:
+        state = cls()
+        state._flags = bytearray(flags)
+        state._broad_no = [None] * len(state._flags)
+        for link_id, broad_no in broad_nos.items():
+            if link_id < len(state._broad_no):
+                state._broad_no[link_id] = broad_no
+        return state
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import os
+import time
 from contextlib import contextmanager
 from pathlib import Path
 
+import pytest
 from alembic import command
 from alembic.config import Config
 
@@ -25,3 +29,72 @@ def apply_migrations(database_url: str) -> None:
     config = Config(str(Path(__file__).resolve().parents[1] / "alembic.ini"))
     with _temp_env("DATABASE_URL", database_url):
         command.upgrade(config, "head")
+
+
+class FakeDiscordServer:
+    """Stand-in Discord HTTP API serving scripted responses over a real socket."""
+
+    def __init__(self) -> None:
+        self.requests: list[dict] = []
+        self._responses: list[tuple[int, dict[str, str], dict]] = []
+        self._server: asyncio.base_events.Server | None = None
+        self.base_url = ""
+
+    def add_response(
+        self, status: int = 200, headers: dict[str, str] | None = None, body: dict | None = None
+    ) -> None:
+        self._responses.append((status, headers or {}, body if body is not None else {"id": "1"}))
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}/api/v10"
+
+    async def close(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode().split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, value = line.decode().split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+                self.requests.append(
+                    {
+                        "method": method,
+                        "path": path,
+                        "headers": headers,
+                        "json": json.loads(body) if body else None,
+                        "at": time.monotonic(),
+                    }
+                )
+                status, extra_headers, payload = (
+                    self._responses.pop(0) if self._responses else (200, {}, {"id": "1"})
+                )
+                # A 204 has no body; sending one would corrupt the next response.
+                data = b"" if status == 204 else json.dumps(payload).encode()
+                head = [f"HTTP/1.1 {status} X", "Content-Type: application/json"]
+                head.append(f"Content-Length: {len(data)}")
+                head.extend(f"{name}: {value}" for name, value in extra_headers.items())
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + data)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+@pytest.fixture
+async def discord_server():
+    server = FakeDiscordServer()
+    await server.start()
+    yield server
+    await server.close()
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from soupnotify.core.bulk import BulkImportError, BulkLink, detect_format, iter_export, parse_links
+
+
+def test_parse_links_csv_and_json():
+    csv_data = (
+        "soop_channel_id,notify_channel_id,message_template\n"
+        "streamer-1,<#111>,Live {soop_url}\n"
+        "streamer-2,,\n"
+    ).encode()
+    assert parse_links(csv_data, "csv", default_notify_channel_id="999") == [
+        BulkLink("streamer-1", "111", "Live {soop_url}"),
+        BulkLink("streamer-2", "999", None),
+    ]
+
+    json_data = json.dumps([{"soop_channel_id": "streamer-3", "notify_channel_id": "222"}])
+    assert parse_links(json_data.encode(), "json") == [BulkLink("streamer-3", "222", None)]
+    assert detect_format("links.JSON") == "json"
+    assert detect_format(None) == "csv"
+
+
+def test_parse_links_rejects_whole_file_on_bad_rows():
+    data = (
+        "soop_channel_id,notify_channel_id,message_template\n"
+        "streamer-1,111,\n"
+        "streamer-1,111,\n"
+        ",111,\n"
+        "streamer-2,general,\n"
+        "streamer-3,111,{nope}\n"
+    ).encode()
+    with pytest.raises(BulkImportError) as excinfo:
+        parse_links(data, "csv")
+    assert [error.split(":")[0] for error in excinfo.value.errors] == [
+        "row 2",
+        "row 3",
+        "row 4",
+        "row 5",
+    ]
+
+
+def test_iter_export_round_trips():
+    links = [
+        {"id": 1, "soop_channel_id": "streamer-1", "notify_channel_id": "111"},
+        {
+            "id": 2,
+            "soop_channel_id": "streamer-2",
+            "notify_channel_id": "222",
+            "message_template": "Hi, {guild}",
+        },
+    ]
+    for fmt in ("csv", "json"):
+        exported = "".join(iter_export(iter(links), fmt)).encode()
+        assert parse_links(exported, fmt) == [
+            BulkLink("streamer-1", "111", None),
+            BulkLink("streamer-2", "222", "Hi, {guild}"),
+        ]
@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from soupnotify.core.changes import ALL, ChangeEvent, ChangeListener, parse_change_payload
+from soupnotify.core.storage import Storage
+
+from tests.conftest import apply_migrations
+
+
+def test_parse_change_payload():
+    assert parse_change_payload('{"kind": "links", "guild_id": "1"}') == ChangeEvent("links", "1")
+    assert parse_change_payload("not json") == ChangeEvent(ALL)
+
+
+async def _wait_for(events, expected):
+    for _ in range(100):
+        if expected in events:
+            return
+        await asyncio.sleep(0.02)
+    raise AssertionError(f"{expected} not in {events}")
+
+
+@pytest.mark.asyncio
+async def test_change_listener_polls_sqlite_and_invalidates_cache(tmp_path):
+    db_path = tmp_path / "soop.db"
+    database_url = f"sqlite:///{db_path}"
+    apply_migrations(database_url)
+    cached = Storage(database_url, cache_settings=True)
+    other_process = Storage(database_url)
+
+    events = []
+    listener = ChangeListener(cached, database_url, poll_interval=0.05)
+    listener.subscribe(cached.apply_change)
+    listener.subscribe(events.append)
+    task = asyncio.create_task(listener.run())
+    await _wait_for(events, ChangeEvent(ALL))
+    try:
+        assert cached.get_rate_limit("guild-1") is None
+        other_process.set_rate_limit("guild-1", 5)
+        # Still served from the cache until the change is noticed.
+        assert cached.get_rate_limit("guild-1") is None
+        await _wait_for(events, ChangeEvent("settings"))
+        assert cached.get_rate_limit("guild-1") == 5
+
+        # Local writes invalidate immediately.
+        cached.set_rate_limit("guild-1", 7)
+        assert cached.get_rate_limit("guild-1") == 7
+
+        other_process.add_link("guild-1", "streamer-1", "111")
+        await _wait_for(events, ChangeEvent("links"))
+    finally:
+        task.cancel()
@@ -0,0 +1,14 @@
+from datetime import datetime, timezone
+
+from soupnotify.soop.client import parse_broad_start
+
+
+def test_parse_broad_start_treats_naive_times_as_kst():
+    started = parse_broad_start({"broadStart": "2026-02-01 21:00:00"})
+    assert started == datetime(2026, 2, 1, 12, 0, tzinfo=timezone.utc).timestamp()
+
+
+def test_parse_broad_start_handles_missing_or_bad_values():
+    assert parse_broad_start(None) is None
+    assert parse_broad_start({}) is None
+    assert parse_broad_start({"broadStart": "not a date"}) is None
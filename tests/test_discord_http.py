@@ -0,0 +1,173 @@
+import asyncio
+import time
+
+import pytest
+
+from soupnotify.core.discord_http import (
+    DiscordForbiddenError,
+    DiscordRestClient,
+    RateLimitTracker,
+)
+
+
+@pytest.mark.asyncio
+async def test_rest_client_waits_out_429_then_succeeds(discord_server):
+    discord_server.add_response(
+        429,
+        {"X-RateLimit-Bucket": "abc", "X-RateLimit-Scope": "user"},
+        {"message": "You are being rate limited.", "retry_after": 0.3, "global": False},
+    )
+    discord_server.add_response(200, {"X-RateLimit-Bucket": "abc"}, {"id": "42"})
+    client = DiscordRestClient("token", discord_server.base_url)
+    try:
+        message = await client.create_message(123, {"content": "hello"})
+    finally:
+        await client.aclose()
+
+    assert message == {"id": "42"}
+    assert len(discord_server.requests) == 2
+    first, second = discord_server.requests
+    assert first["path"] == "/api/v10/channels/123/messages"
+    assert first["headers"]["authorization"] == "Bot token"
+    assert second["json"] == {"content": "hello"}
+    assert second["at"] - first["at"] >= 0.29
+
+
+@pytest.mark.asyncio
+async def test_rest_client_sends_until_bucket_empty_then_pauses_until_reset(discord_server):
+    bucket = {"X-RateLimit-Bucket": "abc", "X-RateLimit-Limit": "2"}
+    discord_server.add_response(
+        200, {**bucket, "X-RateLimit-Remaining": "1", "X-RateLimit-Reset-After": "0.4"}
+    )
+    discord_server.add_response(
+        200, {**bucket, "X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "0.3"}
+    )
+    discord_server.add_response(
+        200, {**bucket, "X-RateLimit-Remaining": "1", "X-RateLimit-Reset-After": "1"}
+    )
+    client = DiscordRestClient("token", discord_server.base_url)
+    try:
+        for _ in range(3):
+            await client.create_message(123, {"content": "hi"})
+        # Another channel has its own bucket and must not wait.
+        started = time.monotonic()
+        await client.create_message(456, {"content": "hi"})
+        other_channel_wait = time.monotonic() - started
+    finally:
+        await client.aclose()
+
+    first, second, third, _ = (request["at"] for request in discord_server.requests)
+    assert second - first < 0.2
+    assert third - second >= 0.29
+    assert other_channel_wait < 0.2
+
+
+@pytest.mark.asyncio
+async def test_rest_client_global_429_blocks_every_route(discord_server):
+    discord_server.add_response(
+        429, {"X-RateLimit-Global": "true"}, {"message": "global", "retry_after": 0.3}
+    )
+    client = DiscordRestClient("token", discord_server.base_url)
+    try:
+        await client.create_message(123, {"content": "hi"})
+        assert client.tracker.delay_for("POST /channels/{channel_id}/messages", "999") == 0
+    finally:
+        await client.aclose()
+    first, second = (request["at"] for request in discord_server.requests)
+    assert second - first >= 0.29
+
+
+@pytest.mark.asyncio
+async def test_rest_client_raises_forbidden_without_retry(discord_server):
+    discord_server.add_response(403, {}, {"message": "Missing Access", "code": 50001})
+    client = DiscordRestClient("token", discord_server.base_url)
+    try:
+        with pytest.raises(DiscordForbiddenError) as excinfo:
+            await client.create_message(123, {"content": "hi"})
+    finally:
+        await client.aclose()
+    assert excinfo.value.code == 50001
+    assert len(discord_server.requests) == 1
+
+
+def test_rate_limit_tracker_reserves_slots_and_shares_buckets():
+    now = [100.0]
+    tracker = RateLimitTracker(clock=lambda: now[0])
+    headers = {
+        "x-ratelimit-bucket": "shared",
+        "x-ratelimit-limit": "5",
+        "x-ratelimit-remaining": "0",
+        "x-ratelimit-reset-after": "2.5",
+    }
+    tracker.update("POST /a", "1", headers)
+    tracker.update("POST /b", "1", {"x-ratelimit-bucket": "shared"})
+    assert tracker.delay_for("POST /a", "1") == 2.5
+    assert tracker.delay_for("POST /b", "1") == 2.5
+    assert tracker.delay_for("POST /a", "2") == 0
+    now[0] += 3
+    assert tracker.delay_for("POST /a", "1") == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_tracker_keeps_concurrent_reservations():
+    now = [100.0]
+    tracker = RateLimitTracker(clock=lambda: now[0])
+    headers = {"x-ratelimit-limit": "5", "x-ratelimit-reset-after": "5"}
+    tracker.update("POST /a", "1", {**headers, "x-ratelimit-remaining": "4"})
+    for _ in range(4):
+        await tracker.acquire("POST /a", "1")
+    assert tracker.delay_for("POST /a", "1") == 5
+    # A late response to an earlier request must not hand the slots back.
+    tracker.update("POST /a", "1", {**headers, "x-ratelimit-remaining": "3"})
+    assert tracker.delay_for("POST /a", "1") == 5
+
+    # A new window takes the header value.
+    now[0] += 6
+    tracker.update("POST /a", "1", {**headers, "x-ratelimit-remaining": "4"})
+    assert tracker.delay_for("POST /a", "1") == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_tracker_refill_is_shared_by_concurrent_senders():
+    now = [100.0]
+    tracker = RateLimitTracker(clock=lambda: now[0])
+    tracker.update(
+        "POST /a",
+        "1",
+        {
+            "x-ratelimit-limit": "3",
+            "x-ratelimit-remaining": "0",
+            "x-ratelimit-reset-after": "2",
+        },
+    )
+    # The window passes with no response to refresh the bucket.
+    now[0] += 3
+    senders = [asyncio.create_task(tracker.acquire("POST /a", "1")) for _ in range(8)]
+    for _ in range(3):
+        await asyncio.sleep(0)
+    try:
+        assert sum(sender.done() for sender in senders) == 3
+        assert tracker.delay_for("POST /a", "1") == 2
+    finally:
+        for sender in senders:
+            sender.cancel()
+        await asyncio.gather(*senders, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_webhook_execute_skips_bot_auth_and_global_limit(discord_server):
+    discord_server.add_response(200, {}, {"id": "900", "token": "secret"})
+    discord_server.add_response(204, {}, {})
+    client = DiscordRestClient("token", discord_server.base_url)
+    try:
+        webhook = await client.create_webhook(123, "SoupNotify")
+        client.tracker.block("POST /channels/{channel_id}/messages", "123", 5, is_global=True)
+        await client.execute_webhook(webhook["id"], webhook["token"], {"content": "hi"})
+    finally:
+        await client.aclose()
+
+    create, execute = discord_server.requests
+    assert create["headers"]["authorization"] == "Bot token"
+    assert create["json"] == {"name": "SoupNotify"}
+    assert execute["path"] == "/api/v10/webhooks/900/secret"
+    assert "authorization" not in execute["headers"]
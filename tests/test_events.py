@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+from soupnotify.core.events import (
+    BroadcastRestarted,
+    EventBus,
+    TitleChanged,
+    WentLive,
+    WentOffline,
+)
+from soupnotify.core.metrics import BotMetrics
+from soupnotify.core.storage import Storage
+from soupnotify.soop.poller import SoopPoller
+
+from tests.conftest import apply_migrations
+from tests.test_outbox import RecordingNotifier
+from tests.test_poller import FakeBot, FakeChannel, FakeClient
+
+
+@pytest.mark.asyncio
+async def test_event_bus_bounds_each_subscriber_queue():
+    metrics = BotMetrics()
+    bus = EventBus(metrics)
+    fast: list = []
+    slow: list = []
+    release = asyncio.Event()
+
+    async def slow_handler(event):
+        await release.wait()
+        slow.append(event)
+
+    bus.subscribe(fast.append, name="fast")
+    bus.subscribe(slow_handler, WentLive, maxsize=1, name="slow")
+    task = asyncio.create_task(bus.run())
+    await asyncio.sleep(0)
+
+    bus.publish(WentLive("streamer-1", "1", 0.0))
+    await asyncio.sleep(0)
+    # slow is busy with the first event; its queue holds one more.
+    bus.publish(WentLive("streamer-2", "2", 0.0))
+    bus.publish(WentLive("streamer-3", "3", 0.0))
+    bus.publish(WentOffline("streamer-1", "1", 0.0))
+    release.set()
+    await bus.join()
+    task.cancel()
+
+    assert [event.soop_channel_id for event in fast] == [
+        "streamer-1",
+        "streamer-2",
+        "streamer-3",
+        "streamer-1",
+    ]
+    assert [event.soop_channel_id for event in slow] == ["streamer-1", "streamer-2"]
+    assert metrics.events_dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_poller_publishes_stream_transitions(tmp_path):
+    db_path = tmp_path / "soop.db"
+    database_url = f"sqlite:///{db_path}"
+    apply_migrations(database_url)
+    storage = Storage(database_url)
+    storage.add_link("1", "streamer-1", "123")
+    bus = EventBus()
+    seen: list = []
+    bus.subscribe(seen.append)
+    client = FakeClient({"streamer-1"}, broad_no="100")
+    poller = SoopPoller(
+        client,
+        storage,
+        RecordingNotifier(),
+        "https://play.sooplive.co.kr",
+        BotMetrics(),
+        interval_seconds=1,
+        info_cooldown_seconds=60,
+        events=bus,
+    )
+    bot = FakeBot(FakeChannel())
+
+    async def poll():
+        poller._info_cache.clear()
+        await poller._poll_once(bot)
+
+    await poll()
+    await poll()
+    client.broad_no = "101"
+    await poll()
+    original = client.fetch_broad_info
+
+    async def retitled(streamer_id):
+        info = await original(streamer_id)
+        return {**info, "broadTitle": "New title"} if info else info
+
+    client.fetch_broad_info = retitled
+    await poll()
+    client.live_ids = set()
+    await poll()
+
+    task = asyncio.create_task(bus.run())
+    await bus.join()
+    task.cancel()
+    assert [type(event) for event in seen] == [
+        WentLive,
+        BroadcastRestarted,
+        TitleChanged,
+        WentOffline,
+    ]
+    assert seen[1].previous_broad_no == "100"
+    assert (seen[2].previous_title, seen[2].title) == ("Test title", "New title")
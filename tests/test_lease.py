@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from soupnotify.core.lease import LeaseKeeper
+from soupnotify.core.storage import Storage
+
+from tests.conftest import apply_migrations
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lease_keeper_standby_takes_over(tmp_path):
+    db_path = tmp_path / "soop.db"
+    database_url = f"sqlite:///{db_path}"
+    apply_migrations(database_url)
+    storage = Storage(database_url)
+    clock = FakeClock()
+    leader = LeaseKeeper(storage, "poller", ttl_seconds=30, owner="a", clock=clock)
+    standby = LeaseKeeper(storage, "poller", ttl_seconds=30, owner="b", clock=clock)
+
+    assert leader.renew() is True
+    assert standby.renew() is False
+    assert leader.is_leader and not standby.is_leader
+
+    # Without a successful renewal the leader stops acting on a stale lease.
+    clock.now += 31
+    assert not leader.is_leader
+
+    # Simulate the leader dying: its row expires and the standby claims it.
+    storage.acquire_lease("poller", "a", -1)
+    assert standby.renew() is True
+    assert standby.is_leader
+    assert leader.renew() is False
+
+
+@pytest.mark.asyncio
+async def test_lease_keeper_releases_on_shutdown(tmp_path):
+    db_path = tmp_path / "soop.db"
+    database_url = f"sqlite:///{db_path}"
+    apply_migrations(database_url)
+    storage = Storage(database_url)
+    keeper = LeaseKeeper(storage, "poller", ttl_seconds=30, owner="a")
+
+    task = asyncio.create_task(keeper.run())
+    await asyncio.wait_for(keeper.wait_until_leader(), timeout=1)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert storage.get_lease("poller") is None
@@ -0,0 +1,60 @@
+from soupnotify.core.metrics import (
+    RECENT_POLL_CYCLES,
+    BotMetrics,
+    LatencyHistogram,
+    StageTimer,
+)
+
+
+def test_latency_histogram_buckets_and_percentiles():
+    histogram = LatencyHistogram(buckets=(10, 100, 1000))
+    assert histogram.percentile(50) is None
+    assert histogram.summary() == "n/a"
+
+    for value in (5, 50, 50, 500, 5000):
+        histogram.observe(value)
+
+    assert histogram.bucket_counts == [1, 2, 1, 1]
+    assert histogram.count == 5
+    assert histogram.total == 5605
+    assert histogram.percentile(50) == 50
+    assert histogram.percentile(99) == 5000
+    assert histogram.summary().startswith("p50=50ms")
+
+
+def test_bot_metrics_latency_histograms_are_independent():
+    metrics = BotMetrics()
+    metrics.record_queue_wait(120)
+    metrics.record_send_duration(80)
+    metrics.record_delivery_latency(200)
+
+    other = BotMetrics()
+    assert other.queue_wait.count == 0
+    assert metrics.queue_wait.count == 1
+    assert metrics.send_duration.percentile(50) == 80
+    assert metrics.delivery_latency.percentile(50) == 200
+
+
+def test_poll_stage_timings_are_kept_per_cycle(monkeypatch):
+    clock = iter([10.0, 10.002, 10.5, 10.503, 10.504, 10.51])
+    monkeypatch.setattr("soupnotify.core.metrics.time.perf_counter", lambda: next(clock))
+    timer = StageTimer()
+    timer.mark("links")
+    timer.mark("fetch")
+    timer.mark("render")
+    timer.mark("render")
+    timer.mark("store")
+    monkeypatch.undo()
+
+    metrics = BotMetrics()
+    metrics.record_poll_stages(timer)
+    assert round(timer.total_ms) == 510
+    assert round(metrics.poll_stages["fetch"].percentile(50)) == 498
+    assert round(metrics.recent_polls[-1].stages["render"]) == 4
+
+    for _ in range(RECENT_POLL_CYCLES + 5):
+        metrics.record_poll_stages(StageTimer())
+    assert len(metrics.recent_polls) == RECENT_POLL_CYCLES
+    table = metrics.poll_cycle_table(3)
+    assert len(table) == 4
+    assert table[0].split()[:3] == ["time", "total", "links"]
@@ -0,0 +1,184 @@
+import asyncio
+
+import pytest
+
+from soupnotify.core.discord_http import DiscordRestClient
+from soupnotify.core.metrics import BotMetrics
+from soupnotify.core.notifier import Notifier
+from soupnotify.core.storage import Storage
+
+from tests.conftest import apply_migrations
+
+CHANNEL_ID = 123
+
+
+class ColdCacheBot:
+    """A bot whose gateway cache has not loaded any channels yet."""
+
+    def get_channel(self, channel_id):
+        return None
+
+
+@pytest.fixture
+def storage(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'soop.db'}"
+    apply_migrations(database_url)
+    storage = Storage(database_url)
+    storage.add_link("1", "streamer-1", str(CHANNEL_ID))
+    storage.add_link("1", "streamer-2", "456")
+    return storage
+
+
+async def _wait_for(predicate):
+    for _ in range(200):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+@pytest.fixture
+async def notifier_factory(discord_server, storage):
+    rest = DiscordRestClient("token", discord_server.base_url)
+    notifiers = []
+
+    async def make(delivery_mode="bot"):
+        notifier = Notifier(
+            ColdCacheBot(),
+            rate_per_second=100,
+            burst_rate_per_second=100,
+            burst_threshold=10,
+            metrics=BotMetrics(),
+            storage=storage,
+            rest=rest,
+            delivery_mode=delivery_mode,
+        )
+        await notifier.start()
+        notifiers.append(notifier)
+        return notifier
+
+    yield make
+    for notifier in notifiers:
+        for task in notifier._tasks:
+            task.cancel()
+    await rest.aclose()
+
+
+def _handled(notifier):
+    metrics = notifier._metrics
+    return metrics.messages_sent + metrics.messages_failed + metrics.messages_skipped
+
+
+@pytest.mark.asyncio
+async def test_rest_send_does_not_need_the_gateway_cache(discord_server, storage, notifier_factory):
+    notifier = await notifier_factory()
+    await notifier.enqueue(CHANNEL_ID, "live")
+    await _wait_for(lambda: _handled(notifier) == 1)
+
+    assert notifier._metrics.messages_sent == 1
+    assert [request["path"] for request in discord_server.requests] == [
+        f"/api/v10/channels/{CHANNEL_ID}/messages"
+    ]
+    assert storage.list_flagged_notify_channels() == {}
+
+
+@pytest.mark.asyncio
+async def test_flagged_channels_are_skipped_up_front(discord_server, storage, notifier_factory):
+    storage.flag_notify_channels([str(CHANNEL_ID)], "missing permissions")
+    notifier = await notifier_factory()
+    assert notifier.is_unreachable(CHANNEL_ID)
+
+    await notifier.enqueue(CHANNEL_ID, "live")
+    await _wait_for(lambda: _handled(notifier) == 1)
+    assert notifier._metrics.messages_skipped == 1
+    assert discord_server.requests == []
+
+
+@pytest.mark.asyncio
+async def test_forbidden_and_missing_channels_are_flagged(
+    discord_server, storage, notifier_factory
+):
+    discord_server.add_response(403, {}, {"message": "Missing Access", "code": 50001})
+    discord_server.add_response(404, {}, {"message": "Unknown Channel", "code": 10003})
+    notifier = await notifier_factory()
+    await notifier.enqueue(CHANNEL_ID, "live")
+    await _wait_for(lambda: _handled(notifier) == 1)
+    await notifier.enqueue(456, "live")
+    await _wait_for(lambda: _handled(notifier) == 2)
+
+    # Neither is retried; both links are flagged with the reason.
+    assert len(discord_server.requests) == 2
+    assert storage.list_flagged_notify_channels() == {
+        str(CHANNEL_ID): "missing permissions",
+        "456": "not found",
+    }
+
+    notifier.mark_reachable([CHANNEL_ID, 456])
+    assert not notifier.is_unreachable(CHANNEL_ID)
+    assert storage.list_flagged_notify_channels() == {}
+    await notifier.enqueue(CHANNEL_ID, "live again")
+    await _wait_for(lambda: _handled(notifier) == 3)
+    assert notifier._metrics.messages_sent == 1
+
+
+@pytest.mark.asyncio
+async def test_webhook_is_created_once_and_stored(discord_server, storage, notifier_factory):
+    discord_server.add_response(200, {}, {"id": "900", "token": "secret"})
+    discord_server.add_response(204, {}, {})
+    discord_server.add_response(204, {}, {})
+    notifier = await notifier_factory("webhook")
+    for count in (1, 2):
+        await notifier.enqueue(CHANNEL_ID, "live")
+        await _wait_for(lambda count=count: _handled(notifier) == count)
+
+    assert [request["path"] for request in discord_server.requests] == [
+        f"/api/v10/channels/{CHANNEL_ID}/webhooks",
+        "/api/v10/webhooks/900/secret",
+        "/api/v10/webhooks/900/secret",
+    ]
+    assert storage.get_channel_webhook(str(CHANNEL_ID)) == {"id": "900", "token": "secret"}
+
+
+@pytest.mark.asyncio
+async def test_forbidden_webhook_creation_falls_back_to_bot_send(
+    discord_server, storage, notifier_factory
+):
+    discord_server.add_response(403, {}, {"message": "Missing Permissions", "code": 50013})
+    notifier = await notifier_factory("webhook")
+    for count in (1, 2):
+        await notifier.enqueue(CHANNEL_ID, "live")
+        await _wait_for(lambda count=count: _handled(notifier) == count)
+
+    # The refusal is remembered, so the second message goes straight to the bot.
+    assert [request["path"] for request in discord_server.requests] == [
+        f"/api/v10/channels/{CHANNEL_ID}/webhooks",
+        f"/api/v10/channels/{CHANNEL_ID}/messages",
+        f"/api/v10/channels/{CHANNEL_ID}/messages",
+    ]
+    assert notifier._metrics.messages_sent == 2
+    assert storage.get_channel_webhook(str(CHANNEL_ID)) is None
+    assert not notifier.is_unreachable(CHANNEL_ID)
+
+
+@pytest.mark.asyncio
+async def test_deleted_webhook_is_recreated(discord_server, storage, notifier_factory):
+    storage.set_channel_webhook(str(CHANNEL_ID), "900", "old")
+    discord_server.add_response(404, {}, {"message": "Unknown Webhook", "code": 10015})
+    discord_server.add_response(200, {}, {"id": "1"})
+    discord_server.add_response(200, {}, {"id": "901", "token": "new"})
+    discord_server.add_response(204, {}, {})
+    notifier = await notifier_factory("webhook")
+    for count in (1, 2):
+        await notifier.enqueue(CHANNEL_ID, "live")
+        await _wait_for(lambda count=count: _handled(notifier) == count)
+
+    assert [request["path"] for request in discord_server.requests] == [
+        "/api/v10/webhooks/900/old",
+        f"/api/v10/channels/{CHANNEL_ID}/messages",
+        f"/api/v10/channels/{CHANNEL_ID}/webhooks",
+        "/api/v10/webhooks/901/new",
+    ]
+    assert notifier._metrics.messages_sent == 2
+    assert storage.get_channel_webhook(str(CHANNEL_ID)) == {"id": "901", "token": "new"}
+    # A missing webhook is not a missing channel.
+    assert not notifier.is_unreachable(CHANNEL_ID)
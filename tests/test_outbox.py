@@ -0,0 +1,173 @@
+import asyncio
+import time
+
+import pytest
+
+from soupnotify.core.config import _parse_poller_mode
+from soupnotify.core.metrics import BotMetrics
+from soupnotify.core.notifier import NotifyMessage, _message_payload
+from soupnotify.core.storage import Storage
+from soupnotify.soop.message import LiveMessageBuilder
+from soupnotify.soop.outbox import MAX_OUTBOX_AGE_SECONDS, OutboxConsumer
+from soupnotify.soop.poller import SoopPoller
+
+from tests.conftest import apply_migrations
+from tests.test_poller import FakeBot, FakeChannel, FakeClient
+
+
+class RecordingNotifier:
+    def __init__(self):
+        self.sent = []
+
+    async def enqueue(self, channel_id, content, **kwargs):
+        self.sent.append((channel_id, content))
+
+
+@pytest.mark.asyncio
+async def test_standalone_poller_queues_and_bot_delivers(tmp_path):
+    db_path = tmp_path / "soop.db"
+    database_url = f"sqlite:///{db_path}"
+    apply_migrations(database_url)
+    storage = Storage(database_url)
+    storage.add_link("1", "streamer-1", "123", "{soop_channel_id} live in {guild}")
+    storage.add_link("1", "streamer-2", "123", "{soop_channel_id} live in {guild}")
+    client = FakeClient({"streamer-1", "streamer-2"})
+
+    poller = SoopPoller(
+        client,
+        storage,
+        None,
+        "https://play.sooplive.co.kr",
+        BotMetrics(),
+        interval_seconds=1,
+        info_cooldown_seconds=60,
+    )
+    await poller._poll_once(None)
+    await poller._poll_once(None)
+    queued = storage.claim_outbox()
+    assert sorted(row["soop_channel_id"] for row in queued) == ["streamer-1", "streamer-2"]
+    assert queued[0]["info"]["broadNo"] == "123"
+    assert storage.claim_outbox() == []
+    # Put them back for the consumer.
+    storage.record_notifications([], queued)
+    assert storage.get_live_status("1")["streamer-1"]["last_notified_at"]
+
+    # Unlinked after going live: nothing to deliver.
+    storage.remove_link("1", "streamer-2")
+    notifier = RecordingNotifier()
+    consumer = OutboxConsumer(
+        storage,
+        LiveMessageBuilder(storage, client, "https://play.sooplive.co.kr"),
+        notifier,
+        FakeBot(FakeChannel()),
+    )
+    assert await consumer.drain() == 1
+    assert notifier.sent == [(123, "streamer-1 live in TestGuild")]
+    assert storage.claim_outbox() == []
+
+
+@pytest.mark.asyncio
+async def test_outbox_consumer_drops_stale_go_lives(tmp_path):
+    db_path = tmp_path / "soop.db"
+    database_url = f"sqlite:///{db_path}"
+    apply_migrations(database_url)
+    storage = Storage(database_url)
+    storage.add_link("1", "streamer-1", "123")
+    storage.record_notifications(
+        [("1", "streamer-1", None)],
+        [
+            {
+                "guild_id": "1",
+                "soop_channel_id": "streamer-1",
+                "info": None,
+                "detected_at": time.time() - MAX_OUTBOX_AGE_SECONDS - 1,
+            }
+        ],
+    )
+    notifier = RecordingNotifier()
+    consumer = OutboxConsumer(
+        storage,
+        LiveMessageBuilder(storage, FakeClient(set()), "https://play.sooplive.co.kr"),
+        notifier,
+        None,
+    )
+    assert await consumer.drain() == 0
+    assert notifier.sent == []
+    assert storage.claim_outbox() == []
+
+
+def test_messages_allow_only_the_configured_mention(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'soop.db'}"
+    apply_migrations(database_url)
+    storage = Storage(database_url)
+    storage.add_link("1", "streamer-1", "123", "{title}")
+    link = storage.get_link("1", "streamer-1")
+    builder = LiveMessageBuilder(storage, FakeClient(set()), "https://play.sooplive.co.kr")
+    info = {"broadTitle": "@everyone <@&123456789012345678>", "broadNo": "1"}
+
+    content, embed, components, allowed = builder.build(link, info, "Guild")
+    payload = _message_payload(NotifyMessage(123, content, embed, components, allowed))
+    assert payload["allowed_mentions"] == {"parse": []}
+    assert "@everyone" not in payload["content"]
+
+    storage.set_mention("1", "role", "42")
+    content, embed, components, allowed = builder.build(link, info, "Guild")
+    assert content.startswith("<@&42> ")
+    assert allowed == {"parse": [], "roles": ["42"]}
+    # Messages queued without mention settings still ping nobody.
+    assert _message_payload(NotifyMessage(123, "hi", None, None))["allowed_mentions"] == {
+        "parse": []
+    }
+
+
+@pytest.mark.asyncio
+async def test_concurrent_consumers_deliver_each_go_live_once(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'soop.db'}"
+    apply_migrations(database_url)
+    storage = Storage(database_url)
+    streamers = [f"streamer-{index}" for index in range(7)]
+    for streamer_id in streamers:
+        storage.add_link("1", streamer_id, "123", "{soop_channel_id}")
+    storage.record_notifications(
+        [],
+        [
+            {
+                "guild_id": "1",
+                "soop_channel_id": streamer_id,
+                "info": None,
+                "detected_at": time.time(),
+            }
+            for streamer_id in streamers
+        ],
+    )
+
+    class YieldingNotifier(RecordingNotifier):
+        async def enqueue(self, channel_id, content, **kwargs):
+            await asyncio.sleep(0)
+            await super().enqueue(channel_id, content, **kwargs)
+
+    client = FakeClient(set())
+    notifiers = [YieldingNotifier(), YieldingNotifier()]
+    consumers = [
+        OutboxConsumer(
+            storage,
+            LiveMessageBuilder(storage, client, "https://play.sooplive.co.kr"),
+            notifier,
+            FakeBot(FakeChannel()),
+            batch_size=2,
+        )
+        for notifier in notifiers
+    ]
+    delivered = await asyncio.gather(*(consumer.drain() for consumer in consumers))
+    assert sum(delivered) == len(streamers)
+    assert all(delivered)
+    sent = [content for notifier in notifiers for _, content in notifier.sent]
+    assert sorted(sent) == sorted(streamers)
+    assert storage.claim_outbox() == []
+
+
+def test_unknown_poller_mode_is_rejected():
+    assert _parse_poller_mode(None) == "embedded"
+    assert _parse_poller_mode(" External ") == "external"
+    with pytest.raises(ValueError):
+        _parse_poller_mode("extrenal")
@@ -0,0 +1,121 @@
+import pytest
+
+from soupnotify.core.metrics import BotMetrics
+from soupnotify.core.rate_limit import SharedGuildRateLimiter
+from soupnotify.core.storage import Storage
+from soupnotify.soop.partition import HashRing, PartitionCoordinator, partition_for
+from soupnotify.soop.poller import SoopPoller
+
+from tests.conftest import apply_migrations
+from tests.test_poller import FakeBot, FakeChannel, FakeClient
+
+
+class RecordingNotifier:
+    def __init__(self):
+        self.messages = []
+
+    async def enqueue(self, channel_id, content, **kwargs):
+        self.messages.append(content)
+
+
+def test_hash_ring_moves_only_the_new_members_share():
+    keys = [str(index) for index in range(256)]
+    before = HashRing(["a", "b", "c"])
+    after = HashRing(["a", "b", "c", "d"])
+    moved = [key for key in keys if before.owner(key) != after.owner(key)]
+    assert moved
+    assert all(after.owner(key) == "d" for key in moved)
+    assert partition_for("streamer-1", 64) == partition_for("streamer-1", 64)
+
+
+def test_partitions_hand_over_between_cycles(tmp_path):
+    db_path = tmp_path / "soop.db"
+    database_url = f"sqlite:///{db_path}"
+    apply_migrations(database_url)
+    storage = Storage(database_url)
+    first = PartitionCoordinator(storage, 16, owner="a")
+    second = PartitionCoordinator(storage, 16, owner="b")
+
+    assert first.rebalance() is True
+    assert first.held == frozenset(range(16))
+
+    # The joiner waits until the current owner lets go of its share.
+    assert second.rebalance() is False
+    assert second.held == frozenset()
+    assert first.rebalance() is True
+    assert second.rebalance() is True
+    assert first.held and second.held
+    assert first.held | second.held == frozenset(range(16))
+    assert not first.held & second.held
+
+    second.leave()
+    assert first.rebalance() is True
+    assert first.held == frozenset(range(16))
+
+
+@pytest.mark.asyncio
+async def test_partitioned_pollers_notify_each_go_live_once(tmp_path):
+    db_path = tmp_path / "soop.db"
+    database_url = f"sqlite:///{db_path}"
+    apply_migrations(database_url)
+    storage = Storage(database_url)
+    streamers = [f"streamer-{index}" for index in range(20)]
+    for streamer_id in streamers:
+        storage.add_link("1", streamer_id, "123", "{soop_channel_id}")
+
+    bot = FakeBot(FakeChannel())
+    client = FakeClient(streamers[:10])
+    notifier = RecordingNotifier()
+    workers = []
+    for owner in ("a", "b"):
+        coordinator = PartitionCoordinator(storage, 8, owner=owner)
+        poller = SoopPoller(
+            client,
+            storage,
+            notifier,
+            "https://play.sooplive.co.kr",
+            BotMetrics(),
+            interval_seconds=1,
+            info_cooldown_seconds=1,
+            partitions=coordinator,
+        )
+        workers.append((coordinator, poller))
+
+    async def cycle(coordinator, poller):
+        # What SoopPoller.run does between sleeps.
+        if coordinator.rebalance():
+            poller._load_state()
+        poller._info_cache.clear()
+        await poller._poll_once(bot)
+
+    (first, first_poller), (second, second_poller) = workers
+    await cycle(first, first_poller)
+    assert sorted(notifier.messages) == sorted(streamers[:10])
+
+    # The second worker joins and more streamers go live mid-handover.
+    await cycle(second, second_poller)
+    client.live_ids = set(streamers)
+    for _ in range(3):
+        await cycle(first, first_poller)
+        await cycle(second, second_poller)
+
+    assert first.held and second.held
+    assert sorted(notifier.messages) == sorted(streamers)
+
+
+def test_shared_rate_limit_spans_workers(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'soop.db'}"
+    apply_migrations(database_url)
+    storage = Storage(database_url)
+    now = [600.0]
+    workers = [SharedGuildRateLimiter(storage, clock=lambda: now[0]) for _ in range(2)]
+
+    assert workers[0].allow("1", 3)
+    assert workers[1].allow("1", 3)
+    assert workers[0].allow("1", 3)
+    assert not workers[1].allow("1", 3)
+    assert workers[1].allow("2", 3)
+    assert workers[1].allow("1", None)
+
+    now[0] += 60
+    assert workers[1].allow("1", 3)
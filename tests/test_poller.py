@@ -1,6 +1,9 @@
+import asyncio
+from datetime import datetime, timezone
+
 import pytest
 
-from soupnotify.core.metrics import BotMetrics
+from soupnotify.core.metrics import POLL_STAGES, BotMetrics
 from soupnotify.core.storage import Storage
 from soupnotify.soop.poller import SoopPoller
 
@@ -16,6 +19,8 @@ class FakeClient:
         return self.live_ids
 
     async def fetch_broad_info(self, streamer_id):
+        if streamer_id not in self.live_ids:
+            return None
         return {
             "broadTitle": "Test title",
             "categoryName": "Test",
@@ -23,6 +28,9 @@ class FakeClient:
             "broadNo": self.broad_no,
         }
 
+    def build_thumbnail_url(self, broad_no):
+        return f"https://liveimg.sooplive.co.kr/h/{broad_no}.webp" if broad_no else None
+
 
 class FakeChannel:
     def __init__(self):
@@ -55,7 +63,7 @@ async def test_poller_sends_only_on_live_transition(tmp_path):
     apply_migrations(database_url)
     storage = Storage(database_url)
     storage.add_link(
-        "guild-1",
+        "1",
         "streamer-1",
         "123",
         "Custom {soop_channel_id} in {guild} at {notify_channel} {soop_url}",
@@ -69,7 +77,16 @@ async def test_poller_sends_only_on_live_transition(tmp_path):
             self.messages = []
             self.embeds = []
 
-        async def enqueue(self, channel_id: int, content: str | None, embed=None, view=None):
+        async def enqueue(
+            self,
+            channel_id: int,
+            content: str | None,
+            embed=None,
+            components=None,
+            detected_at=None,
+            broad_started_at=None,
+            allowed_mentions=None,
+        ):
             if channel_id == 123:
                 self.messages.append(content)
                 self.embeds.append(embed)
@@ -100,6 +117,8 @@ async def test_poller_sends_only_on_live_transition(tmp_path):
     assert len(notifier.messages) == 1
 
     client.live_ids = set()
+    # Expire the info cache as if the cooldown had elapsed.
+    poller._info_cache.clear()
     await poller._poll_once(bot)
     assert len(notifier.messages) == 1
 
@@ -107,3 +126,152 @@ async def test_poller_sends_only_on_live_transition(tmp_path):
     client.broad_no = "124"
     await poller._poll_once(bot)
     assert len(notifier.messages) == 2
+
+
+@pytest.mark.asyncio
+async def test_poller_stores_live_state_per_streamer(tmp_path):
+    db_path = tmp_path / "soop.db"
+    database_url = f"sqlite:///{db_path}"
+    apply_migrations(database_url)
+    storage = Storage(database_url)
+    storage.add_link("1", "streamer-1", "123")
+    storage.add_link("2", "streamer-1", "123")
+
+    class FakeNotifier:
+        def __init__(self):
+            self.messages = []
+
+        async def enqueue(self, channel_id, content, **kwargs):
+            self.messages.append(content)
+
+    def make_poller(notifier):
+        return SoopPoller(
+            FakeClient({"streamer-1"}),
+            storage,
+            notifier,
+            "https://play.sooplive.co.kr",
+            BotMetrics(),
+            interval_seconds=1,
+            info_cooldown_seconds=60,
+        )
+
+    notifier = FakeNotifier()
+    await make_poller(notifier)._poll_once(FakeBot(FakeChannel()))
+    assert len(notifier.messages) == 2
+    assert storage.load_streamer_states() == {"streamer-1": (True, "123")}
+    for guild_id in ("1", "2"):
+        live = storage.get_live_status(guild_id)
+        assert set(live) == {"streamer-1"}
+        assert live["streamer-1"]["last_notified_at"]
+
+    # A restarted poller picks up the stored state and does not notify again,
+    # while a link added during the broadcast still gets its notification.
+    storage.add_link("3", "streamer-1", "123")
+    restarted = FakeNotifier()
+    await make_poller(restarted)._poll_once(FakeBot(FakeChannel()))
+    assert len(restarted.messages) == 1
+
+
+@pytest.mark.asyncio
+async def test_poller_refreshes_links_only_after_changes(tmp_path):
+    db_path = tmp_path / "soop.db"
+    database_url = f"sqlite:///{db_path}"
+    apply_migrations(database_url)
+    storage = Storage(database_url)
+    storage.add_link("1", "streamer-1", "123")
+
+    class FakeNotifier:
+        async def enqueue(self, channel_id, content, **kwargs):
+            return None
+
+    poller = SoopPoller(
+        FakeClient(set()),
+        storage,
+        FakeNotifier(),
+        "https://play.sooplive.co.kr",
+        BotMetrics(),
+        interval_seconds=1,
+        info_cooldown_seconds=60,
+    )
+    calls = []
+    list_link_changes = storage.list_link_changes
+
+    def tracking_list_link_changes(since):
+        calls.append(since)
+        return list_link_changes(since)
+
+    storage.list_link_changes = tracking_list_link_changes
+    bot = FakeBot(FakeChannel())
+
+    await poller._poll_once(bot)
+    await poller._poll_once(bot)
+    assert calls == [None]
+
+    storage.add_link("1", "streamer-2", "123")
+    storage.remove_link("1", "streamer-1")
+    await poller._poll_once(bot)
+    assert calls == [None, 1]
+    assert [link["soop_channel_id"] for link in poller._links.values()] == ["streamer-2"]
+
+
+@pytest.mark.asyncio
+async def test_catch_up_poll_orders_go_lives_by_broadcast_start(tmp_path, monkeypatch):
+    db_path = tmp_path / "soop.db"
+    database_url = f"sqlite:///{db_path}"
+    apply_migrations(database_url)
+    storage = Storage(database_url)
+    starts = {
+        "streamer-1": "2026-01-01 12:30:00",
+        "streamer-2": "2026-01-01 12:05:00",
+        "streamer-3": None,
+        "streamer-4": "2026-01-01 12:10:00",
+    }
+    for streamer_id in starts:
+        storage.add_link("1", streamer_id, "123", "{soop_channel_id}")
+
+    class StartClient(FakeClient):
+        async def fetch_broad_info(self, streamer_id):
+            info = await super().fetch_broad_info(streamer_id)
+            return {**info, "broadStart": starts[streamer_id]}
+
+    class FakeNotifier:
+        def __init__(self):
+            self.messages = []
+
+        async def enqueue(self, channel_id, content, **kwargs):
+            self.messages.append(content)
+
+    notifier = FakeNotifier()
+    metrics = BotMetrics()
+    now = [datetime(2026, 1, 1, 12, 40, tzinfo=timezone.utc).timestamp()]
+    poller = SoopPoller(
+        StartClient(set(starts)),
+        storage,
+        notifier,
+        "https://play.sooplive.co.kr",
+        metrics,
+        interval_seconds=60,
+        info_cooldown_seconds=60,
+        catchup_gap_seconds=300,
+        clock=lambda: now[0],
+    )
+    storage.set_poll_state("last_poll_at", "2026-01-01T11:00:00")
+    poller._log_catch_up()
+    assert metrics.catch_up_polls == 1
+
+    await poller._poll_once(FakeBot(FakeChannel()))
+    assert notifier.messages == ["streamer-2", "streamer-4", "streamer-1", "streamer-3"]
+    assert set(metrics.poll_stages) == set(POLL_STAGES)
+    assert metrics.fetch_latency.count == len(starts)
+    poller._log_catch_up()
+    assert metrics.catch_up_polls == 1
+
+    # A suspended machine resumes mid-sleep: the wall clock jumps past the gap
+    # and the 60s sleep ends early, so the next ordinary cycle runs right away.
+    monkeypatch.setattr("soupnotify.soop.poller.RESUME_CHECK_SECONDS", 0.01)
+    sleep = asyncio.create_task(poller._sleep_until_next_poll())
+    await asyncio.sleep(0.05)
+    assert not sleep.done()
+    now[0] += 400
+    # Well under the 60s interval, or wait_for raises TimeoutError.
+    await asyncio.wait_for(sleep, timeout=1)
@@ -0,0 +1,92 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from soupnotify.core.metrics import BotMetrics, StageTimer
+from soupnotify.core.prometheus import (
+    MetricsExporter,
+    collect_metrics,
+    merge_expositions,
+    render_metrics,
+)
+
+
+def _metrics():
+    metrics = BotMetrics()
+    metrics.record_poll(120, 3)
+    metrics.record_queue_wait(40)
+    metrics.record_queue_wait(4000)
+    metrics.record_cache_hit()
+    metrics.record_cache_hit()
+    metrics.record_cache_hit()
+    metrics.record_cache_miss()
+    metrics.record_fetch_latency(80)
+    metrics.transitions["went_live"] = 2
+    timer = StageTimer()
+    timer.mark("fetch")
+    metrics.record_poll_stages(timer)
+    return metrics
+
+
+def test_render_metrics_text_format():
+    text = render_metrics(_metrics(), {"process": "bot"})
+    lines = text.splitlines()
+    assert "# TYPE soupnotify_polls_total counter" in lines
+    assert 'soupnotify_polls_total{process="bot"} 1' in lines
+    assert 'soupnotify_transitions_total{process="bot",kind="went_live"} 2' in lines
+    assert 'soupnotify_info_cache_hit_ratio{process="bot"} 0.75' in lines
+    # Buckets are cumulative and in seconds.
+    assert 'soupnotify_queue_wait_seconds_bucket{process="bot",le="0.05"} 1' in lines
+    assert 'soupnotify_queue_wait_seconds_bucket{process="bot",le="2.5"} 1' in lines
+    assert 'soupnotify_queue_wait_seconds_bucket{process="bot",le="5"} 2' in lines
+    assert 'soupnotify_queue_wait_seconds_bucket{process="bot",le="+Inf"} 2' in lines
+    assert 'soupnotify_queue_wait_seconds_sum{process="bot"} 4.04' in lines
+    assert 'soupnotify_poll_duration_seconds_count{process="bot"} 1' in lines
+    assert 'soupnotify_soop_fetch_latency_seconds_bucket{process="bot",le="0.1"} 1' in lines
+    assert any(line.startswith("soupnotify_poll_stage_duration_seconds_count") for line in lines)
+
+
+def test_merge_groups_families_from_several_processes():
+    merged = merge_expositions(
+        [
+            render_metrics(_metrics(), {"process": "bot"}),
+            render_metrics(BotMetrics(), {"process": "poller"}),
+        ]
+    )
+    lines = merged.splitlines()
+    assert lines.count("# TYPE soupnotify_polls_total counter") == 1
+    index = lines.index('soupnotify_polls_total{process="bot"} 1')
+    assert lines[index + 1] == 'soupnotify_polls_total{process="poller"} 0'
+
+
+def test_exporter_files_are_collected_until_stale(tmp_path):
+    MetricsExporter(_metrics(), tmp_path, "bot").write()
+    MetricsExporter(BotMetrics(), tmp_path, "poller").write()
+    text = collect_metrics(tmp_path, 60)
+    assert 'process="bot"' in text and 'process="poller"' in text
+
+    poller_file = next(tmp_path.glob("poller-*.prom"))
+    old = time.time() - 120
+    os.utime(poller_file, (old, old))
+    text = collect_metrics(tmp_path, 60)
+    assert 'process="bot"' in text and 'process="poller"' not in text
+    assert collect_metrics(tmp_path / "missing", 60) == ""
+
+
+@pytest.mark.asyncio
+async def test_exporters_on_one_host_keep_separate_series(tmp_path):
+    MetricsExporter(_metrics(), tmp_path, "bot", instance="shards-0").write()
+    MetricsExporter(BotMetrics(), tmp_path, "bot", instance="shards-1").write()
+    text = collect_metrics(tmp_path, 60)
+    assert text.count("soupnotify_polls_total{") == 2
+    assert 'instance="shards-0"' in text and 'instance="shards-1"' in text
+
+    exporter = MetricsExporter(BotMetrics(), tmp_path, "poller")
+    task = asyncio.create_task(exporter.run())
+    await asyncio.sleep(0)
+    assert len(list(tmp_path.glob("poller-*.prom"))) == 1
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    assert list(tmp_path.glob("poller-*.prom")) == []
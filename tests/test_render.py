@@ -0,0 +1,69 @@
+import pytest
+
+from soupnotify.core.render import (
+    TemplateError,
+    compile_template,
+    render_embed_overrides,
+    render_message,
+    validate_template,
+)
+
+INFO = {"broadTitle": "Late night", "categoryName": "Talk", "currentSumViewer": 42, "broadNo": 7}
+
+
+def test_compile_template_splits_literals_and_placeholders_once():
+    compiled = compile_template("{guild}: {title} ({viewers}) {unknown}")
+    assert compiled.segments == (
+        (True, "guild"),
+        (False, ": "),
+        (True, "title"),
+        (False, " ("),
+        (True, "viewers"),
+        (False, ") {unknown}"),
+    )
+    assert compiled.unknown == frozenset({"unknown"})
+    assert compile_template("{guild}: {title} ({viewers}) {unknown}") is compiled
+
+
+def test_render_message_supports_broadcast_fields():
+    message = render_message(
+        "{soop_channel_id} {title} [{category}] {viewers} #{broad_no} {soop_url} {notify_channel}",
+        "streamer-1",
+        123,
+        "Guild",
+        "https://play.sooplive.co.kr/",
+        mention="@everyone",
+        info=INFO,
+    )
+    assert message == (
+        "@everyone streamer-1 Late night [Talk] 42 #7 "
+        "https://play.sooplive.co.kr/streamer-1 <#123>"
+    )
+
+
+def test_streamer_text_cannot_mention():
+    role, user = "<@&123456789012345678>", "<@!223456789012345678>"
+    info = {**INFO, "broadTitle": f"@everyone come {role} {user}", "categoryName": "@here"}
+    message = render_message("{title} [{category}]", "streamer-1", 123, "Guild", "", info=info)
+    assert "@everyone" not in message
+    assert "@here" not in message
+    assert role not in message and user not in message
+    assert message.replace("\u200b", "") == f"@everyone come {role} {user} [@here]"
+
+
+def test_render_without_info_leaves_broadcast_fields_empty():
+    title, description, color = render_embed_overrides(
+        {"title": "{guild} {title}", "description": None, "color": "FF0000"},
+        "streamer-1",
+        123,
+        "Guild",
+        "https://play.sooplive.co.kr",
+    )
+    assert (title, description, color) == ("Guild ", None, "FF0000")
+
+
+def test_validate_template_rejects_unknown_placeholders():
+    validate_template(None)
+    validate_template("{guild} {title} {literal text}")
+    with pytest.raises(TemplateError, match=r"\{streamer\}"):
+        validate_template("{streamer} is live")
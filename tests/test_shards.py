@@ -0,0 +1,77 @@
+import pytest
+
+from soupnotify.core.metrics import BotMetrics
+from soupnotify.core.shards import ShardSet, shard_for_guild
+from soupnotify.core.storage import Storage
+from soupnotify.soop.poller import SoopPoller
+
+from tests.conftest import apply_migrations
+from tests.test_outbox import RecordingNotifier
+from tests.test_poller import FakeBot, FakeChannel, FakeClient
+
+# Guild ids whose snowflake timestamp bits route them to shards 0 and 1 of 2.
+SHARD_0_GUILD = str((2 << 22) + 9)
+SHARD_1_GUILD = str((3 << 22) + 1)
+
+
+def test_shard_for_guild_uses_discord_routing():
+    assert shard_for_guild(SHARD_0_GUILD, 2) == 0
+    assert shard_for_guild(SHARD_1_GUILD, 2) == 1
+    assert shard_for_guild(81384788765712384, 16) == (81384788765712384 >> 22) % 16
+    shards = ShardSet(frozenset({1}), 2)
+    assert shards.owns(SHARD_1_GUILD)
+    assert not shards.owns(SHARD_0_GUILD)
+
+
+@pytest.mark.asyncio
+async def test_go_lives_for_other_shards_go_through_the_outbox(tmp_path):
+    db_path = tmp_path / "soop.db"
+    database_url = f"sqlite:///{db_path}"
+    apply_migrations(database_url)
+    storage = Storage(database_url)
+    storage.add_link(SHARD_0_GUILD, "streamer-1", "123")
+    storage.add_link(SHARD_1_GUILD, "streamer-1", "123")
+    notifier = RecordingNotifier()
+    poller = SoopPoller(
+        FakeClient({"streamer-1"}),
+        storage,
+        notifier,
+        "https://play.sooplive.co.kr",
+        BotMetrics(),
+        interval_seconds=1,
+        info_cooldown_seconds=60,
+        shards=ShardSet(frozenset({0}), 2),
+    )
+    await poller._poll_once(FakeBot(FakeChannel()))
+
+    assert len(notifier.sent) == 1
+    assert storage.claim_outbox(shards=ShardSet(frozenset({0}), 2)) == []
+    claimed = storage.claim_outbox(shards=ShardSet(frozenset({1}), 2))
+    assert [row["guild_id"] for row in claimed] == [SHARD_1_GUILD]
+    assert storage.claim_outbox() == []
+
+
+@pytest.mark.asyncio
+async def test_outbox_routes_non_numeric_guilds_like_shard_set(tmp_path):
+    db_path = tmp_path / "soop.db"
+    database_url = f"sqlite:///{db_path}"
+    apply_migrations(database_url)
+    storage = Storage(database_url)
+    # Numeric prefix of a shard 1 guild; ShardSet.owns still sends it to shard 0.
+    guild_id = f"{SHARD_1_GUILD}x"
+    storage.add_link(guild_id, "streamer-1", "123")
+    poller = SoopPoller(
+        FakeClient({"streamer-1"}),
+        storage,
+        RecordingNotifier(),
+        "https://play.sooplive.co.kr",
+        BotMetrics(),
+        interval_seconds=1,
+        info_cooldown_seconds=60,
+        shards=ShardSet(frozenset({1}), 2),
+    )
+    await poller._poll_once(FakeBot(FakeChannel()))
+
+    assert storage.claim_outbox(shards=ShardSet(frozenset({1}), 2)) == []
+    claimed = storage.claim_outbox(shards=ShardSet(frozenset({0}), 2))
+    assert [row["guild_id"] for row in claimed] == [guild_id]
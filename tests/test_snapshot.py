@@ -0,0 +1,168 @@
+import threading
+
+import pytest
+
+from soupnotify.core.metrics import BotMetrics
+from soupnotify.core.storage import Storage
+from soupnotify.soop.partition import PartitionCoordinator
+from soupnotify.soop.poller import SoopPoller
+from soupnotify.soop.snapshot import PollerSnapshot, read_snapshot, write_snapshot
+from soupnotify.soop.state import PollerState
+
+from tests.conftest import apply_migrations
+from tests.test_poller import FakeClient
+
+
+class CountingClient(FakeClient):
+    def __init__(self, live_ids, broad_no="123"):
+        super().__init__(live_ids, broad_no)
+        self.info_calls = []
+
+    async def fetch_broad_info(self, streamer_id):
+        self.info_calls.append(streamer_id)
+        return await super().fetch_broad_info(streamer_id)
+
+
+def _make_poller(client, storage, snapshot_path, partitions=None):
+    return SoopPoller(
+        client,
+        storage,
+        None,
+        "https://play.sooplive.co.kr",
+        BotMetrics(),
+        interval_seconds=1,
+        info_cooldown_seconds=600,
+        snapshot_path=str(snapshot_path),
+        partitions=partitions,
+    )
+
+
+def _setup(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'soop.db'}"
+    apply_migrations(database_url)
+    storage = Storage(database_url)
+    storage.add_link("1", "streamer-1", "123", "{soop_channel_id} live")
+    storage.add_link("2", "streamer-2", "123", "{soop_channel_id} live")
+    return storage
+
+
+def test_snapshot_roundtrip(tmp_path):
+    state = PollerState()
+    state.update(3, True, "900")
+    state.update(7, False, None)
+    snapshot = PollerSnapshot(
+        created_at=1.5,
+        links_version=4,
+        poll_token="abc",
+        state=state,
+        streamers={"streamer-1": (True, "900"), "streamer-2": (False, None)},
+        info_cache={"streamer-1": (2.0, {"broadTitle": "제목", "broadNo": "900"})},
+    )
+    path = tmp_path / "poller.snapshot"
+    assert write_snapshot(path, snapshot) == path.stat().st_size
+
+    loaded = read_snapshot(path)
+    assert loaded is not None
+    assert (loaded.created_at, loaded.links_version, loaded.poll_token) == (1.5, 4, "abc")
+    assert loaded.state.columns() == state.columns()
+    assert loaded.streamers == snapshot.streamers
+    assert loaded.info_cache == snapshot.info_cache
+
+
+def test_unreadable_snapshot_is_ignored(tmp_path):
+    path = tmp_path / "poller.snapshot"
+    assert read_snapshot(path) is None
+    path.write_bytes(b"SOUPSNAP\x01")
+    assert read_snapshot(path) is None
+
+
+@pytest.mark.asyncio
+async def test_poller_restores_from_snapshot(tmp_path, monkeypatch):
+    storage = _setup(tmp_path)
+    path = tmp_path / "poller.snapshot"
+    client = CountingClient({"streamer-1"})
+    poller = _make_poller(client, storage, path)
+    await poller._poll_once(None)
+    writers = []
+
+    def recording_write(*args):
+        writers.append(threading.current_thread())
+        return write_snapshot(*args)
+
+    monkeypatch.setattr("soupnotify.soop.poller.write_snapshot", recording_write)
+    await poller._save_snapshot_safely()
+    # Serializing and fsyncing happen off the event loop's thread.
+    assert writers and writers[0] is not threading.current_thread()
+    assert len(storage.claim_outbox()) == 1
+
+    def unexpected():
+        raise AssertionError("state should come from the snapshot")
+
+    monkeypatch.setattr(storage, "iter_live_status", unexpected)
+    restarted = _make_poller(client, storage, path)
+    assert restarted._state.columns() == poller._state.columns()
+    assert restarted._info_cache["streamer-1"]["broadNo"] == "123"
+
+    # Still live: no duplicate go-live and the broad info comes from the cache.
+    client.info_calls.clear()
+    await restarted._poll_once(None)
+    assert storage.claim_outbox() == []
+    assert client.info_calls == ["streamer-2"]
+
+
+@pytest.mark.asyncio
+async def test_stale_snapshot_falls_back_to_database(tmp_path, monkeypatch):
+    storage = _setup(tmp_path)
+    path = tmp_path / "poller.snapshot"
+    client = FakeClient({"streamer-1"})
+    poller = _make_poller(client, storage, path)
+    await poller._poll_once(None)
+    await poller._save_snapshot_safely()
+
+    # Another cycle (here: after streamer-2 went live) supersedes the snapshot.
+    client.live_ids.add("streamer-2")
+    await poller._poll_once(None)
+    restarted = _make_poller(client, storage, path)
+    assert restarted._streamers["streamer-2"][0] is True
+
+    # So does a link change.
+    await poller._save_snapshot_safely()
+    storage.add_link("3", "streamer-3", "123", None)
+    calls = []
+    original = storage.iter_live_status
+
+    def tracking():
+        calls.append(True)
+        return original()
+
+    monkeypatch.setattr(storage, "iter_live_status", tracking)
+    _make_poller(client, storage, path)
+    assert calls
+
+
+@pytest.mark.asyncio
+async def test_partitioned_poller_only_restores_the_info_cache(tmp_path, monkeypatch):
+    storage = _setup(tmp_path)
+    path = tmp_path / "poller.snapshot"
+    client = FakeClient({"streamer-1"})
+    coordinator = PartitionCoordinator(storage, 4, owner="a")
+    coordinator.rebalance()
+    poller = _make_poller(client, storage, path, coordinator)
+    await poller._poll_once(None)
+    await poller._save_snapshot_safely()
+    assert read_snapshot(path) is not None
+    # Replicas would keep overwriting one token, so none is written.
+    assert storage.get_poll_state("poll_token") is None
+
+    calls = []
+    original = storage.iter_live_status
+
+    def tracking():
+        calls.append(True)
+        return original()
+
+    monkeypatch.setattr(storage, "iter_live_status", tracking)
+    restarted = _make_poller(client, storage, path, PartitionCoordinator(storage, 4, owner="a"))
+    restarted._load_state()
+    assert calls
+    assert restarted._info_cache["streamer-1"]["broadNo"] == "123"
@@ -0,0 +1,28 @@
+from soupnotify.soop.state import PollerState
+
+
+def test_poller_state_tracks_links_by_id():
+    state = PollerState()
+    assert not state.is_live(5)
+    assert 5 not in state
+
+    state.update(5, True, "100")
+    state.update(70, False, None)
+    assert state.is_live(5)
+    assert state.broad_no(5) == "100"
+    assert not state.is_live(70)
+    assert 70 in state
+    assert len(state) == 2
+
+    state.update(5, False, None)
+    assert not state.is_live(5)
+    assert state.broad_no(5) is None
+
+
+def test_poller_state_discard_forgets_link():
+    state = PollerState()
+    state.update(4, True, "7")
+    state.discard(4)
+    state.discard(1000)
+    assert 4 not in state
+    assert state.broad_no(4) is None
@@ -1,3 +1,9 @@
+import os
+import uuid
+
+import pytest
+from sqlalchemy import text
+
 from soupnotify.core.storage import Storage
 
 from tests.conftest import apply_migrations
@@ -49,13 +55,21 @@ def test_storage_defaults_and_live_status(tmp_path):
     storage.set_default_notify_channel("guild-1", None)
     assert storage.get_default_notify_channel("guild-1") is None
 
-    storage.set_live_status("guild-1", "streamer-1", True, "111")
-    storage.set_live_status("guild-1", "streamer-2", False, None)
-    live = storage.load_live_status()
-    assert live["guild-1:streamer-1"]["is_live"] is True
-    assert live["guild-1:streamer-1"]["broad_no"] == "111"
-    assert live["guild-1:streamer-1"]["last_notified_at"] is None
-    assert live["guild-1:streamer-2"]["is_live"] is False
+    storage.set_streamer_states([("streamer-1", True, "111"), ("streamer-2", False, None)])
+    assert storage.load_streamer_states() == {
+        "streamer-1": (True, "111"),
+        "streamer-2": (False, None),
+    }
+    storage.record_notifications(
+        [("guild-1", "streamer-1", "2026-01-01T00:00:00"), ("guild-1", "streamer-2", None)]
+    )
+    storage.record_notifications([("guild-1", "streamer-1", None)])
+    live = storage.get_live_status("guild-1")
+    assert live["streamer-1"]["is_live"] is True
+    assert live["streamer-1"]["broad_no"] == "111"
+    assert live["streamer-1"]["last_notified_at"] == "2026-01-01T00:00:00"
+    assert live["streamer-2"]["is_live"] is False
+    assert live["streamer-2"]["last_notified_at"] is None
 
     storage.set_embed_template("guild-1", "Title {guild}", "Desc {soop_channel_id}", "FF5500")
     embed = storage.get_embed_template("guild-1")
@@ -77,3 +91,239 @@ def test_storage_mentions(tmp_path):
     assert storage.get_mention("guild-1") == {"type": "role", "value": "123"}
     storage.set_mention("guild-1", None, None)
     assert storage.get_mention("guild-1") == {"type": None, "value": None}
+
+
+def test_storage_flags_unreachable_notify_channels(tmp_path):
+    db_path = tmp_path / "soop.db"
+    database_url = f"sqlite:///{db_path}"
+    apply_migrations(database_url)
+    storage = Storage(database_url)
+
+    storage.add_link("guild-1", "streamer-1", "111")
+    storage.add_link("guild-2", "streamer-1", "111")
+    storage.add_link("guild-1", "streamer-2", "222")
+
+    assert storage.flag_notify_channels(["111"], "channel deleted") == 2
+    assert storage.list_flagged_notify_channels() == {"111": "channel deleted"}
+    links = {item["soop_channel_id"]: item for item in storage.get_links("guild-1")}
+    assert links["streamer-1"]["notify_error"] == "channel deleted"
+    assert links["streamer-2"]["notify_error"] is None
+
+    storage.add_link("guild-2", "streamer-1", "111")
+    assert storage.get_links("guild-2")[0]["notify_error"] is None
+
+    assert storage.clear_notify_channel_flags(["111"]) == 1
+    assert storage.list_flagged_notify_channels() == {}
+
+
+def test_storage_channel_webhooks(tmp_path):
+    db_path = tmp_path / "soop.db"
+    database_url = f"sqlite:///{db_path}"
+    apply_migrations(database_url)
+    storage = Storage(database_url)
+
+    assert storage.get_channel_webhook("111") is None
+    storage.set_channel_webhook("111", "900", "secret")
+    assert storage.get_channel_webhook("111") == {"id": "900", "token": "secret"}
+    storage.set_channel_webhook("111", "901", "secret-2")
+    assert storage.get_channel_webhook("111") == {"id": "901", "token": "secret-2"}
+    assert storage.remove_channel_webhook("111") == 1
+    assert storage.get_channel_webhook("111") is None
+
+
+def test_storage_live_status_follows_link_removal(tmp_path):
+    db_path = tmp_path / "soop.db"
+    database_url = f"sqlite:///{db_path}"
+    apply_migrations(database_url)
+    storage = Storage(database_url)
+
+    storage.add_link("guild-1", "streamer-1", "111")
+    storage.add_link("guild-1", "streamer-2", "111")
+    storage.add_link("guild-2", "streamer-1", "222")
+    storage.record_notifications(
+        [
+            ("guild-1", "streamer-1", None),
+            ("guild-1", "streamer-2", None),
+            ("guild-2", "streamer-1", None),
+            ("guild-3", "orphan", None),
+        ]
+    )
+    storage.set_streamer_states([("streamer-1", True, "1"), ("orphan", True, "1")])
+
+    assert storage.prune_live_status() == 1
+    assert set(storage.load_streamer_states()) == {"streamer-1"}
+    storage.remove_link("guild-1", "streamer-1")
+    assert set(storage.get_live_status("guild-1")) == {"streamer-2"}
+    assert set(storage.get_live_status("guild-2")) == {"streamer-1"}
+    storage.remove_link("guild-1")
+    assert storage.get_live_status("guild-1") == {}
+    assert set(storage.get_live_status("guild-2")) == {"streamer-1"}
+
+
+def test_storage_scoped_lookups(tmp_path):
+    db_path = tmp_path / "soop.db"
+    database_url = f"sqlite:///{db_path}"
+    apply_migrations(database_url)
+    storage = Storage(database_url)
+
+    storage.add_link("guild-1", "streamer-1", "111")
+    storage.add_link("guild-1", "streamer-2", "112")
+    storage.add_link("guild-2", "streamer-1", "222")
+    storage.flag_notify_channels(["112"], "missing")
+    storage.set_streamer_states([("streamer-1", True, "9")])
+    storage.record_notifications([("guild-1", "streamer-1", "t"), ("guild-2", "streamer-1", "t")])
+
+    assert storage.get_link("guild-1", "streamer-2")["notify_channel_id"] == "112"
+    assert storage.get_link("guild-2", "streamer-2") is None
+    assert storage.count_links("guild-1") == (2, 1)
+    assert storage.count_links("guild-3") == (0, 0)
+    assert storage.get_live_status("guild-1") == {
+        "streamer-1": {"is_live": True, "broad_no": "9", "last_notified_at": "t"}
+    }
+
+    with storage._engine.begin() as conn:
+        indexes = {
+            row[0]
+            for row in conn.execute(text("SELECT name FROM sqlite_master WHERE type='index'"))
+        }
+    assert {
+        "ix_guild_streamers_soop_channel_id",
+        "ix_guild_streamers_notify_channel_id",
+        "ix_live_status_soop_channel_id",
+        "ix_streamer_state_live",
+    } <= indexes
+
+
+def test_storage_link_changes_since_version(tmp_path):
+    db_path = tmp_path / "soop.db"
+    database_url = f"sqlite:///{db_path}"
+    apply_migrations(database_url)
+    storage = Storage(database_url)
+
+    assert storage.get_links_version() == 0
+    storage.add_link("guild-1", "streamer-1", "111")
+    storage.add_link("guild-1", "streamer-2", "111")
+    version, rows, deleted = storage.list_link_changes(None)
+    assert version == storage.get_links_version() == 2
+    assert {row["soop_channel_id"] for row in rows} == {"streamer-1", "streamer-2"}
+    assert deleted == []
+
+    removed_id = storage.get_link("guild-1", "streamer-1")["id"]
+    assert storage.set_template("guild-1", "streamer-2", "Hi {guild}")
+    assert storage.remove_link("guild-1", "streamer-1") == 1
+    assert storage.remove_link("guild-1", "missing") == 0
+    version, rows, deleted = storage.list_link_changes(2)
+    assert version == 4
+    assert [row["message_template"] for row in rows] == ["Hi {guild}"]
+    assert deleted == [removed_id]
+
+    assert storage.list_link_changes(4) == (4, [], [])
+    assert storage.prune_link_deletions(max_age_seconds=0) == 1
+
+
+def test_storage_links_keyset_pages(tmp_path):
+    db_path = tmp_path / "soop.db"
+    database_url = f"sqlite:///{db_path}"
+    apply_migrations(database_url)
+    storage = Storage(database_url)
+
+    for index in range(7):
+        storage.add_link("guild-1", f"streamer-{index}", "111" if index % 2 else "222")
+    storage.add_link("guild-2", "streamer-x", "111")
+
+    first = storage.get_links_page("guild-1", limit=3)
+    assert [link["soop_channel_id"] for link in first] == [
+        "streamer-0",
+        "streamer-1",
+        "streamer-2",
+    ]
+    second = storage.get_links_page("guild-1", after_id=first[-1]["id"], limit=3)
+    assert [link["soop_channel_id"] for link in second] == [
+        "streamer-3",
+        "streamer-4",
+        "streamer-5",
+    ]
+    assert storage.get_links_page("guild-1", before_id=second[0]["id"], limit=3) == first
+    assert storage.get_links_page("guild-1", limit=3, offset=3) == second
+
+    filtered = storage.get_links_page("guild-1", limit=10, notify_channel_id="111")
+    assert [link["soop_channel_id"] for link in filtered] == [
+        "streamer-1",
+        "streamer-3",
+        "streamer-5",
+    ]
+    assert storage.count_links("guild-1", notify_channel_id="111") == (3, 0)
+    assert storage.count_links("guild-1", soop_channel_id="streamer-6") == (1, 0)
+
+
+def test_storage_bulk_add_links_in_one_version(tmp_path):
+    db_path = tmp_path / "soop.db"
+    database_url = f"sqlite:///{db_path}"
+    apply_migrations(database_url)
+    storage = Storage(database_url)
+
+    storage.add_link("guild-1", "streamer-1", "111")
+    storage.flag_notify_channels(["111"], "missing")
+    imported = storage.add_links(
+        "guild-1",
+        [("streamer-1", "222", "Hi {guild}")]
+        + [(f"streamer-{index}", "333", None) for index in range(2, 1202)],
+    )
+    assert imported == 1201
+    assert storage.get_links_version() == 2
+    updated = storage.get_link("guild-1", "streamer-1")
+    assert updated["notify_channel_id"] == "222"
+    assert updated["notify_error"] is None
+    exported = list(storage.iter_links("guild-1", batch_size=500))
+    assert len(exported) == 1201
+    assert [link["id"] for link in exported] == sorted(link["id"] for link in exported)
+
+
+@pytest.mark.skipif(
+    not os.environ.get("TEST_POSTGRES_URL"), reason="set TEST_POSTGRES_URL to run"
+)
+def test_storage_bulk_add_links_copies_into_postgres():
+    database_url = os.environ["TEST_POSTGRES_URL"]
+    apply_migrations(database_url)
+    storage = Storage(database_url)
+    guild_id = f"guild-{uuid.uuid4().hex}"
+
+    storage.add_link(guild_id, "streamer-1", "111")
+    storage.flag_notify_channels(["111"], "missing")
+    rows = [("streamer-1", "222", "Tab\there, {guild}")] + [
+        (f"streamer-{index}", "333", None) for index in range(2, 1202)
+    ]
+    assert storage.add_links(guild_id, rows) == 1201
+    # COPY escapes and NULLs survive the temp table round trip.
+    updated = storage.get_link(guild_id, "streamer-1")
+    assert updated["notify_channel_id"] == "222"
+    assert updated["message_template"] == "Tab\there, {guild}"
+    assert updated["notify_error"] is None
+    assert storage.get_link(guild_id, "streamer-2")["message_template"] is None
+    assert len(list(storage.iter_links(guild_id))) == 1201
+    # The temp table is dropped on commit, so a second import works too.
+    assert storage.add_links(guild_id, rows[:1]) == 1
+    assert storage.remove_link(guild_id) == 1201
+
+
+def test_storage_leases(tmp_path):
+    db_path = tmp_path / "soop.db"
+    database_url = f"sqlite:///{db_path}"
+    apply_migrations(database_url)
+    storage = Storage(database_url)
+
+    assert storage.acquire_lease("poller", "a", 60) is True
+    assert storage.acquire_lease("poller", "b", 60) is False
+    assert storage.acquire_lease("poller", "a", 60) is True
+    lease = storage.get_lease("poller")
+    assert lease["owner"] == "a"
+    assert 0 < lease["expires_in"] <= 60
+
+    # Once the holder stops renewing, another owner can take the lease.
+    assert storage.acquire_lease("poller", "a", -1) is True
+    assert storage.acquire_lease("poller", "b", 60) is True
+    assert storage.get_lease("poller")["owner"] == "b"
+
+    assert storage.release_lease("poller", "a") is False
+    assert storage.release_lease("poller", "b") is True
+    assert storage.get_lease("poller") is None